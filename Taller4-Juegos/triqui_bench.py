@@ -0,0 +1,84 @@
+"""
+Banco de la búsqueda de Triqui: nodos y podas por ply según el ordenamiento
+Taller 4 - Inteligencia Artificial - Juegos Multijugador
+Pontificia Universidad Javeriana - Bogotá
+
+Corre `minimax` sobre varias posiciones con cada configuración de
+`MoveOrdering` (y sin tabla de transposición, para aislar el efecto del
+orden) y compara contra el orden fila por fila original. Todas las
+configuraciones deben retornar el mismo valor y la misma jugada. Al final,
+la profundización iterativa desde el tablero vacío con varios presupuestos.
+
+Uso:
+    python triqui_bench.py
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+from triqui_minimax import MoveOrdering, SearchStats, TranspositionTable, TriquiGame
+
+# (nombre, tablero, profundidad, ¿juega MAX?)
+POSITIONS = [
+    ("vacío, prof. 9", [[0, 0, 0], [0, 0, 0], [0, 0, 0]], 9, True),
+    ("vacío, prof. 4", [[0, 0, 0], [0, 0, 0], [0, 0, 0]], 4, True),
+    ("X esquina", [[1, 0, 0], [0, 0, 0], [0, 0, 0]], 9, False),
+    ("X borde", [[0, 1, 0], [0, 0, 0], [0, 0, 0]], 9, False),
+    ("X centro, O esq.", [[-1, 0, 0], [0, 1, 0], [0, 0, 0]], 9, True),
+]
+
+ORDERINGS: List[Tuple[str, Optional[MoveOrdering]]] = [
+    ("fila por fila", None),
+    ("estático", MoveOrdering(pv=False, killers=False, history=False)),
+    ("killers", MoveOrdering(pv=False, history=False, static=False)),
+    ("historial", MoveOrdering(pv=False, killers=False, static=False)),
+    ("todos", MoveOrdering()),
+]
+
+
+def run(ordering: Optional[MoveOrdering], tt: Optional[TranspositionTable]) -> Tuple[SearchStats, float, list]:
+    """Corre todas las posiciones con una configuración nueva"""
+    game = TriquiGame()
+    game.tt, game.ordering = tt, ordering
+    if ordering is not None:
+        ordering.clear()
+    results = []
+    t0 = time.perf_counter()
+    for _, board, depth, is_max in POSITIONS:
+        results.append(game.minimax([row[:] for row in board], depth, is_max))
+    return game.stats, (time.perf_counter() - t0) * 1e3, results
+
+
+def main():
+    for label, make_tt in (("sin tabla de transposición", lambda: None),
+                           ("con tabla de transposición", TranspositionTable)):
+        print(f"\n=== {label} ===")
+        print(f"{'ordenamiento':<15} {'nodos':>9} {'podas':>7} {'vs fila':>8} {'ms':>8}")
+        base_nodes, base_results, per_ply = None, None, {}
+        for name, ordering in ORDERINGS:
+            stats, ms, results = run(ordering, make_tt())
+            if base_nodes is None:
+                base_nodes, base_results = stats.total_nodes, results
+            same = "" if results == base_results else "  (¡resultado distinto!)"
+            print(f"{name:<15} {stats.total_nodes:>9} {stats.total_cutoffs:>7} "
+                  f"{stats.total_nodes / base_nodes:>7.0%} {ms:>8.1f}{same}")
+            per_ply[name] = stats
+
+        print("\nNodos / podas por ply (fila por fila vs todos):")
+        base, best = per_ply["fila por fila"], per_ply["todos"]
+        for ply in range(10):
+            if base.nodes[ply] or best.nodes[ply]:
+                print(f"  ply {ply}: {base.nodes[ply]:>7} / {base.cutoffs[ply]:<6} -> "
+                      f"{best.nodes[ply]:>7} / {best.cutoffs[ply]:<6}")
+
+    print("\nProfundización iterativa desde el tablero vacío:")
+    print(f"{'plazo':>8} {'jugada':>8} {'valor':>6} {'prof.':>6} {'nodos':>7} {'ms':>7}  nodos por iteración")
+    for budget in (0.2, 1, 3, 100):
+        r = TriquiGame().iterative_deepening([[0, 0, 0], [0, 0, 0], [0, 0, 0]], True, budget)
+        state = "completa" if r.complete else "interrumpida" if r.timed_out else ""
+        print(f"{budget:>6}ms {r.move!s:>8} {r.value:>6} {r.depth:>6} {r.nodes:>7} {r.elapsed_ms:>7.2f}  "
+              f"{r.nodes_per_depth} {state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,380 @@ Grupo: [5]
 
 import math
 import random
-from typing import List, Tuple, Optional
+import time
+from typing import List, NamedTuple, Tuple, Optional
+
+from triqui_tabla import SolvedTable, open_table
+
+# Representación interna (bitboards): la casilla (fila, columna) es el bit
+# fila*3 + columna. Una posición son dos enteros de 9 bits, uno con las
+# casillas de X y otro con las de O; las líneas ganadoras son máscaras fijas.
+FULL_MASK = 0b111111111
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Filas
+    0b001001001, 0b010010010, 0b100100100,  # Columnas
+    0b100010001, 0b001010100,               # Diagonales
+)
+# WINNING[b]: el conjunto de casillas b contiene alguna línea (una consulta en vez de 8)
+WINNING = tuple(any(b & m == m for m in WIN_MASKS) for b in range(512))
+CELL_TO_MOVE = tuple(divmod(i, 3) for i in range(9))
+# BITS_OF[b]: las casillas de la máscara b como bits, fila por fila
+BITS_OF = tuple(tuple(1 << i for i in range(9) if b >> i & 1) for b in range(512))
+# Prioridad estática de cada casilla: centro > esquinas > bordes
+STATIC_PRIORITY = (1, 0, 1,
+                   0, 2, 0,
+                   1, 0, 1)
+
+# Simetrías del tablero (grupo D4): 4 rotaciones y sus reflejos, como
+# permutaciones de casillas. SYM_TABLES[t][b] aplica la simetría t a la
+# máscara b; SYM_CELLS[t][i] / SYM_INVERSE[t][i] llevan una casilla i y la traen.
+def _rotate(cell: int) -> int:
+    row, col = divmod(cell, 3)
+    return col * 3 + (2 - row)
+
+def _reflect(cell: int) -> int:
+    row, col = divmod(cell, 3)
+    return row * 3 + (2 - col)
+
+SYM_CELLS = []
+for _reflected in (False, True):
+    _perm = [_reflect(i) if _reflected else i for i in range(9)]
+    for _ in range(4):
+        SYM_CELLS.append(tuple(_perm))
+        _perm = [_rotate(c) for c in _perm]
+SYM_CELLS = tuple(SYM_CELLS)
+SYM_INVERSE = tuple(tuple(perm.index(i) for i in range(9)) for perm in SYM_CELLS)
+SYM_TABLES = tuple(tuple(sum(1 << perm[i] for i in range(9) if b >> i & 1) for b in range(512))
+                   for perm in SYM_CELLS)
+CENTER_MASK = 1 << 4
+CORNER_MASK = 0b101000101
+POPCOUNT = tuple(bin(b).count("1") for b in range(512))
+
+
+def board_to_bits(state: List[List[int]]) -> Tuple[int, int]:
+    """
+    Convierte la matriz 3x3 a bitboards
+
+    Args:
+        state: Estado del tablero
+
+    Returns:
+        Tupla (casillas de X, casillas de O)
+    """
+    x_bits = o_bits = 0
+    for i in range(9):
+        value = state[i // 3][i % 3]
+        if value == 1:
+            x_bits |= 1 << i
+        elif value == -1:
+            o_bits |= 1 << i
+    return x_bits, o_bits
+
+
+def bits_winner(x_bits: int, o_bits: int) -> int:
+    """1 si X tiene una línea completa, -1 si la tiene O, 0 si ninguno"""
+    if WINNING[x_bits]:
+        return 1
+    if WINNING[o_bits]:
+        return -1
+    return 0
+
+
+def evaluate_bits(x_bits: int, o_bits: int) -> int:
+    """Heurística de `evaluate_state` para una posición no terminal en bitboards"""
+    score = 0
+    for mask in WIN_MASKS:
+        x_line = x_bits & mask
+        o_line = o_bits & mask
+        if not o_line:
+            x_count = POPCOUNT[x_line]
+            if x_count == 2:
+                score += 50
+            elif x_count == 1:
+                score += 10
+        if not x_line:
+            o_count = POPCOUNT[o_line]
+            if o_count == 2:
+                score -= 50
+            elif o_count == 1:
+                score -= 10
+    if x_bits & CENTER_MASK:
+        score += 30
+    elif o_bits & CENTER_MASK:
+        score -= 30
+    return score + 15 * (POPCOUNT[x_bits & CORNER_MASK] - POPCOUNT[o_bits & CORNER_MASK])
+
+
+# Tipos de cota de una entrada de la tabla de transposición
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición acotada para la búsqueda Alfa-Beta
+
+    La clave es la forma canónica de la posición bajo las 8 simetrías del
+    tablero (el mínimo de `me << 9 | opp` sobre el grupo D4), así que una
+    posición, sus rotaciones y sus reflejos comparten entrada. Cada entrada
+    guarda (clave, profundidad, tipo de cota, valor, mejor casilla en el marco
+    canónico). Los valores son desde el punto de vista de quien juega, como
+    en `_negamax`.
+
+    La tabla tiene `size` casillas en pares: la primera de cada par se
+    reemplaza solo por una búsqueda al menos igual de profunda (preferencia
+    por profundidad) y la segunda siempre (la entrada más reciente).
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        self.buckets = max(1, size // 2)
+        self.slots: List[Optional[Tuple[int, int, int, int, int]]] = [None] * (2 * self.buckets)
+        self.probes = 0     # Consultas
+        self.hits = 0       # Consultas que encontraron la posición
+        self.cutoffs = 0    # Aciertos que evitaron buscar el nodo
+        self.stores = 0     # Entradas escritas
+        self.overwrites = 0 # Entradas de otra posición desalojadas
+
+    @staticmethod
+    def canonical(me: int, opp: int) -> Tuple[int, int]:
+        """
+        Forma canónica de la posición
+
+        Returns:
+            Tupla (clave, índice de la simetría que lleva la posición a la clave)
+        """
+        key, sym = -1, 0
+        for t, table in enumerate(SYM_TABLES):
+            k = table[me] << 9 | table[opp]
+            if key < 0 or k < key:
+                key, sym = k, t
+        return key, sym
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int, int]]:
+        """Entrada guardada para la clave, o None"""
+        self.probes += 1
+        i = 2 * (key % self.buckets)
+        for entry in (self.slots[i], self.slots[i + 1]):
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: int, move: int) -> None:
+        """Guarda el resultado de buscar la posición según la política de reemplazo"""
+        i = 2 * (key % self.buckets)
+        deep = self.slots[i]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            if deep is not None and deep[0] != key:
+                # La entrada profunda desalojada pasa a la casilla de reemplazo siempre
+                self._put(i + 1, deep)
+            self._put(i, (key, depth, flag, value, move))
+        else:
+            self._put(i + 1, (key, depth, flag, value, move))
+
+    def _put(self, i: int, entry: Tuple[int, int, int, int, int]) -> None:
+        old = self.slots[i]
+        if old is not None and old[0] != entry[0]:
+            self.overwrites += 1
+        self.slots[i] = entry
+        self.stores += 1
+
+    def hit_rate(self) -> float:
+        """Fracción de consultas que encontraron la posición"""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def clear(self) -> None:
+        """Vacía la tabla y reinicia las estadísticas"""
+        self.__init__(2 * self.buckets)
+
+
+class MoveOrdering:
+    """
+    Ordenamiento de jugadas para la poda Alfa-Beta
+
+    Cada criterio se activa por separado; el orden resultante es:
+    1. `pv`: la jugada de la variante principal (la mejor casilla guardada
+       en la tabla de transposición para esta posición).
+    2. `killers`: las dos últimas jugadas que produjeron una poda en la misma
+       profundidad (ply) en otra rama.
+    3. `static`: centro > esquinas > bordes.
+    4. `history`: casillas que más podas han producido, pesadas por la
+       profundidad restante al cortar (depth²), separadas por jugador.
+    El historial va después del orden estático porque en 3x3 lo desempata
+    mejor de lo que lo reemplaza (ver triqui_bench.py). Los empates se
+    mantienen fila por fila, así que sin criterios activos el orden es el
+    de `get_valid_moves`.
+    """
+
+    def __init__(self, pv: bool = True, killers: bool = True, history: bool = True, static: bool = True):
+        self.pv = pv
+        self.use_killers = killers
+        self.use_history = history
+        self.static = static
+        self.clear()
+
+    def clear(self) -> None:
+        """Olvida killers e historial (por ejemplo, al empezar otra partida)"""
+        self.killers = [[0, 0] for _ in range(10)]
+        self.history = [[0] * 9, [0] * 9]
+
+    def order(self, empty: int, first: int, ply: int) -> List[int]:
+        """
+        Casillas vacías (como bits) en el orden en que conviene probarlas
+
+        Args:
+            empty: Máscara de casillas vacías
+            first: Jugada de la variante principal (0 si no hay)
+            ply: Distancia a la raíz de la búsqueda
+        """
+        first = first if self.pv else 0
+        killer1, killer2 = self.killers[ply] if self.use_killers else (0, 0)
+        history = self.history[ply & 1] if self.use_history else None
+        static = self.static
+
+        def priority(bit: int) -> Tuple[int, int, int, int]:
+            cell = bit.bit_length() - 1
+            return (bit == first,
+                    2 if bit == killer1 else 1 if bit == killer2 else 0,
+                    STATIC_PRIORITY[cell] if static else 0,
+                    history[cell] if history is not None else 0)
+
+        return sorted(BITS_OF[empty], key=priority, reverse=True)
+
+    def cutoff(self, bit: int, ply: int, depth: int) -> None:
+        """Registra que la jugada `bit` produjo una poda a `depth` de profundidad restante"""
+        if self.use_killers:
+            killers = self.killers[ply]
+            if killers[0] != bit:
+                killers[1], killers[0] = killers[0], bit
+        if self.use_history:
+            self.history[ply & 1][bit.bit_length() - 1] += depth * depth
+
+
+class SearchStats:
+    """
+    Contadores de la búsqueda por ply (distancia a la raíz)
+
+    `nodes[p]`: posiciones generadas a distancia p (incluidas las hojas).
+    `cutoffs[p]`: podas Alfa-Beta en nodos a distancia p.
+    """
+
+    def __init__(self):
+        self.nodes = [0] * 10
+        self.cutoffs = [0] * 10
+
+    @property
+    def total_nodes(self) -> int:
+        return sum(self.nodes)
+
+    @property
+    def total_cutoffs(self) -> int:
+        return sum(self.cutoffs)
+
+    def report(self) -> str:
+        """Tabla de nodos y podas por ply"""
+        lines = ["ply      nodos    podas"]
+        for ply in range(10):
+            if self.nodes[ply] or self.cutoffs[ply]:
+                lines.append(f"{ply:>3} {self.nodes[ply]:>10} {self.cutoffs[ply]:>8}")
+        lines.append(f"tot {self.total_nodes:>10} {self.total_cutoffs:>8}")
+        return "\n".join(lines)
+
+
+class SearchTimeout(Exception):
+    """Se venció el plazo de la búsqueda (profundización iterativa)"""
+
+
+class SearchResult(NamedTuple):
+    """Resultado de `TriquiGame.iterative_deepening`"""
+    move: Optional[Tuple[int, int]]  # Mejor jugada de la última iteración completa
+    value: int                        # Su valor (para MAX)
+    depth: int                        # Profundidad de la última iteración completa
+    nodes: int                        # Nodos de todas las iteraciones, incluida la interrumpida
+    nodes_per_depth: List[int]        # Nodos de cada iteración
+    complete: bool                    # Se buscó hasta el final del juego: el valor es exacto
+    timed_out: bool                   # Se interrumpió una iteración por el plazo
+    elapsed_ms: float
+
+
+def _negamax(me: int, opp: int, depth: int, alpha: float, beta: float,
+             tt: Optional[TranspositionTable] = None, ordering: Optional[MoveOrdering] = None,
+             stats: Optional[SearchStats] = None, ply: int = 1, deadline: float = 0.0) -> float:
+    """
+    Minimax con poda Alfa-Beta en forma negamax sobre bitboards
+
+    `me` son las casillas de quien juega y el valor es desde su punto de
+    vista (la heurística es antisimétrica: evaluate_bits(o, x) = -evaluate_bits(x, o)).
+    Maximizar -valor del hijo con la ventana (-beta, -alpha) equivale a la rama
+    MIN de `minimax`, con las mismas podas. La jugada se hace con un OR sobre
+    enteros (no se copia el tablero) y, como el padre no era terminal, el hijo
+    gana si y solo si `WINNING[child]`.
+
+    Con tabla de transposición, una entrada de la misma profundidad responde
+    el nodo si su cota basta para la ventana, y su mejor casilla se prueba
+    primero. La profundidad se recorta al número de casillas vacías (buscar
+    más allá no cambia el valor), para que compartan entrada las búsquedas
+    completas lanzadas con cualquier profundidad.
+
+    Con `ordering` las jugadas se prueban en el orden de `MoveOrdering` y las
+    podas lo alimentan; `stats` cuenta nodos y podas por ply. Con `deadline`
+    (instante de `time.perf_counter`) se lanza `SearchTimeout` al vencerse;
+    la tabla solo guarda nodos terminados, así que sigue siendo válida.
+    """
+    if deadline and time.perf_counter() > deadline:
+        raise SearchTimeout
+    empty = FULL_MASK ^ (me | opp)
+    first = 0
+    if tt is not None:
+        if depth > POPCOUNT[empty]:
+            depth = POPCOUNT[empty]
+        key, sym = tt.canonical(me, opp)
+        entry = tt.probe(key)
+        if entry is not None:
+            if entry[1] == depth:
+                flag, value = entry[2], entry[3]
+                if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                    tt.cutoffs += 1
+                    return value
+            first = 1 << SYM_INVERSE[sym][entry[4]]
+        alpha_orig = alpha
+    if ordering is not None:
+        moves = ordering.order(empty, first, ply)
+    elif first:
+        moves = (first,) + BITS_OF[empty ^ first]
+    else:
+        moves = BITS_OF[empty]
+    full = len(moves) == 1  # Queda una sola casilla: el hijo llena el tablero
+    best, best_bit = -math.inf, 0
+    examined = 0
+    for bit in moves:
+        examined += 1
+        child = me | bit
+        if WINNING[child]:
+            score = 1000
+        elif full:
+            score = 0
+        elif depth == 1:
+            score = evaluate_bits(child, opp)
+        else:
+            score = -_negamax(opp, child, depth - 1, -beta, -alpha, tt, ordering, stats, ply + 1, deadline)
+        if score > best:
+            best, best_bit = score, bit
+            if score > alpha:
+                alpha = score
+                if beta <= alpha:
+                    # Poda
+                    if ordering is not None:
+                        ordering.cutoff(bit, ply, depth)
+                    if stats is not None:
+                        stats.cutoffs[ply] += 1
+                    break
+    if stats is not None:
+        stats.nodes[ply + 1] += examined
+    if tt is not None:
+        flag = UPPER if best <= alpha_orig else LOWER if best >= beta else EXACT
+        tt.store(key, depth, flag, best, SYM_CELLS[sym][best_bit.bit_length() - 1])
+    return best
+
 
 class TriquiGame:
     """
@@ -22,6 +395,15 @@ class TriquiGame:
         # 0 = vacío, 1 = X (MAX/Humano), -1 = O (MIN/IA)
         self.board = [[0, 0, 0] for _ in range(3)]
         self.current_player = 1  # X empieza primero
+        # Tabla de transposición compartida por las búsquedas de la partida
+        # (None desactiva la tabla)
+        self.tt: Optional[TranspositionTable] = TranspositionTable()
+        # Ordenamiento de jugadas (None: fila por fila, con la jugada de la
+        # tabla de transposición primero) y contadores acumulados de búsqueda
+        self.ordering: Optional[MoveOrdering] = MoveOrdering()
+        self.stats = SearchStats()
+        # Juego resuelto (triqui_tabla.py); sin el archivo la IA busca con minimax
+        self.table: Optional[SolvedTable] = open_table()
         
     def print_board(self):
         """Imprime el tablero actual de forma visual"""
@@ -86,23 +468,7 @@ class TriquiGame:
         Returns:
             1 si gana X, -1 si gana O, 0 si no hay ganador
         """
-        # Verificar filas
-        for row in state:
-            if row[0] == row[1] == row[2] != 0:
-                return row[0]
-        
-        # Verificar columnas
-        for col in range(3):
-            if state[0][col] == state[1][col] == state[2][col] != 0:
-                return state[0][col]
-        
-        # Verificar diagonales
-        if state[0][0] == state[1][1] == state[2][2] != 0:
-            return state[0][0]
-        if state[0][2] == state[1][1] == state[2][0] != 0:
-            return state[0][2]
-        
-        return 0
+        return bits_winner(*board_to_bits(state))
     
     def is_terminal_state(self, state: List[List[int]]) -> bool:
         """
@@ -114,15 +480,8 @@ class TriquiGame:
         Returns:
             True si el juego terminó, False en caso contrario
         """
-        # Hay ganador
-        if self.check_winner(state) != 0:
-            return True
-        
-        # Tablero lleno (empate)
-        for row in state:
-            if 0 in row:
-                return False
-        return True
+        x_bits, o_bits = board_to_bits(state)
+        return bits_winner(x_bits, o_bits) != 0 or (x_bits | o_bits) == FULL_MASK
     
     def evaluate_state(self, state: List[List[int]]) -> int:
         """
@@ -136,7 +495,8 @@ class TriquiGame:
         Returns:
             Valor heurístico del estado
         """
-        winner = self.check_winner(state)
+        x_bits, o_bits = board_to_bits(state)
+        winner = bits_winner(x_bits, o_bits)
         
         # Si hay un ganador definitivo
         if winner == 1:  # Gana X (MAX)
@@ -145,58 +505,13 @@ class TriquiGame:
             return -1000
         
         # Si es empate
-        if self.is_terminal_state(state):
+        if (x_bits | o_bits) == FULL_MASK:
             return 0
         
-        # Evaluación heurística para estados no terminales
-        score = 0
-        
-        # Indicadores para la función heurística
-        # Ind1: Líneas potenciales de victoria para MAX
-        # Ind2: Líneas potenciales de victoria para MIN
-        # Ind3: Control del centro
-        
-        lines = []
-        # Agregar todas las líneas (filas, columnas, diagonales)
-        for i in range(3):
-            lines.append([state[i][0], state[i][1], state[i][2]])  # Filas
-            lines.append([state[0][i], state[1][i], state[2][i]])  # Columnas
-        lines.append([state[0][0], state[1][1], state[2][2]])  # Diagonal principal
-        lines.append([state[0][2], state[1][1], state[2][0]])  # Diagonal secundaria
-        
-        for line in lines:
-            x_count = line.count(1)
-            o_count = line.count(-1)
-            
-            # Líneas con potencial para X
-            if o_count == 0:
-                if x_count == 2:
-                    score += 50  # Casi gana X
-                elif x_count == 1:
-                    score += 10  # Línea con potencial para X
-            
-            # Líneas con potencial para O
-            if x_count == 0:
-                if o_count == 2:
-                    score -= 50  # Casi gana O (hay que bloquear)
-                elif o_count == 1:
-                    score -= 10  # Línea con potencial para O
-        
-        # Bonificación por control del centro
-        if state[1][1] == 1:
-            score += 30
-        elif state[1][1] == -1:
-            score -= 30
-        
-        # Bonificación por esquinas
-        corners = [(0,0), (0,2), (2,0), (2,2)]
-        for r, c in corners:
-            if state[r][c] == 1:
-                score += 15
-            elif state[r][c] == -1:
-                score -= 15
-        
-        return score
+        # Evaluación heurística para estados no terminales:
+        # Ind1/Ind2: líneas potenciales (±50 con dos fichas, ±10 con una)
+        # Ind3: control del centro (±30) y de las esquinas (±15 cada una)
+        return evaluate_bits(x_bits, o_bits)
     
     def minimax(self, state: List[List[int]], depth: int, is_maximizing: bool, 
                 alpha: float = -math.inf, beta: float = math.inf) -> Tuple[int, Optional[Tuple[int, int]]]:
@@ -217,49 +532,145 @@ class TriquiGame:
         if self.is_terminal_state(state) or depth == 0:
             return self.evaluate_state(state), None
         
-        valid_moves = self.get_valid_moves(state)
-        best_move = None
+        x_bits, o_bits = board_to_bits(state)
+        value, cell = self._search(x_bits, o_bits, depth, is_maximizing, alpha, beta)
+        return value, CELL_TO_MOVE[cell]
+    
+    def _search(self, x_bits: int, o_bits: int, depth: int, is_maximizing: bool,
+                alpha: float, beta: float, pv: int = -1, deadline: float = 0.0) -> Tuple[int, int]:
+        """
+        Raíz de la búsqueda sobre bitboards (estado no terminal, depth > 0)
+        
+        Las jugadas se prueban en el orden de `self.ordering`, pero entre
+        jugadas de igual valor gana la primera fila por fila, como en
+        `get_valid_moves`: una casilla anterior a la mejor actual se busca con
+        alfa - 1, así que un empate con la mejor regresa su valor exacto. El
+        valor y la jugada coinciden con la búsqueda sobre la matriz.
         
+        Args:
+            pv: Casilla que se prueba primero (la mejor de la iteración anterior);
+                sin ella, la de la tabla de transposición
+            deadline: Plazo para `_negamax` (0: sin plazo)
+        
+        Returns:
+            Tupla (valor para MAX, casilla del mejor movimiento como índice 0-8)
+        """
+        # En negamax cada nodo maximiza desde el punto de vista de quien juega
         if is_maximizing:
-            max_eval = -math.inf
-            for move in valid_moves:
-                new_state = self.make_move(move[0], move[1], 1, state)
-                eval_score, _ = self.minimax(new_state, depth - 1, False, alpha, beta)
-                
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = move
-                
-                # Poda Alfa-Beta
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break  # Poda Beta
-            
-            return max_eval, best_move
+            me, opp, sign = x_bits, o_bits, 1
         else:
-            min_eval = math.inf
-            for move in valid_moves:
-                new_state = self.make_move(move[0], move[1], -1, state)
-                eval_score, _ = self.minimax(new_state, depth - 1, True, alpha, beta)
-                
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_move = move
-                
-                # Poda Alfa-Beta
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break  # Poda Alfa
+            me, opp, sign = o_bits, x_bits, -1
+            alpha, beta = -beta, -alpha
+        tt, ordering, stats = self.tt, self.ordering, self.stats
+        empty = FULL_MASK ^ (me | opp)
+        first = 1 << pv if pv >= 0 else 0
+        if tt is not None and not first:
+            key, sym = tt.canonical(me, opp)
+            entry = tt.probe(key)
+            if entry is not None:
+                first = 1 << SYM_INVERSE[sym][entry[4]]
+        if ordering is not None:
+            moves = ordering.order(empty, first, 0)
+        elif first:
+            moves = (first,) + BITS_OF[empty ^ first]
+        else:
+            moves = BITS_OF[empty]
+        full = len(moves) == 1
+        best, best_cell = -math.inf, -1
+        for bit in moves:
+            stats.nodes[1] += 1
+            cell = bit.bit_length() - 1
+            child = me | bit
+            if WINNING[child]:
+                score = 1000
+            elif full:
+                score = 0
+            elif depth == 1:
+                score = evaluate_bits(child, opp)
+            else:
+                low = alpha - 1 if cell < best_cell else alpha
+                score = -_negamax(opp, child, depth - 1, -beta, -low, tt, ordering, stats, 1, deadline)
+            if score > best or (score == best and cell < best_cell):
+                best, best_cell = score, cell
+            alpha = max(alpha, score)
+            if beta <= alpha:
+                if ordering is not None:
+                    ordering.cutoff(bit, 0, depth)
+                stats.cutoffs[0] += 1
+                break
+        return sign * best, best_cell
+    
+    def iterative_deepening(self, state: List[List[int]], is_maximizing: bool, time_limit_ms: float,
+                            max_depth: int = 9) -> SearchResult:
+        """
+        Profundización iterativa con presupuesto de tiempo
+        
+        Busca con profundidad 1, 2, ... hasta `max_depth` (o hasta el final
+        del juego) mientras quede tiempo. Cada iteración prueba primero la
+        mejor jugada de la anterior en la raíz, y en los nodos internos las
+        jugadas que la tabla de transposición guardó en la iteración anterior
+        (la variante principal). Al vencerse el plazo la iteración en curso se
+        abandona y se responde con la última completa; la profundidad 1 se
+        busca siempre, así que siempre hay jugada.
+        
+        Args:
+            state: Estado actual del tablero
+            is_maximizing: True si es el turno de MAX, False si es MIN
+            time_limit_ms: Presupuesto en milisegundos
+            max_depth: Profundidad máxima
             
-            return min_eval, best_move
+        Returns:
+            SearchResult con la jugada, su valor, la profundidad alcanzada y los nodos
+        """
+        t0 = time.perf_counter()
+        deadline = t0 + time_limit_ms / 1000
+        x_bits, o_bits = board_to_bits(state)
+        max_depth = min(max_depth, POPCOUNT[FULL_MASK ^ (x_bits | o_bits)])
+        if self.is_terminal_state(state) or max_depth <= 0:
+            return SearchResult(None, self.evaluate_state(state), 0, 0, [], self.is_terminal_state(state),
+                                False, (time.perf_counter() - t0) * 1e3)
+        
+        value, cell, reached = 0, -1, 0
+        nodes_per_depth: List[int] = []
+        timed_out = False
+        for depth in range(1, max_depth + 1):
+            before = self.stats.total_nodes
+            try:
+                value, cell = self._search(x_bits, o_bits, depth, is_maximizing, -math.inf, math.inf,
+                                           pv=cell, deadline=deadline if depth > 1 else 0.0)
+                reached = depth
+            except SearchTimeout:
+                timed_out = True
+            nodes_per_depth.append(self.stats.total_nodes - before)
+            if timed_out or time.perf_counter() > deadline:
+                break
+        
+        complete = reached == POPCOUNT[FULL_MASK ^ (x_bits | o_bits)]
+        return SearchResult(CELL_TO_MOVE[cell], value, reached, sum(nodes_per_depth), nodes_per_depth,
+                            complete, timed_out, (time.perf_counter() - t0) * 1e3)
     
-    def get_ai_move(self) -> Tuple[int, int]:
+    def get_ai_move(self, time_limit_ms: Optional[float] = None) -> Tuple[int, int]:
         """
         Obtiene el mejor movimiento para la IA usando Minimax
         
+        Args:
+            time_limit_ms: Presupuesto en milisegundos para la profundización
+                iterativa; sin él se busca con profundidad 9
+        
         Returns:
             Tupla (fila, columna) con el mejor movimiento
         """
+        # Con la tabla del juego resuelto la respuesta es una consulta: la
+        # misma jugada que la búsqueda completa
+        if self.table is not None and self.table.n == 3:
+            x_bits, o_bits = board_to_bits(self.board)
+            cell = self.table.best_move(o_bits, x_bits)
+            if cell is not None:
+                return CELL_TO_MOVE[cell]
+        
+        if time_limit_ms is not None:
+            return self.iterative_deepening(self.board, False, time_limit_ms).move
+        
         # Usar profundidad 9 para explorar todo el árbol en Triqui
         _, best_move = self.minimax(self.board, 9, False)
         return best_move
@@ -0,0 +1,289 @@
+"""
+Tabla del juego resuelto para Triqui (n x n, n en línea)
+Taller 4 - Inteligencia Artificial - Juegos Multijugador
+Pontificia Universidad Javeriana - Bogotá
+
+Análisis retrógrado de todo el espacio de estados: se enumeran las
+posiciones legales por número de fichas (hacia adelante) y se valoran de la
+última capa a la primera (hacia atrás), sin recursión. Para cada posición
+canónica (bajo las 8 simetrías del tablero) se guarda el valor teórico y la
+mejor jugada en un archivo binario que se abre con mmap.
+
+Formato del archivo: cabecera `<4sBBH` (b"TRQT", versión, n, reservado)
+seguida de 3^(n*n) bytes. El byte de índice `ternario(x, o)` (casilla i vale
+3^i si es de X y 2*3^i si es de O) describe la posición canónica:
+`(valor + 1) * 32 + casilla`, con el valor desde X (+1 gana X, 0 empate,
+-1 gana O) y la casilla de la mejor jugada en el marco canónico (n*n si la
+posición es terminal). Los índices que no son posiciones canónicas legales
+valen 255. Con n = 3 el archivo pesa ~20 KB; con n = 4, ~43 MB.
+
+Uso:
+    python triqui_tabla.py [n] [archivo]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import List, Optional, Tuple
+
+MAGIC = b"TRQT"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+MISSING = 255
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "triqui3.bin")
+
+
+class Geometry:
+    """
+    Máscaras y tablas de un tablero n x n en bitboards
+
+    La casilla (fila, columna) es el bit fila*n + columna. `sym_ternary[t][b]`
+    es el índice ternario (como fichas de X) de la máscara b transformada por
+    la simetría t, de modo que el índice canónico de (x, o) es el mínimo
+    sobre t de `sym_ternary[t][x] + 2 * sym_ternary[t][o]`.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.cells = n * n
+        self.full = (1 << self.cells) - 1
+        lines = [sum(1 << (r * n + c) for c in range(n)) for r in range(n)]
+        lines += [sum(1 << (r * n + c) for r in range(n)) for c in range(n)]
+        lines.append(sum(1 << (i * n + i) for i in range(n)))
+        lines.append(sum(1 << (i * n + n - 1 - i) for i in range(n)))
+        self.win_masks = tuple(lines)
+        self.sym_cells = self._symmetries()
+        self.sym_inverse = tuple(tuple(perm.index(i) for i in range(self.cells)) for perm in self.sym_cells)
+        self.sym_ternary = tuple(self._ternary(perm) for perm in self.sym_cells)
+
+    def _symmetries(self) -> Tuple[Tuple[int, ...], ...]:
+        n = self.n
+        rotate = lambda cell: (cell % n) * n + (n - 1 - cell // n)
+        reflect = lambda cell: (cell // n) * n + (n - 1 - cell % n)
+        perms = []
+        for reflected in (False, True):
+            perm = [reflect(i) if reflected else i for i in range(self.cells)]
+            for _ in range(4):
+                perms.append(tuple(perm))
+                perm = [rotate(c) for c in perm]
+        return tuple(perms)
+
+    def _ternary(self, perm: Tuple[int, ...]) -> array:
+        """ternary[sym(b)] para toda máscara b, construido bit a bit"""
+        table = array("l", [0]) * (1 << self.cells)
+        for b in range(1, 1 << self.cells):
+            low = (b & -b).bit_length() - 1
+            table[b] = table[b & (b - 1)] + 3 ** perm[low]
+        return table
+
+    def is_win(self, bits: int) -> bool:
+        return any(bits & m == m for m in self.win_masks)
+
+    def canonical(self, x_bits: int, o_bits: int) -> Tuple[int, int]:
+        """
+        Forma canónica de la posición
+
+        Returns:
+            Tupla (índice ternario canónico, simetría que lleva la posición a él)
+        """
+        index, sym = -1, 0
+        for t, table in enumerate(self.sym_ternary):
+            k = table[x_bits] + 2 * table[o_bits]
+            if index < 0 or k < index:
+                index, sym = k, t
+        return index, sym
+
+    def transform(self, bits: int, sym: int) -> int:
+        perm = self.sym_cells[sym]
+        out = 0
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            out |= 1 << perm[low.bit_length() - 1]
+        return out
+
+
+# -----------------------------------------------------------------------------
+# Análisis retrógrado
+# -----------------------------------------------------------------------------
+
+def solve(n: int = 3, verbose: bool = False) -> bytearray:
+    """
+    Resuelve Triqui n x n
+
+    Args:
+        n: Lado del tablero (3 o 4 caben en memoria)
+        verbose: Imprime el número de posiciones por capa
+
+    Returns:
+        Tabla de 3^(n*n) bytes en el formato del archivo (sin cabecera)
+    """
+    g = Geometry(n)
+    table = bytearray([MISSING]) * (3 ** g.cells)
+    seen = MISSING - 1
+    # Capas hacia adelante: posiciones canónicas (x << cells | o) con k fichas
+    layers: List[array] = [array("Q", [0])]
+    table[0] = seen
+    for k in range(g.cells):
+        nxt = array("Q")
+        x_to_move = k % 2 == 0
+        for packed in layers[k]:
+            x_bits, o_bits = packed >> g.cells, packed & g.full
+            if g.is_win(x_bits) or g.is_win(o_bits):
+                continue
+            empty = g.full ^ (x_bits | o_bits)
+            while empty:
+                bit = empty & -empty
+                empty ^= bit
+                cx, co = (x_bits | bit, o_bits) if x_to_move else (x_bits, o_bits | bit)
+                index, sym = g.canonical(cx, co)
+                if table[index] == MISSING:
+                    table[index] = seen
+                    nxt.append(g.transform(cx, sym) << g.cells | g.transform(co, sym))
+        layers.append(nxt)
+        if verbose:
+            print(f"capa {k + 1:>2}: {len(nxt):>9} posiciones canónicas")
+
+    # Capas hacia atrás: el valor de cada posición sale de sus hijos ya valorados
+    none = g.cells
+    for k in range(g.cells, -1, -1):
+        x_to_move = k % 2 == 0
+        for packed in layers[k]:
+            x_bits, o_bits = packed >> g.cells, packed & g.full
+            index = g.canonical(x_bits, o_bits)[0]
+            if g.is_win(x_bits):
+                table[index] = 2 * 32 + none
+                continue
+            if g.is_win(o_bits):
+                table[index] = none
+                continue
+            empty = g.full ^ (x_bits | o_bits)
+            if not empty:
+                table[index] = 32 + none
+                continue
+            best, best_cell = None, none
+            for cell in range(g.cells):
+                bit = 1 << cell
+                if not empty & bit:
+                    continue
+                cx, co = (x_bits | bit, o_bits) if x_to_move else (x_bits, o_bits | bit)
+                value = table[g.canonical(cx, co)[0]] >> 5
+                if best is None or (value > best if x_to_move else value < best):
+                    best, best_cell = value, cell
+            table[index] = best * 32 + best_cell
+        layers[k] = array("Q")  # La capa ya no hace falta
+    return table
+
+
+def build_table(n: int = 3, path: str = DEFAULT_PATH, verbose: bool = False) -> None:
+    """Resuelve el tablero n x n y escribe el archivo (de forma atómica)"""
+    table = solve(n, verbose)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, n, 0))
+        f.write(table)
+    os.replace(tmp, path)
+
+
+# -----------------------------------------------------------------------------
+# Consulta
+# -----------------------------------------------------------------------------
+
+class SolvedTable:
+    """
+    Tabla resuelta abierta con mmap: cada consulta lee un byte del archivo
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, _ = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION or len(self._mm) != HEADER.size + 3 ** (n * n):
+            self._mm.close()
+            raise ValueError(f"{path}: no es una tabla de Triqui (versión {VERSION})")
+        self.n = n
+        self.geometry = Geometry(n)
+
+    def _entry(self, x_bits: int, o_bits: int) -> Tuple[int, int]:
+        index, sym = self.geometry.canonical(x_bits, o_bits)
+        byte = self._mm[HEADER.size + index]
+        if byte == MISSING:
+            raise KeyError("la posición no es legal")
+        return byte, sym
+
+    def value(self, x_bits: int, o_bits: int) -> int:
+        """Valor teórico desde X: 1 gana X, 0 empate, -1 gana O"""
+        return (self._entry(x_bits, o_bits)[0] >> 5) - 1
+
+    def lookup(self, x_bits: int, o_bits: int) -> Tuple[int, Optional[int]]:
+        """
+        Valor y mejor jugada guardados para la posición
+
+        Returns:
+            Tupla (valor desde X, casilla en el tablero dado o None si es terminal)
+        """
+        byte, sym = self._entry(x_bits, o_bits)
+        cell = byte & 31
+        if cell == self.geometry.cells:
+            return (byte >> 5) - 1, None
+        return (byte >> 5) - 1, self.geometry.sym_inverse[sym][cell]
+
+    def best_move(self, me: int, opp: int) -> Optional[int]:
+        """
+        Primera jugada óptima de quien mueve, recorriendo las casillas fila por
+        fila (la misma que elige una búsqueda minimax completa) y leyendo el
+        valor de cada hijo
+
+        Args:
+            me: Casillas de quien mueve
+            opp: Casillas del rival
+
+        Returns:
+            Casilla de la jugada o None si la posición es terminal
+        """
+        # En la tabla empieza X; si empezó quien no mueve, se intercambian los colores
+        if bin(me).count("1") == bin(opp).count("1"):
+            x_bits, o_bits, sign = me, opp, 1
+        else:
+            x_bits, o_bits, sign = opp, me, -1
+        if self.lookup(x_bits, o_bits)[1] is None:
+            return None
+        best, best_cell = None, None
+        for cell in range(self.geometry.cells):
+            bit = 1 << cell
+            if (me | opp) & bit:
+                continue
+            value = sign * (self.value(x_bits | bit, o_bits) if sign > 0 else self.value(x_bits, o_bits | bit))
+            if best is None or value > best:
+                best, best_cell = value, cell
+        return best_cell
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def open_table(path: str = DEFAULT_PATH) -> Optional[SolvedTable]:
+    """La tabla del archivo, o None si no existe (el juego vuelve a buscar)"""
+    if not os.path.exists(path):
+        return None
+    return SolvedTable(path)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    path = sys.argv[2] if len(sys.argv) > 2 else (DEFAULT_PATH if n == 3 else f"triqui{n}.bin")
+    t0 = time.perf_counter()
+    build_table(n, path, verbose=True)
+    table = SolvedTable(path)
+    value = table.value(0, 0)
+    table.close()
+    result = {1: "gana X", 0: "empate", -1: "gana O"}[value]
+    print(f"Tablero {n}x{n}: {result} con juego perfecto ({time.perf_counter() - t0:.1f} s)")
+    print(f"Tabla guardada en {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+examples/bench_ordering.py
+==========================
+Compara la resolución **sin restricciones** con la **resolución ordenada**
+(LPO/KBO), con funciones de selección y con hiper-resolución / resolución UR
+sobre un conjunto de problemas:
+
+- `tuna`: el caso "¿La curiosidad mató a Tuna?".
+- `cadena-n`: reglas P0(x) → P1(x) → ... → Pn(x) con un hecho y la meta al final.
+- `casi-horn-n`: cadenas con disyunciones (dos positivos por cláusula).
+- `aleatorio-k`: KBs aleatorias pequeñas con variables y constantes.
+
+Para cada estrategia se reporta el resultado, resolventes generados (pasos de
+la traza), cláusulas retenidas y tiempo.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from motor.cnf import clausify
+from motor.first_order_resolution import resolve_first_order, L
+from motor.ordering import LPO, KBO
+from motor.unification import Var, Const
+
+
+def problem_set():
+    yield "tuna", clausify(["forall x. Curioso(x) -> Mata(Curiosidad, x)",
+                            "forall x y. Mata(y, x) -> Muerto(x)",
+                            "Gato(Tuna)",
+                            "forall x. Gato(x) -> Curioso(x)"], goal="Muerto(Tuna)")
+    for n in (8, 16):
+        rules = [f"forall x. P{i}(x) -> P{i + 1}(x)" for i in range(n)]
+        yield f"cadena-{n}", clausify(rules + ["P0(a)"], goal=f"P{n}(a)")
+    for n in (4, 6):
+        rules = [f"forall x. P{i}(x) -> P{i + 1}(x) | Q{i + 1}(x)" for i in range(n)]
+        rules += [f"forall x. Q{i}(x) -> P{i}(x)" for i in range(1, n + 1)]
+        yield f"casi-horn-{n}", clausify(rules + ["P0(a)"], goal=f"P{n}(a)")
+    rnd = random.Random(7)
+    V, C = [Var("x"), Var("y")], [Const("a"), Const("b")]
+    preds = [("P", 1), ("Q", 1), ("R", 2)]
+    for k in range(4):
+        kb = []
+        for _ in range(5):
+            lits = {L(name, *[rnd.choice(V + C) for _ in range(ar)], neg=rnd.random() < .5)
+                    for name, ar in (rnd.choice(preds) for _ in range(rnd.randint(1, 3)))}
+            kb.append(frozenset(lits))
+        yield f"aleatorio-{k}", kb
+
+
+STRATEGIES = [
+    ("sin restricción", {}),
+    ("LPO", {"ordering": LPO()}),
+    ("KBO", {"ordering": KBO()}),
+    ("KBO + selección", {"ordering": KBO(), "selection": "heaviest_negative"}),
+    ("selección", {"selection": "first_negative"}),
+    ("hiper", {"inference": "hyper"}),
+    ("UR", {"inference": "ur"}),
+]
+
+
+def main():
+    print(f"{'problema':<14} {'estrategia':<17} {'□':>3} {'generados':>10} {'retenidas':>10} {'ms':>9}")
+    totals = {name: [0, 0, 0.0] for name, _ in STRATEGIES}
+    for pname, kb in problem_set():
+        for sname, kw in STRATEGIES:
+            t0 = time.perf_counter()
+            entails, derived, _, steps = resolve_first_order(kb, keep_steps=True, **kw)
+            ms = (time.perf_counter() - t0) * 1e3
+            totals[sname][0] += len(steps)
+            totals[sname][1] += len(derived)
+            totals[sname][2] += ms
+            print(f"{pname:<14} {sname:<17} {'sí' if entails else 'no':>3} {len(steps):>10} {len(derived):>10} {ms:>9.1f}")
+        print()
+    print("Totales:")
+    for sname, (gen, kept, ms) in totals.items():
+        print(f"  {sname:<17} generados={gen:<7} retenidas={kept:<7} {ms:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
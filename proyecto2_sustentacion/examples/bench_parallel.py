@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+examples/bench_parallel.py
+==========================
+Curvas de aceleración de `resolve_first_order_parallel` según el número de
+procesos, frente a `resolve_first_order` secuencial, y carreras de
+`portfolio` sobre los problemas de `bench_ordering.py`.
+
+Para cada problema se reporta el tiempo secuencial, el tiempo con 1, 2, 4, ...
+trabajadores (hasta `os.cpu_count()`, mínimo 4) y la aceleración respecto de
+1 trabajador; además se verifica que la traza es la misma con cualquier
+número de trabajadores. Con un solo núcleo la aceleración no puede superar 1.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from examples.bench_ordering import problem_set
+from motor.cnf import clausify
+from motor.first_order_resolution import resolve_first_order
+from motor.parallel import resolve_first_order_parallel, portfolio
+
+
+def heavy_problems():
+    """Problemas con rondas anchas (muchas cláusulas dadas por ronda)."""
+    for n in (6, 8):
+        rules = [f"forall x. P{i}(x) -> P{i + 1}(x) | Q{i + 1}(x)" for i in range(n)]
+        rules += [f"forall x. Q{i}(x) -> P{i}(x)" for i in range(1, n + 1)]
+        yield f"casi-horn-{n}", clausify(rules + ["P0(a)"], goal=f"P{n}(a)")
+    rules = [f"forall x y. R{i}(x, y) -> R{i + 1}(y, x)" for i in range(6)]
+    yield "simetría-6", clausify(rules + ["R0(a, b)", "R0(b, c)"], goal="R6(c, a)")
+
+
+def _timed(f):
+    t0 = time.perf_counter()
+    out = f()
+    return out, time.perf_counter() - t0
+
+
+def _signature(result):
+    entails, _, _, steps = result
+    return entails, [(s.left_id, s.right_id, sorted(map(str, s.resolvent))) for s in steps]
+
+
+def main():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] < max(4, cores):
+        counts.append(counts[-1] * 2)
+    print(f"núcleos: {cores}\n")
+    header = f"{'problema':<13} {'□':>3} {'secuencial':>11}" + "".join(f" {f'{w} proc':>9}" for w in counts)
+    print(header + "   aceleración (vs 1 proc)")
+    for pname, kb in heavy_problems():
+        (seq, t_seq) = _timed(lambda: resolve_first_order(kb, keep_steps=True))
+        times, sigs = [], set()
+        for w in counts:
+            res, t = _timed(lambda: resolve_first_order_parallel(kb, workers=w))
+            times.append(t)
+            sigs.add(repr(_signature(res)))
+        speedup = " ".join(f"{times[0] / t:4.2f}x" for t in times)
+        same = "" if len(sigs) == 1 else "  (¡trazas distintas!)"
+        print(f"{pname:<13} {'sí' if seq[0] else 'no':>3} {t_seq * 1e3:>9.1f}ms"
+              + "".join(f" {t * 1e3:>7.1f}ms" for t in times) + f"   {speedup}{same}")
+
+    print("\nPortafolio (gana la primera estrategia que decide):")
+    problems = dict(problem_set())
+    problems.update(heavy_problems())
+    for pname, kb in problems.items():
+        r = portfolio(kb, timeout=30)
+        print(f"  {pname:<13} {r.entails!r:<8} ganador={r.winner!s:<17} {r.elapsed * 1e3:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
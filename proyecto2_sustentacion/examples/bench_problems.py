@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+examples/bench_problems.py
+==========================
+Banco de **regresión** sobre archivos de problemas TPTP / DIMACS
+(`motor/problems.py`) con varias estrategias de los dos motores.
+
+    python -m examples.bench_problems [DIR ...] [--tiempo S] [--estrategias a,b]
+                                      [--base ARCHIVO] [--guardar] [--tolerancia F]
+                                      [--margen F]
+
+Sin argumentos corre `examples/problems/` contra `examples/problems/baseline.json`.
+Cada par (problema, estrategia) corre en un proceso nuevo (contexto *spawn*):
+así el pico de memoria residente es el de esa corrida, y un motor sin
+presupuesto (CDCL) se mata al vencer el plazo. Por corrida se registra el
+resultado, si se resolvió (decidió y coincide con el estado SZS esperado),
+el tiempo, los resolventes generados y el pico de memoria.
+
+Contra la línea base son **regresiones** los problemas que dejan de
+resolverse, las respuestas que contradicen el estado esperado y las corridas
+más de `--tolerancia` veces más lentas (con al menos 50 ms de diferencia).
+También lo es toda corrida que **excede su presupuesto** en más de `--margen`
+(fracción de `--tiempo`): un motor que no respeta su plazo no debe quedar
+registrado como normal. El programa sale con código 1 si hay alguna
+regresión. `--guardar` reescribe la base (y sale con 1 si alguna corrida excede su presupuesto).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.budget import Budget, UNKNOWN, peak_rss_bytes
+from motor.first_order_resolution import resolve_first_order
+from motor.ordering import KBO
+from motor.problems import Problem, load_directory
+from motor.propositional_resolution import resolve_propositional
+from motor.sat_solver import resolve_propositional_cdcl
+from motor.stats import ResolutionStats
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIR = os.path.join(HERE, "problems")
+DEFAULT_BASELINE = os.path.join(DEFAULT_DIR, "baseline.json")
+
+# (nombre, motor, argumentos); las estrategias "prop" solo corren sobre problemas proposicionales
+STRATEGIES: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("resolución", "prop", {}),
+    ("CDCL", "prop", {}),
+    ("binaria", "fol", {}),
+    ("KBO + selección", "fol", {"selection": "heaviest_negative"}),  # el orden KBO se crea en el hijo
+    ("hiper", "fol", {"inference": "hyper"}),
+    ("UR", "fol", {"inference": "ur"}),
+]
+
+_LABELS = {True: "sí", False: "no", UNKNOWN: "?"}
+
+# Fracción del presupuesto tolerada por encima del plazo (el reloj se revisa
+# cada `check_every` consultas, así que un pequeño exceso es normal)
+OVERRUN_MARGIN = 0.2
+
+# -----------------------------------------------------------------------------
+# Una corrida (en el proceso hijo)
+# -----------------------------------------------------------------------------
+
+def _run(problem: Problem, strategy: str, time_limit: float) -> Dict[str, Any]:
+    engine, kwargs = next((e, kw) for n, e, kw in STRATEGIES if n == strategy)
+    stats = ResolutionStats()
+    generated: Optional[int] = None
+    t0 = time.perf_counter()
+    if strategy == "CDCL":
+        entails = resolve_propositional_cdcl(problem.propositional(), keep_steps=False)[0]
+    elif engine == "prop":
+        entails = resolve_propositional(problem.propositional(), keep_steps=False, stats=stats,
+                                        budget=Budget(time_limit=time_limit))[0]
+        generated = stats.generated
+    else:
+        if strategy.startswith("KBO"):
+            kwargs = dict(kwargs, ordering=KBO())
+        entails = resolve_first_order(problem.first_order(), keep_steps=False, stats=stats,
+                                      budget=Budget(time_limit=time_limit), **kwargs)[0]
+        generated = stats.generated
+    ms = (time.perf_counter() - t0) * 1e3
+    if entails is False and kwargs.get("inference") == "ur":
+        entails = UNKNOWN  # UR es incompleta: saturar no prueba satisfacibilidad
+    peak = peak_rss_bytes()
+    return {"resultado": _LABELS[entails], "ms": round(ms, 1), "generadas": generated,
+            "memoria_mb": round(peak / 2 ** 20, 1) if peak is not None else None}
+
+
+def _child(conn, problem: Problem, strategy: str, time_limit: float) -> None:
+    try:
+        conn.send(_run(problem, strategy, time_limit))
+    except Exception as exc:  # el banco reporta el fallo en vez de abortar
+        conn.send({"resultado": "error", "error": f"{type(exc).__name__}: {exc}"})
+    conn.close()
+
+
+def run_isolated(problem: Problem, strategy: str, time_limit: float) -> Dict[str, Any]:
+    """Corre una estrategia sobre un problema en un proceso aparte, con plazo duro."""
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(child, problem, strategy, time_limit), daemon=True)
+    t0 = time.perf_counter()
+    proc.start()
+    child.close()
+    # Margen sobre el presupuesto: arranque del intérprete, revisiones espaciadas
+    # del reloj y conversión del resultado a texto al terminar
+    if parent.poll(time_limit * 2 + 10):
+        out = parent.recv()
+    else:
+        out = {"resultado": "tiempo", "ms": round((time.perf_counter() - t0) * 1e3, 1),
+               "generadas": None, "memoria_mb": None}
+    proc.terminate()
+    proc.join()
+    parent.close()
+    return out
+
+# -----------------------------------------------------------------------------
+# Banco y comparación
+# -----------------------------------------------------------------------------
+
+def _solved(problem: Problem, result: str) -> bool:
+    if result not in ("sí", "no"):
+        return False
+    return problem.expected is None or problem.expected == (result == "sí")
+
+
+def bench(problems: List[Problem], strategies: List[str], time_limit: float,
+          margin: float = OVERRUN_MARGIN) -> Dict[str, Dict[str, Any]]:
+    """
+    Resultados por clave `problema/estrategia`, imprimiendo una fila por corrida.
+    Marca `excedido` en las corridas que tardan más que `time_limit` por más de `margin`.
+    """
+    engines = {n: e for n, e, _ in STRATEGIES}
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'problema':<18} {'estrategia':<16} {'esperado':>8} {'□':>6} {'ms':>9} {'generadas':>10} {'MiB':>7}")
+    for p in problems:
+        expected = {True: "sí", False: "no", None: "—"}[p.expected]
+        for s in strategies:
+            if engines[s] == "prop" and p.kind != "prop":
+                continue
+            r = run_isolated(p, s, time_limit)
+            r["resuelto"] = _solved(p, r["resultado"])
+            r["incorrecto"] = r["resultado"] in ("sí", "no") and not r["resuelto"]
+            r["excedido"] = r.get("ms", 0) > time_limit * 1e3 * (1 + margin)
+            results[f"{p.name}/{s}"] = r
+            gen = "—" if r.get("generadas") is None else r["generadas"]
+            mem = "—" if r.get("memoria_mb") is None else f"{r['memoria_mb']:.1f}"
+            flag = "  ¡incorrecto!" if r["incorrecto"] else (f"  {r['error']}" if "error" in r else "")
+            if r["excedido"]:
+                flag += "  ¡excede el plazo!"
+            print(f"{p.name:<18} {s:<16} {expected:>8} {r['resultado']:>6} {r.get('ms', 0):>9.1f} "
+                  f"{gen!s:>10} {mem:>7}{flag}")
+    return results
+
+
+def summarize(results: Dict[str, Dict[str, Any]], strategies: List[str]) -> None:
+    print("\nResumen por estrategia:")
+    for s in strategies:
+        runs = [r for k, r in results.items() if k.rsplit("/", 1)[1] == s]
+        if not runs:
+            continue
+        solved = sum(r["resuelto"] for r in runs)
+        ms = sum(r.get("ms") or 0 for r in runs)
+        print(f"  {s:<16} resueltos {solved:>3}/{len(runs):<3} {ms:>10.1f} ms")
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    """Imprime las diferencias con la base y retorna las regresiones."""
+    regressions: List[str] = []
+    notes: List[str] = []
+    for key, r in results.items():
+        b = baseline.get(key)
+        if r["incorrecto"]:
+            regressions.append(f"{key}: respuesta {r['resultado']!r} contradice el estado esperado")
+        if r["excedido"]:
+            regressions.append(f"{key}: excede el presupuesto ({r['ms']:.1f} ms)")
+        if b is None:
+            notes.append(f"{key}: sin línea base")
+            continue
+        if b["resuelto"] and not r["resuelto"]:
+            regressions.append(f"{key}: dejó de resolverse ({b['resultado']} -> {r['resultado']})")
+        elif r["resuelto"] and not b["resuelto"]:
+            notes.append(f"{key}: ahora se resuelve ({b['resultado']} -> {r['resultado']})")
+        elif r["resuelto"] and r["ms"] > tolerance * b["ms"] and r["ms"] - b["ms"] > 50:
+            regressions.append(f"{key}: más lento ({b['ms']:.1f} -> {r['ms']:.1f} ms)")
+        if r.get("generadas") != b.get("generadas") and r["resuelto"] and b["resuelto"]:
+            notes.append(f"{key}: generadas {b.get('generadas')} -> {r.get('generadas')}")
+    print(f"\nContra la línea base: {len(regressions)} regresiones")
+    for line in regressions:
+        print("  REGRESIÓN", line)
+    for line in notes:
+        print("  ·", line)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Banco de regresión sobre problemas TPTP/DIMACS")
+    ap.add_argument("dirs", nargs="*", default=[DEFAULT_DIR], help="directorios con problemas")
+    ap.add_argument("--tiempo", type=float, default=5.0, help="segundos por corrida")
+    ap.add_argument("--estrategias", default=",".join(n for n, _, _ in STRATEGIES))
+    ap.add_argument("--base", default=DEFAULT_BASELINE, help="archivo JSON de línea base")
+    ap.add_argument("--guardar", action="store_true", help="reescribe la línea base con esta corrida")
+    ap.add_argument("--tolerancia", type=float, default=3.0, help="factor de tiempo tolerado")
+    ap.add_argument("--margen", type=float, default=OVERRUN_MARGIN,
+                    help="fracción del plazo que una corrida puede excederlo")
+    args = ap.parse_args(argv)
+
+    strategies = [s.strip() for s in args.estrategias.split(",") if s.strip()]
+    unknown = set(strategies) - {n for n, _, _ in STRATEGIES}
+    if unknown:
+        ap.error(f"estrategias desconocidas: {', '.join(sorted(unknown))}")
+    problems = [p for d in args.dirs for p in load_directory(d)]
+    results = bench(problems, strategies, args.tiempo, args.margen)
+    summarize(results, strategies)
+
+    if args.guardar:
+        with open(args.base, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1, sort_keys=True)
+        print(f"\nLínea base guardada en {args.base}")
+        over = [k for k, r in results.items() if r["excedido"]]
+        for key in over:
+            print(f"  AVISO {key}: excede el presupuesto ({results[key]['ms']:.1f} ms)")
+        return 1 if over else 0
+    if not os.path.exists(args.base):
+        print(f"\nSin línea base ({args.base}); use --guardar para crearla.")
+        return 0
+    with open(args.base, encoding="utf-8") as f:
+        baseline = json.load(f)
+    return 1 if compare(results, baseline, args.tolerancia) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
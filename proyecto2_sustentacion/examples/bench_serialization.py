@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+examples/bench_serialization.py
+===============================
+Carga de KBs grandes: construir las cláusulas con `L(...)`/`frozenset` frente a
+leerlas del formato binario de `motor/serialization.py` (mmap), y retomar un
+`FolProver` parcialmente saturado desde disco frente a calentarlo de nuevo.
+
+La KB sintética tiene hechos `R_k(c_i, f(c_j))` y reglas con variables, de
+modo que hay mucho subtérmino compartido (como en las KBs reales).
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import time
+
+from motor.first_order_resolution import FolProver, L
+from motor.knowledge_base import KnowledgeBase
+from motor.serialization import MappedClauses, load_clauses, load_prover, save_clauses, save_prover
+from motor.unification import Var, Const, Func
+
+
+def synthetic_kb(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    consts = [Const(f"c{i}") for i in range(max(10, n // 50))]
+    x, y = Var("x"), Var("y")
+    kb = []
+    for k in range(n):
+        if k % 10 == 0:
+            p, q = rnd.randrange(20), rnd.randrange(20)
+            kb.append(frozenset({L(f"R{p}", x, y, neg=True), L(f"R{q}", y, Func("f", (x,)))}))
+        else:
+            a, b = rnd.choice(consts), rnd.choice(consts)
+            kb.append(frozenset({L(f"R{rnd.randrange(20)}", a, Func("f", (b,)))}))
+    return kb
+
+
+def _timed(f):
+    t0 = time.perf_counter()
+    out = f()
+    return out, (time.perf_counter() - t0) * 1e3
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "kb.bin")
+    print(f"{'cláusulas':>10} {'construir':>11} {'guardar':>9} {'cargar':>9} {'1ª cláusula':>12} {'archivo':>9}")
+    for n in (10_000, 100_000):
+        kb, t_build = _timed(lambda: synthetic_kb(n))
+        _, t_save = _timed(lambda: save_clauses(kb, path))
+        back, t_load = _timed(lambda: load_clauses(path))
+        assert back == kb
+        with MappedClauses(path) as m:
+            _, t_first = _timed(lambda: m[len(m) // 2])
+        size = os.path.getsize(path) / 2 ** 20
+        print(f"{n:>10} {t_build:>9.1f}ms {t_save:>7.1f}ms {t_load:>7.1f}ms {t_first:>10.3f}ms {size:>7.2f}MiB")
+
+    # Estado caliente: saturar parcialmente, guardar y retomar en "otro trabajador"
+    print("\nEstado del motor:")
+    kb = synthetic_kb(2_000, seed=1)
+    warm = FolProver(keep_steps=False)
+    for c in kb:
+        warm.add_clause(c)
+    _, t_warm = _timed(lambda: warm.run(300))
+    state = os.path.join(tmp, "estado.bin")
+    _, t_save = _timed(lambda: save_prover(warm, state))
+    resumed, t_load = _timed(lambda: load_prover(state))
+    assert resumed.clauses == warm.clauses and resumed.given == warm.given
+    print(f"  calentar 300 cláusulas dadas: {t_warm:8.1f} ms ({len(warm.clauses)} retenidas)")
+    print(f"  guardar estado:               {t_save:8.1f} ms ({os.path.getsize(state) / 2 ** 20:.2f} MiB)")
+    print(f"  retomar desde disco:          {t_load:8.1f} ms")
+    r1, _ = _timed(lambda: warm.run(100))
+    r2, _ = _timed(lambda: resumed.run(100))
+    print(f"  100 dadas más: original y retomado coinciden = {r1 == r2 and resumed.clauses == warm.clauses}")
+
+    base = KnowledgeBase(["forall x. Gato(x) -> Curioso(x)", "forall x. Curioso(x) -> Mata(Curiosidad, x)",
+                          "forall x y. Mata(y, x) -> Muerto(x)", "Gato(Tuna)"])
+    base.warm_up()
+    base.save(state)
+    print(f"  KnowledgeBase.load(...).ask('Muerto(Tuna)') = {KnowledgeBase.load(state).ask('Muerto(Tuna)')[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+examples/bench_unification.py
+=============================
+Compara la unificación de **Robinson** (`unify`) con el motor **union-find**
+(`unify_uf`) sobre términos `Func` profundamente anidados y verifica que ambas
+MGU producen la misma instancia común.
+
+Familia de prueba (profundidad n):
+    t1 = f(x1, f(x2, ... f(xn, a)))
+    t2 = f(g(x2), f(g(x3), ... f(g(a), a)))
+La MGU encadena x1 ← g(x2), x2 ← g(x3), ..., por lo que Robinson re-aplica la
+sustitución (cada vez más grande) en cada nivel.
+
+Además se comprueba que ambos motores coinciden en casos límite, incluidos
+pares que solo fallan por occurs-check tras varios enlaces cíclicos.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from motor.unification import Var, Const, Func, unify, unify_uf, apply_subst_term
+
+
+def deep_pair(n: int):
+    a = Const("a")
+    xs = [Var(f"x{i}") for i in range(1, n + 1)]
+    t1: Func = Func("f", (xs[-1], a))
+    t2: Func = Func("f", (Func("g", (a,)), a))
+    for i in range(n - 2, -1, -1):
+        t1 = Func("f", (xs[i], t1))
+        t2 = Func("f", (Func("g", (xs[i + 1],)), t2))
+    return t1, t2
+
+
+def edge_cases():
+    """Pares (t1, t2) donde ambos motores deben dar la misma respuesta."""
+    x, y, z, w = Var("x"), Var("y"), Var("z"), Var("w")
+    a = Const("a")
+    g = lambda t: Func("g", (t,))
+    return [
+        # Ciclos y -> g(y), w -> g(w) creados dentro de la misma llamada
+        (Func("f", (x, x, z, z, x)), Func("f", (y, g(y), w, g(w), w))),
+        (x, g(x)),
+        (Func("f", (x, g(x))), Func("f", (g(y), y))),
+        (Func("f", (x, y, a)), Func("f", (y, g(z), z))),
+    ]
+
+
+def check_equivalence() -> bool:
+    ok = True
+    for t1, t2 in edge_cases():
+        s_rob = unify(t1, t2)
+        for mode in ("deferred", "eager"):
+            s_uf = unify_uf(t1, t2, mode)
+            if (s_rob is None) != (s_uf is None):
+                same = False
+            else:
+                same = s_rob is None or apply_subst_term(t1, s_rob) == apply_subst_term(t1, s_uf)
+            ok = ok and same
+            print(f"  {str(t1):>22} =? {str(t2):<24} [{mode:>8}]  "
+                  f"{'sin MGU' if s_uf is None else 'MGU'}  {'sí' if same else 'NO'}")
+    return ok
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main(sizes=(25, 50, 100, 200)):
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    print("Casos límite (Robinson vs union-find):")
+    check_equivalence()
+    print()
+    print(f"{'n':>5} {'Robinson (ms)':>15} {'union-find (ms)':>17} {'speedup':>9}  MGU equivalente")
+    for n in sizes:
+        t1, t2 = deep_pair(n)
+        t_rob, s_rob = timed(unify, t1, t2)
+        t_uf, s_uf = timed(unify_uf, t1, t2)
+        same = apply_subst_term(t1, s_rob) == apply_subst_term(t1, s_uf)
+        print(f"{n:>5} {t_rob * 1e3:>15.2f} {t_uf * 1e3:>17.2f} {t_rob / t_uf:>8.1f}x  {'sí' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+%------------------------------------------------------------------------------
+% File     : casi_horn12.p
+% Problem  : p0(a), p_i(X) => p_{i+1}(X) o q_{i+1}(X), q_i(X) => p_i(X); ¿p12(a)?
+% Status   : Unsatisfiable
+%------------------------------------------------------------------------------
+cnf(regla0, axiom, (~p0(X) | p1(X) | q1(X))).
+cnf(regla1, axiom, (~p1(X) | p2(X) | q2(X))).
+cnf(regla2, axiom, (~p2(X) | p3(X) | q3(X))).
+cnf(regla3, axiom, (~p3(X) | p4(X) | q4(X))).
+cnf(regla4, axiom, (~p4(X) | p5(X) | q5(X))).
+cnf(regla5, axiom, (~p5(X) | p6(X) | q6(X))).
+cnf(regla6, axiom, (~p6(X) | p7(X) | q7(X))).
+cnf(regla7, axiom, (~p7(X) | p8(X) | q8(X))).
+cnf(regla8, axiom, (~p8(X) | p9(X) | q9(X))).
+cnf(regla9, axiom, (~p9(X) | p10(X) | q10(X))).
+cnf(regla10, axiom, (~p10(X) | p11(X) | q11(X))).
+cnf(regla11, axiom, (~p11(X) | p12(X) | q12(X))).
+cnf(atajo1, axiom, (~q1(X) | p1(X))).
+cnf(atajo2, axiom, (~q2(X) | p2(X))).
+cnf(atajo3, axiom, (~q3(X) | p3(X))).
+cnf(atajo4, axiom, (~q4(X) | p4(X))).
+cnf(atajo5, axiom, (~q5(X) | p5(X))).
+cnf(atajo6, axiom, (~q6(X) | p6(X))).
+cnf(atajo7, axiom, (~q7(X) | p7(X))).
+cnf(atajo8, axiom, (~q8(X) | p8(X))).
+cnf(atajo9, axiom, (~q9(X) | p9(X))).
+cnf(atajo10, axiom, (~q10(X) | p10(X))).
+cnf(atajo11, axiom, (~q11(X) | p11(X))).
+cnf(atajo12, axiom, (~q12(X) | p12(X))).
+cnf(hecho, axiom, p0(a)).
+cnf(meta, negated_conjecture, ~p12(a)).
@@ -0,0 +1,10 @@
+%------------------------------------------------------------------------------
+% File     : igualdad.p
+% Problem  : a = b, f(a) = c y p(f(b)) implican p(c) (axiomas de igualdad)
+% Status   : Theorem
+%------------------------------------------------------------------------------
+fof(ab, axiom, a = b).
+fof(fac, axiom, f(a) = c).
+fof(pfb, axiom, p(f(b))).
+fof(meta, conjecture, p(c)).
+%------------------------------------------------------------------------------
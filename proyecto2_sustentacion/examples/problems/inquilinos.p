@@ -0,0 +1,10 @@
+%------------------------------------------------------------------------------
+% File     : inquilinos.p
+% Problem  : Alguien que no paga no vive en el edificio; la meta no se sigue
+% Status   : CounterSatisfiable
+%------------------------------------------------------------------------------
+fof(paga, axiom, ![X]: (vive(X) => paga(X) | moroso(X))).
+fof(ana, axiom, vive(ana)).
+fof(beto, axiom, ~paga(beto)).
+fof(meta, conjecture, paga(ana)).
+%------------------------------------------------------------------------------
@@ -0,0 +1,12 @@
+%------------------------------------------------------------------------------
+% File     : tuna.p
+% Domain   : Ejemplo del curso
+% Problem  : ¿La curiosidad mató a Tuna?
+% Status   : Theorem
+%------------------------------------------------------------------------------
+fof(curiosidad, axiom, ![X]: (curioso(X) => mata(curiosidad, X))).
+fof(muerte, axiom, ![X, Y]: (mata(Y, X) => muerto(X))).
+fof(tuna_gato, axiom, gato(tuna)).
+fof(gatos_curiosos, axiom, ![X]: (gato(X) => curioso(X))).
+fof(meta, conjecture, muerto(tuna)).
+%------------------------------------------------------------------------------
@@ -11,8 +11,16 @@ Demostraciones ejecutables del **Proyecto 2 - Sustentación**:
 from __future__ import annotations
 
 from motor.propositional_resolution import resolve_propositional, parse_clause_list, pretty_clause
-from motor.first_order_resolution import resolve_first_order, L, pretty_clause as pretty_clause_fol
+from motor.sat_solver import resolve_propositional_cdcl
+from motor.preprocessing import resolve_with_preprocessing
+from motor.cnf import clausify
+from motor.knowledge_base import KnowledgeBase
+from motor.horn import is_horn, prove_auto, HornProgram
+from motor.first_order_resolution import resolve_first_order, L, canonicalize_clause, pretty_clause as pretty_clause_fol
+from motor.trace import refutation_steps
 from motor.unification import Var, Const
+from motor.stats import ResolutionStats
+from motor.budget import Budget
 
 # -----------------------------------------------------------------------------
 # Impresión de pasos (trazas) para sustentación
@@ -23,8 +31,8 @@ def show_prop_steps(steps):
     for st in steps:
         print(f"[it={st.iteration}] C{st.left_id} ⟂ C{st.right_id}   usando {st.pivot_left} / {st.pivot_right}   ⇒   {pretty_clause(st.resolvent)}")
 
-def show_fol_steps(steps):
-    print("\n--- Traza (1er orden) ---")
+def show_fol_steps(steps, title="Traza (1er orden)"):
+    print(f"\n--- {title} ---")
     for st in steps:
         theta_str = ", ".join(f"{v.name}←{t}" for v, t in st.theta.items())
         print(f"[it={st.iteration}] C{st.left_id} ⟂ C{st.right_id}   con ({st.left_lit}) & ({st.right_lit})   θ={{ {theta_str} }}   ⇒   {pretty_clause_fol(st.resolvent)}")
@@ -43,6 +51,16 @@ def example_propositional():
     show_prop_steps(steps)
     print("\nResultado:", "□ derivada → contradicción (inconsistente)" if entails else "No contradicción")
 
+    # Misma consulta con el solucionador CDCL: la refutación se extrae de las cláusulas aprendidas
+    entails, derived, proof, steps = resolve_propositional_cdcl(clauses, keep_steps=True)
+    print("\n[CDCL] refutación extraída:")
+    show_prop_steps(steps)
+
+    # Con preprocesamiento: la propagación unitaria deriva □ sin llegar al motor
+    entails, derived, proof, steps, pre_stats = resolve_with_preprocessing(clauses, keep_steps=True)
+    print("\n[Preprocesamiento]", pre_stats)
+    show_prop_steps(steps)
+
 # -----------------------------------------------------------------------------
 # 2) Caso "¿La curiosidad mató a Tuna?" (FOL)
 # -----------------------------------------------------------------------------
@@ -67,9 +85,45 @@ def example_tuna():
 
     clauses = [C1, C2, C3, C4, C5]
 
-    entails, derived, proof, steps = resolve_first_order(clauses, keep_steps=True)
+    stats = ResolutionStats()
+    entails, derived, proof, steps = resolve_first_order(clauses, keep_steps=True, stats=stats)
     show_fol_steps(steps)
+    # Solo los pasos que llevan a □, re-derivados desde proof_map (ids de la KB de entrada)
+    ids = {canonicalize_clause(c): i for i, c in enumerate(clauses)}
+    show_fol_steps(refutation_steps(proof, ids), "Refutación mínima")
     print("\nResultado:", "□ derivada → 'Muerto(Tuna)' es verdadera" if entails else "No se pudo derivar '□'")
+    print("Estadísticas:", stats)
+
+    # La misma KB escrita como fórmulas: `clausify` produce la CNF y niega la meta
+    kb = clausify(["forall x. Curioso(x) -> Mata(Curiosidad, x)",
+                   "forall x y. Mata(y, x) -> Muerto(x)",
+                   "Gato(Tuna)",
+                   "forall x. Gato(x) -> Curioso(x)"], goal="Muerto(Tuna)")
+    print("\nCNF desde fórmulas:", "; ".join(pretty_clause_fol(c) for c in kb))
+    entails, *_ = resolve_first_order(kb, keep_steps=False)
+    print("Resultado:", "□ derivada" if entails else "No se pudo derivar '□'")
+
+    # Axiomas fijos, varias metas: la KB persistente reutiliza lo ya derivado
+    base = KnowledgeBase(kb[:-1])
+    base.warm_up()
+    for goal in ("Muerto(Tuna)", "Curioso(Tuna)", "Muerto(Curiosidad)"):
+        entails, _, _ = base.ask(goal)
+        print(f"  ask({goal}):", "verdadera" if entails else "no se deriva")
+
+    # Los axiomas de Tuna son de Horn: SLD con tabulación, respuestas como sustituciones
+    entails, engine = prove_auto(kb)
+    print(f"\nHorn: {is_horn(kb)}  motor: {engine}  resultado: {entails}")
+    y = Var("y")
+    for answer in HornProgram(kb[:-1]).solve([L("Mata", y, Tuna)]):
+        print("  Mata(y, Tuna) con", ", ".join(f"{v}←{t}" for v, t in answer.items()))
+
+    # Con símbolos de función la saturación no termina: un presupuesto la acota
+    infinite = clausify(["P(a)", "forall x. P(x) -> P(f(x))"], goal="Q(a)")
+    stats = ResolutionStats()
+    entails, *_ = resolve_first_order(infinite, keep_steps=False, stats=stats,
+                                      budget=Budget(time_limit=0.2, max_term_depth=20))
+    print(f"\nP(x) → P(f(x)) ⊢ Q(a)?  {entails!r}  (detenido por: {stats.stopped}, "
+          f"generadas={stats.generated}, retenidas={stats.kept})")
 
 if __name__ == "__main__":
     example_propositional()
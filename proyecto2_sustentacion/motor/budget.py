@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+motor/budget.py
+===============
+**Presupuestos de recursos** para los motores de saturación.
+
+Sin presupuesto, `resolve_first_order` y `resolve_propositional` iteran hasta
+derivar `□` o saturar; con símbolos de función (universo de Herbrand infinito)
+una KB que no implica la meta puede no terminar nunca. Un `Budget` acota:
+
+- `time_limit`: segundos de reloj;
+- `max_generated`: resolventes construidos;
+- `max_kept`: cláusulas retenidas a la vez;
+- `max_memory_mb`: memoria residente del proceso (si el sistema la expone);
+- `max_term_depth`: profundidad de término; los resolventes más profundos se
+  descartan, así que saturar ya no prueba nada.
+
+Al agotarse, el motor retorna `UNKNOWN` (ni True ni False) y deja el motivo en
+`ResolutionStats.stopped`. Tiempo y memoria se revisan cada `check_every`
+consultas para no pagar un reloj por resolvente; en esas revisiones se llama
+`progress(stats)` si se indicó.
+"""
+
+from __future__ import annotations
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from motor.stats import ResolutionStats
+
+
+class _Unknown:
+    """Resultado indeterminado: se agotó el presupuesto. Es falso en contexto booleano."""
+    _instance: Optional["_Unknown"] = None
+
+    def __new__(cls) -> "_Unknown":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "UNKNOWN"
+
+    def __reduce__(self):
+        return (_Unknown, ())
+
+UNKNOWN = _Unknown()
+
+
+def rss_bytes() -> Optional[int]:
+    """Memoria residente actual del proceso, o None si no se puede medir."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Pico de memoria residente del proceso desde que arrancó, o None si no se puede medir."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB en Linux, bytes en macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+@dataclass
+class Budget:
+    """Límites de una ejecución; None = sin límite."""
+    time_limit: Optional[float] = None
+    max_generated: Optional[int] = None
+    max_kept: Optional[int] = None
+    max_memory_mb: Optional[float] = None
+    max_term_depth: Optional[int] = None
+    check_every: int = 64
+    progress: Optional[Callable[[ResolutionStats], None]] = None
+
+    def start(self, stats: ResolutionStats) -> "Meter":
+        return Meter(self, stats)
+
+
+class Meter:
+    """Consumo de un `Budget` durante una ejecución (los límites cuentan desde `start`)."""
+
+    def __init__(self, budget: Budget, stats: ResolutionStats) -> None:
+        self.budget = budget
+        self.stats = stats
+        self.t0 = time.perf_counter()
+        self.deadline = None if budget.time_limit is None else self.t0 + budget.time_limit
+        self.generated0 = stats.generated
+        self._countdown = budget.check_every
+
+    def exceeded(self, kept: int) -> Optional[str]:
+        """Motivo si algún límite se agotó (y lo anota en `stats.stopped`), si no None."""
+        b, stats = self.budget, self.stats
+        reason = None
+        if b.max_generated is not None and stats.generated - self.generated0 >= b.max_generated:
+            reason = "generadas"
+        elif b.max_kept is not None and kept > b.max_kept:
+            reason = "retenidas"
+        else:
+            self._countdown -= 1
+            if self._countdown > 0:
+                return None
+            self._countdown = b.check_every
+            if b.progress is not None:
+                b.progress(stats)
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                reason = "tiempo"
+            elif b.max_memory_mb is not None:
+                rss = rss_bytes()
+                if rss is not None and rss > b.max_memory_mb * 2 ** 20:
+                    reason = "memoria"
+        if reason is not None:
+            stats.stopped = reason
+        return reason
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+motor/cnf.py
+============
+Conversión de fórmulas (`motor/formula.py`) a **CNF** lista para los motores.
+
+Proposicional: **codificación definicional** (Tseitin con polaridad, a la
+Plaisted-Greenbaum). Cada subfórmula compuesta que no está en la capa superior
+recibe una variable nueva `_T<n>` y solo las cláusulas de la dirección que su
+polaridad necesita. El tamaño es **lineal** en la fórmula (la distribución
+ingenua de ∨ sobre ∧ es exponencial) y el resultado es equisatisfacible, que es
+lo que necesita la refutación.
+
+Primer orden:
+1) Forma normal negativa (se expanden → y ↔).
+2) **Miniscoping**: los cuantificadores se empujan hacia adentro
+   (`∀x(A ∧ B)` ⇒ `∀xA ∧ ∀xB`, `∀x(A ∨ B)` ⇒ `∀xA ∨ B` si x no ocurre en B...),
+   lo que reduce la aridad de las funciones de Skolem.
+3) Renombrado aparte de variables ligadas y **Skolemización**: cada `∃x` se
+   reemplaza por `sk<n>(ys)` con las universales `ys` en alcance que aparecen en
+   su cuerpo; luego se eliminan los `∀`.
+4) Distribución a cláusulas; cuando el producto de una disyunción supera
+   `def_limit` cláusulas, la subfórmula se nombra con un predicado nuevo
+   `_D<n>(variables libres)` para mantener el tamaño lineal.
+
+`CNFConverter` conserva los contadores entre llamadas, así los símbolos nuevos no
+chocan entre axiomas y meta.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, Tuple, Union, Iterable
+
+from motor.unification import Var, Const, Func, Term
+from motor.formula import (Formula, Atom, Not, And, Or, Implies, Iff, Forall, Exists,
+                           conj, disj, free_vars, is_first_order, parse_formula)
+from motor.first_order_resolution import Pred, Literal, Clause as FolClause, is_tautology
+from motor.propositional_resolution import Clause as PropClause, neg
+
+AnyClause = Union[PropClause, FolClause]
+
+
+def _rename_term(t: Term, env: Dict[Var, Term]) -> Term:
+    """Sustitución simultánea (sin encadenar enlaces, a diferencia de `apply_subst_term`)."""
+    if isinstance(t, Var):
+        return env.get(t, t)
+    if t.ground:
+        return t
+    return Func(t.name, tuple(_rename_term(a, env) for a in t.args))
+
+
+class CNFConverter:
+    """Convierte fórmulas a listas de cláusulas (proposicionales o de primer orden)."""
+
+    def __init__(self, def_limit: int = 8) -> None:
+        self.def_limit = def_limit
+        self._tseitin = 0
+        self._skolem = 0
+        self._defs = 0
+
+    def convert(self, f: Union[Formula, str]) -> List[AnyClause]:
+        """Elige el modo según la fórmula (cuantificadores o argumentos ⇒ primer orden)."""
+        if isinstance(f, str):
+            f = parse_formula(f)
+        return self.first_order(f) if is_first_order(f) else self.propositional(f)
+
+    # -------------------------------------------------------------------------
+    # Proposicional: Tseitin con polaridad
+    # -------------------------------------------------------------------------
+
+    def propositional(self, f: Formula) -> List[PropClause]:
+        out: List[List[str]] = []
+        defined: Dict[int, Tuple[Formula, str, Set[bool]]] = {}
+
+        def lit(g: Formula, pos: bool) -> str:
+            if isinstance(g, Atom):
+                if g.args:
+                    raise ValueError(f"átomo de primer orden en modo proposicional: {g}")
+                return g.name if pos else neg(g.name)
+            if isinstance(g, Not):
+                return lit(g.arg, not pos)
+            if isinstance(g, (Forall, Exists)):
+                raise ValueError(f"cuantificador en modo proposicional: {g}")
+            entry = defined.get(id(g))
+            if entry is None:
+                self._tseitin += 1
+                entry = defined[id(g)] = (g, f"_T{self._tseitin}", set())
+            _, x, done = entry
+            if pos not in done:
+                done.add(pos)
+                define(g, x, pos)
+            return x if pos else neg(x)
+
+        def define(g: Formula, x: str, pos: bool) -> None:
+            # pos: cláusulas de x → g ; neg: cláusulas de g → x
+            if isinstance(g, And):
+                if pos:
+                    out.extend([neg(x), lit(a, True)] for a in g.args)
+                else:
+                    out.append([x] + [lit(a, False) for a in g.args])
+            elif isinstance(g, Or):
+                if pos:
+                    out.append([neg(x)] + [lit(a, True) for a in g.args])
+                else:
+                    out.extend([x, lit(a, False)] for a in g.args)
+            elif isinstance(g, Implies):
+                if pos:
+                    out.append([neg(x), lit(g.left, False), lit(g.right, True)])
+                else:
+                    out.append([x, lit(g.left, True)])
+                    out.append([x, lit(g.right, False)])
+            else:  # Iff
+                if pos:
+                    out.append([neg(x), lit(g.left, False), lit(g.right, True)])
+                    out.append([neg(x), lit(g.left, True), lit(g.right, False)])
+                else:
+                    out.append([x, lit(g.left, True), lit(g.right, True)])
+                    out.append([x, lit(g.left, False), lit(g.right, False)])
+
+        def disjuncts(g: Formula, pos: bool) -> List[str]:
+            if isinstance(g, Not):
+                return disjuncts(g.arg, not pos)
+            if (isinstance(g, Or) and pos) or (isinstance(g, And) and not pos):
+                return [l for a in g.args for l in disjuncts(a, pos)]
+            if isinstance(g, Implies) and pos:
+                return disjuncts(g.left, False) + disjuncts(g.right, True)
+            return [lit(g, pos)]
+
+        def top(g: Formula, pos: bool) -> None:
+            # Capa superior: conjunciones se separan, disyunciones son cláusulas directas
+            if isinstance(g, Not):
+                top(g.arg, not pos)
+            elif (isinstance(g, And) and pos) or (isinstance(g, Or) and not pos):
+                for a in g.args:
+                    top(a, pos)
+            elif isinstance(g, Implies) and not pos:
+                top(g.left, True)
+                top(g.right, False)
+            else:
+                out.append(disjuncts(g, pos))
+
+        top(f, True)
+        clauses: List[PropClause] = []
+        seen: Set[PropClause] = set()
+        for c in out:
+            fc = frozenset(c)
+            if fc not in seen and not any(neg(l) in fc for l in fc):
+                seen.add(fc)
+                clauses.append(fc)
+        return clauses
+
+    # -------------------------------------------------------------------------
+    # Primer orden
+    # -------------------------------------------------------------------------
+
+    def first_order(self, f: Formula) -> List[FolClause]:
+        matrix = self._skolemize(_miniscope(_nnf(f, True)))
+        out: List[List[Literal]] = []
+        out.extend(self._clauses(matrix, out))
+        clauses: List[FolClause] = []
+        seen: Set[FolClause] = set()
+        for c in out:
+            fc = frozenset(c)
+            if fc not in seen and not is_tautology(fc):
+                seen.add(fc)
+                clauses.append(fc)
+        return clauses
+
+    def _skolemize(self, f: Formula) -> Formula:
+        """Renombra aparte las variables ligadas, Skolemiza y elimina los `∀`."""
+        used: Set[str] = {v.name for v in _bound_vars(f)}
+        taken: Set[str] = {v.name for v in free_vars(f)}
+
+        def fresh(v: Var) -> Var:
+            # La primera ligadura conserva el nombre; las siguientes reciben sufijo
+            name, k = v.name, 0
+            while name in taken or (k and name in used):
+                k += 1
+                name = f"{v.name}_{k}"
+            taken.add(name)
+            return Var(name)
+
+        def walk(g: Formula, env: Dict[Var, Term], universals: List[Var]) -> Formula:
+            if isinstance(g, Atom):
+                return Atom(g.name, tuple(_rename_term(a, env) for a in g.args)) if env else g
+            if isinstance(g, Not):
+                return Not(walk(g.arg, env, universals))
+            if isinstance(g, And):
+                return conj(*(walk(a, env, universals) for a in g.args))
+            if isinstance(g, Or):
+                return disj(*(walk(a, env, universals) for a in g.args))
+            if isinstance(g, Forall):
+                v = fresh(g.var)
+                return walk(g.body, {**env, g.var: v}, universals + [v])
+            # Exists: función de Skolem sobre las universales que aparecen en el cuerpo
+            body_vars: Set[Var] = set()
+            for w in free_vars(g.body) - {g.var}:
+                t = env.get(w, w)
+                body_vars |= t.variables
+            args = tuple(u for u in universals if u in body_vars)
+            self._skolem += 1
+            name = f"sk{self._skolem}"
+            sk: Term = Func(name, args) if args else Const(name)
+            return walk(g.body, {**env, g.var: sk}, universals)
+
+        return walk(f, {}, [])
+
+    def _clauses(self, g: Formula, defs: List[List[Literal]]) -> List[List[Literal]]:
+        """Matriz en NNF sin cuantificadores -> cláusulas; las definiciones van a `defs`."""
+        if isinstance(g, Atom):
+            return [[Literal(Pred(g.name, g.args))]]
+        if isinstance(g, Not):
+            a = g.arg
+            return [[Literal(Pred(a.name, a.args), True)]]
+        if isinstance(g, And):
+            return [c for a in g.args for c in self._clauses(a, defs)]
+        acc: List[List[Literal]] = [[]]
+        for a in g.args:
+            cc = self._clauses(a, defs)
+            if len(cc) > 1 and len(acc) * len(cc) > self.def_limit:
+                # Nombrar la subfórmula: D(vs) → a  (solo hace falta esta dirección en NNF)
+                self._defs += 1
+                vs = tuple(sorted(free_vars(a), key=lambda v: v.name))
+                d = Pred(f"_D{self._defs}", vs)
+                defs.extend([Literal(d, True)] + c for c in cc)
+                cc = [[Literal(d)]]
+            acc = [x + y for x in acc for y in cc]
+        return acc
+
+
+# -----------------------------------------------------------------------------
+# Transformaciones de primer orden
+# -----------------------------------------------------------------------------
+
+def _nnf(f: Formula, pos: bool) -> Formula:
+    """Forma normal negativa; `pos=False` niega la fórmula."""
+    if isinstance(f, Atom):
+        return f if pos else Not(f)
+    if isinstance(f, Not):
+        return _nnf(f.arg, not pos)
+    if isinstance(f, (And, Or)):
+        args = [_nnf(a, pos) for a in f.args]
+        return conj(*args) if isinstance(f, And) == pos else disj(*args)
+    if isinstance(f, Implies):
+        return _nnf(Or((Not(f.left), f.right)), pos)
+    if isinstance(f, Iff):
+        if pos:
+            return conj(disj(_nnf(f.left, False), _nnf(f.right, True)),
+                        disj(_nnf(f.left, True), _nnf(f.right, False)))
+        return conj(disj(_nnf(f.left, True), _nnf(f.right, True)),
+                    disj(_nnf(f.left, False), _nnf(f.right, False)))
+    body = _nnf(f.body, pos)
+    universal = isinstance(f, Forall) == pos
+    return Forall(f.var, body) if universal else Exists(f.var, body)
+
+
+def _miniscope(f: Formula) -> Formula:
+    """Empuja los cuantificadores hacia adentro (fórmula en NNF)."""
+    if isinstance(f, (Atom, Not)):
+        return f
+    if isinstance(f, And):
+        return conj(*map(_miniscope, f.args))
+    if isinstance(f, Or):
+        return disj(*map(_miniscope, f.args))
+    return _push(type(f), f.var, _miniscope(f.body))
+
+
+def _push(q: type, x: Var, body: Formula) -> Formula:
+    """`q x. body` con `body` ya en miniscope."""
+    if x not in free_vars(body):
+        return body
+    # ∀ distribuye sobre ∧ y ∃ sobre ∨
+    spread, other = (And, Or) if q is Forall else (Or, And)
+    if isinstance(body, spread):
+        parts = [_push(q, x, a) for a in body.args]
+        return conj(*parts) if spread is And else disj(*parts)
+    if isinstance(body, other):
+        with_x = [a for a in body.args if x in free_vars(a)]
+        rest = [a for a in body.args if x not in free_vars(a)]
+        if rest:
+            inner = _push(q, x, with_x[0] if len(with_x) == 1 else other(tuple(with_x)))
+            parts = [inner] + rest
+            return conj(*parts) if other is And else disj(*parts)
+    return q(x, body)
+
+
+def _bound_vars(f: Formula) -> Set[Var]:
+    if isinstance(f, (Forall, Exists)):
+        return {f.var} | _bound_vars(f.body)
+    if isinstance(f, Not):
+        return _bound_vars(f.arg)
+    if isinstance(f, (And, Or)):
+        vs: Set[Var] = set()
+        for a in f.args: vs |= _bound_vars(a)
+        return vs
+    if isinstance(f, (Implies, Iff)):
+        return _bound_vars(f.left) | _bound_vars(f.right)
+    return set()
+
+
+# -----------------------------------------------------------------------------
+# Atajos
+# -----------------------------------------------------------------------------
+
+def to_cnf(f: Union[Formula, str], converter: Optional[CNFConverter] = None) -> List[AnyClause]:
+    """Una fórmula (o texto) -> lista de cláusulas."""
+    return (converter or CNFConverter()).convert(f)
+
+
+def clausify(axioms: Iterable[Union[Formula, str]], goal: Union[Formula, str, None] = None,
+             converter: Optional[CNFConverter] = None) -> List[AnyClause]:
+    """
+    Axiomas (y opcionalmente la meta, que se **niega**) -> KB en CNF para
+    `resolve_propositional` / `resolve_first_order`.
+
+    El modo se elige una vez para toda la KB: si algún axioma o la meta es de
+    primer orden, todo se convierte a primer orden (los átomos sin argumentos
+    quedan como `Literal` de aridad 0); si no, todo es proposicional. Así una
+    KB mixta nunca combina cláusulas de texto con cláusulas de `Literal`.
+    """
+    conv = converter or CNFConverter()
+    formulas = [parse_formula(a) if isinstance(a, str) else a for a in axioms]
+    if goal is not None:
+        formulas.append(Not(parse_formula(goal) if isinstance(goal, str) else goal))
+    mode = conv.first_order if any(is_first_order(f) for f in formulas) else conv.propositional
+    clauses: List[AnyClause] = []
+    for f in formulas:
+        clauses.extend(mode(f))
+    return clauses
@@ -12,37 +12,66 @@ Este módulo implementa exactamente el paso a paso indicado por la asignación:
 3) Mientras haya cláusulas por resolver:
    - Estandarizar-aparte el par (renombrar variables con sufijos únicos).
    - Seleccionar literales complementarios (mismo predicado, signos opuestos).
-   - Intentar **unificar** sus argumentos (Robinson + occurs-check).
+   - Intentar **unificar** sus argumentos (union-find + occurs-check, MGU equivalente a Robinson).
    - Construir el **resolvente** aplicando la MGU θ al resto de literales.
    - Añadir el resolvente si **no** es tautológico ni duplicado.
 4) Si se deriva la **cláusula vacía `□`**, detener y reportar que la sentencia original es **verdadera**.
 5) Si ya no se generan nuevas cláusulas, **detener y reportar falsa**.
-6) El sistema evita **validar varias veces** reglas/pares ya usados con un conjunto `processed_pairs`.
+6) El sistema evita **validar varias veces** reglas/pares ya usados: cada cláusula se
+   procesa una sola vez (bucle de *cláusula dada*) contra las ya activas, y un índice
+   de literales (`motor/indexing.py`) entrega solo los compañeros complementarios.
 """
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Dict, Set, Iterable
-from motor.unification import Var, Const, Func, Term, Subst, unify, apply_subst_term
+from itertools import permutations, product
+from typing import Callable, List, Tuple, Optional, Dict, Set, Iterable, Iterator, FrozenSet, Sequence, Union
+import time
+from motor.unification import Var, Func, Term, Subst, Unifier, OffsetUnifier, apply_subst_term, term_depth
+from motor.term_index import TermLiteralIndex
+from motor.term_bank import TermBank
+from motor.subsumption import SubsumptionIndex
+from motor.stats import ResolutionStats
+from motor.ordering import TermOrdering, Selection, SELECTIONS
+from motor.budget import Budget, Meter, UNKNOWN
 
 # -----------------------------------------------------------------------------
 # Predicados, literales y cláusulas (FOL)
 # -----------------------------------------------------------------------------
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Pred:
-    """Símbolo de predicado con sus argumentos (términos)."""
+    """Símbolo de predicado con sus argumentos (términos); hash y `ground` cacheados."""
     name: str
     args: Tuple[Term, ...]
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.name, self.args)))
+        object.__setattr__(self, "ground", all(a.ground for a in self.args))
+    def __hash__(self) -> int: return self._hash
+    def __eq__(self, other: object) -> bool:
+        if self is other: return True
+        if other.__class__ is not Pred: return NotImplemented
+        return self._hash == other._hash and self.name == other.name and self.args == other.args
+    def __reduce__(self):
+        return (Pred, (self.name, self.args))
     def __str__(self) -> str:
         if not self.args: return self.name
         return f'{self.name}({", ".join(map(str, self.args))})'
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Literal:
-    """Literal = predicado con posible negación."""
+    """Literal = predicado con posible negación; hash cacheado como en `Pred`."""
     pred: Pred
     neg: bool = False
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.pred, self.neg)))
+    def __hash__(self) -> int: return self._hash
+    def __eq__(self, other: object) -> bool:
+        if self is other: return True
+        if other.__class__ is not Literal: return NotImplemented
+        return self._hash == other._hash and self.neg == other.neg and self.pred == other.pred
+    def __reduce__(self):
+        return (Literal, (self.pred, self.neg))
     def __str__(self) -> str:
         s = str(self.pred)
         return f'¬{s}' if self.neg else s
@@ -56,9 +85,11 @@ Clause = frozenset[Literal]
 # -----------------------------------------------------------------------------
 
 def apply_subst_pred(p: Pred, s: Subst) -> Pred:
+    if p.ground: return p
     return Pred(p.name, tuple(apply_subst_term(a, s) for a in p.args))
 
 def apply_subst_lit(l: Literal, s: Subst) -> Literal:
+    if l.pred.ground: return l
     return Literal(apply_subst_pred(l.pred, s), l.neg)
 
 def apply_subst_clause(c: Clause, s: Subst) -> Clause:
@@ -69,17 +100,11 @@ def apply_subst_clause(c: Clause, s: Subst) -> Clause:
 # -----------------------------------------------------------------------------
 
 def vars_in_term(t: Term) -> Set[Var]:
-    if isinstance(t, Var): return {t}
-    if isinstance(t, Const): return set()
-    vs: Set[Var] = set()
-    if isinstance(t, Func):
-        for a in t.args:
-            vs |= vars_in_term(a)
-    return vs
+    return set(t.variables)
 
 def vars_in_pred(p: Pred) -> Set[Var]:
     vs: Set[Var] = set()
-    for a in p.args: vs |= vars_in_term(a)
+    for a in p.args: vs |= a.variables
     return vs
 
 def vars_in_clause(c: Clause) -> Set[Var]:
@@ -87,32 +112,29 @@ def vars_in_clause(c: Clause) -> Set[Var]:
     for l in c: vs |= vars_in_pred(l.pred)
     return vs
 
-def rename_vars_clause(c: Clause, ren: Dict[Var, Var]) -> Clause:
+def rename_vars_lit(l: Literal, ren: Dict[Var, Var]) -> Literal:
+    if l.pred.ground: return l
     def ren_term(t: Term) -> Term:
         if isinstance(t, Var): return ren.get(t, t)
-        if isinstance(t, Const): return t
+        if t.ground: return t
         return Func(t.name, tuple(ren_term(a) for a in t.args))
-    def ren_pred(p: Pred) -> Pred:
-        return Pred(p.name, tuple(ren_term(a) for a in p.args))
-    def ren_lit(l: Literal) -> Literal:
-        return Literal(ren_pred(l.pred), l.neg)
-    return frozenset(ren_lit(l) for l in c)
+    return Literal(Pred(l.pred.name, tuple(ren_term(a) for a in l.pred.args)), l.neg)
+
+def rename_vars_clause(c: Clause, ren: Dict[Var, Var]) -> Clause:
+    return frozenset(rename_vars_lit(l, ren) for l in c)
+
+def renaming_apart(c: Clause, suffix: str) -> Dict[Var, Var]:
+    """Renombrado que añade un sufijo único a cada variable de la cláusula."""
+    return {v: Var(f'{v.name}_{suffix}') for v in vars_in_clause(c)}
 
 def standardize_apart(c: Clause, suffix: str) -> Clause:
     """Renombra variables con un sufijo único para evitar colisiones entre cláusulas."""
-    ren: Dict[Var, Var] = {}
-    for v in vars_in_clause(c):
-        ren[v] = Var(f'{v.name}_{suffix}')
-    return rename_vars_clause(c, ren)
+    return rename_vars_clause(c, renaming_apart(c, suffix))
 
 # -----------------------------------------------------------------------------
-# Otras utilidades: complementarios, tautologías, forma canónica, pretty print
+# Otras utilidades: tautologías, forma canónica, pretty print
 # -----------------------------------------------------------------------------
 
-def literal_complementary(a: Literal, b: Literal) -> bool:
-    """Retorna True si a y b son el mismo predicado (misma aridad) y signos opuestos."""
-    return (a.pred.name == b.pred.name) and (a.neg != b.neg) and (len(a.pred.args) == len(b.pred.args))
-
 def is_tautology(c: Clause) -> bool:
     """
     Una cláusula es tautológica si contiene un literal y su negación con los mismos argumentos.
@@ -126,23 +148,138 @@ def is_tautology(c: Clause) -> bool:
         seen[key] = l.neg
     return False
 
+_CANON_VARS: List[Var] = []
+
+def _canon_var(k: int) -> Var:
+    while len(_CANON_VARS) <= k:
+        _CANON_VARS.append(Var(f'v{len(_CANON_VARS) + 1}'))
+    return _CANON_VARS[k]
+
+class _PooledNames(dict):
+    """Renombrado perezoso de (variable, desplazamiento) a `v1, v2, ...`, compartido entre desplazamientos."""
+    __slots__ = ("_next",)
+    def __init__(self, counter: List[int]) -> None:
+        super().__init__()
+        self._next = counter
+    def __missing__(self, v: Var) -> Var:
+        w = self[v] = _canon_var(self._next[0])
+        self._next[0] += 1
+        return w
+
+def _pooled_names() -> Tuple[Dict[Var, Var], Dict[Var, Var]]:
+    counter = [0]
+    return _PooledNames(counter), _PooledNames(counter)
+
+def _shape(t: Term) -> str:
+    """Texto del término con cada variable como `?` (independiente de los nombres)."""
+    if t.__class__ is Var: return "?"
+    if t.ground: return str(t)
+    return f'{t.name}({",".join(_shape(a) for a in t.args)})'
+
+def _literal_shape(l: Literal) -> str:
+    """Forma del literal sin nombres de variables; se cachea en el literal (internado por `TermBank`)."""
+    s = l.__dict__.get("_shape")
+    if s is None:
+        p = l.pred
+        body = str(p) if p.ground else f'{p.name}({",".join(_shape(a) for a in p.args)})'
+        s = f'~{body}' if l.neg else body
+        object.__setattr__(l, "_shape", s)
+    return s
+
+def _first_occurrence(lits: Iterable[Literal]) -> Dict[Var, int]:
+    """Número de cada variable según su primera aparición (de izquierda a derecha) en `lits`."""
+    order: Dict[Var, int] = {}
+    for l in lits:
+        if l.pred.ground:
+            continue
+        stack = list(reversed(l.pred.args))
+        while stack:
+            t = stack.pop()
+            if t.__class__ is Var:
+                if t not in order:
+                    order[t] = len(order)
+            elif t.__class__ is Func and not t.ground:
+                stack.extend(reversed(t.args))
+    return order
+
+def _render(lits: Sequence[Literal], num: Dict[Var, int]) -> Tuple[str, ...]:
+    def r(t: Term) -> str:
+        if t.__class__ is Var: return f'#{num[t]}'
+        if t.ground: return str(t)
+        return f'{t.name}({",".join(r(a) for a in t.args)})'
+    return tuple(('~' if l.neg else '') + (str(l.pred) if l.pred.ground else
+                 f'{l.pred.name}({",".join(r(a) for a in l.pred.args)})') for l in lits)
+
+_MAX_TIE_ORDERS = 720
+
+def _canonical_order(c: Clause) -> List[Literal]:
+    """
+    Literales en un orden que no depende de los nombres de variables ni del
+    orden de iteración del frozenset: primero por su forma (`_literal_shape`);
+    los empates se resuelven eligiendo, entre las permutaciones de cada grupo
+    empatado, la que da el renombrado lexicográficamente menor. Si hay más de
+    `_MAX_TIE_ORDERS` combinaciones, se elige de forma voraz literal a literal
+    (en ese caso extremo dos variantes podrían no coincidir; solo se pierde
+    una detección de duplicado).
+    """
+    groups: Dict[str, List[Literal]] = {}
+    for l in c:
+        groups.setdefault(_literal_shape(l), []).append(l)
+    keys = sorted(groups)
+    if all(len(groups[k]) == 1 for k in keys):
+        return [groups[k][0] for k in keys]
+    total = 1
+    for k in keys:
+        for n in range(2, len(groups[k]) + 1):
+            total *= n
+    if total <= _MAX_TIE_ORDERS:
+        best, best_key = None, None
+        for combo in product(*(permutations(sorted(groups[k], key=str)) for k in keys)):
+            lits = [l for group in combo for l in group]
+            key = _render(lits, _first_occurrence(lits))
+            if best_key is None or key < best_key:
+                best, best_key = lits, key
+        return best
+    # Voraz: en cada grupo, el literal que menos "crece" con el renombrado parcial
+    lits: List[Literal] = []
+    for k in keys:
+        pending = list(groups[k])
+        while pending:
+            def cost(l: Literal):
+                trial = lits + [l]
+                return _render(trial, _first_occurrence(trial))[-1], str(l)
+            l = min(pending, key=cost)
+            pending.remove(l)
+            lits.append(l)
+    return lits
+
 def canonicalize_clause(c: Clause) -> Clause:
     """
     Renombra variables a v1,v2,... para comparar cláusulas alfa-equivalentes.
     Esto permite evitar reinsertar resolventes duplicados que difieren solo en nombres.
+
+    La numeración sigue `_canonical_order`, que no depende del orden en que el
+    frozenset itera ni de los nombres originales: dos variantes producen la
+    misma cláusula (y el mismo hash, que frozenset cachea). El resultado se
+    inserta en ese orden, así que también itera igual aunque la entrada venga
+    de otro proceso (pickle); los literales ya canónicos se reutilizan.
     """
-    mapping: Dict[Var, Var] = {}
-    def note(v: Var) -> Var:
-        if v not in mapping:
-            mapping[v] = Var(f'v{len(mapping)+1}')
-        return mapping[v]
+    order = _canonical_order(c)
+    num = _first_occurrence(order)
+    if all(v.name == f'v{k + 1}' for v, k in num.items()):
+        return frozenset(order)
+    mapping = {v: _canon_var(k) for v, k in num.items()}
     def canon_term(t: Term) -> Term:
-        if isinstance(t, Var): return note(t)
-        if isinstance(t, Const): return t
+        if t.__class__ is Var: return mapping[t]
+        if t.ground: return t
         return Func(t.name, tuple(canon_term(a) for a in t.args))
-    def canon_pred(p: Pred) -> Pred:
-        return Pred(p.name, tuple(canon_term(a) for a in p.args))
-    return frozenset(Literal(canon_pred(l.pred), l.neg) for l in c)
+    return frozenset(l if l.pred.ground else
+                     Literal(Pred(l.pred.name, tuple(canon_term(a) for a in l.pred.args)), l.neg)
+                     for l in order)
+
+def clause_depth(c: Clause) -> int:
+    """Profundidad máxima de término entre los argumentos de la cláusula."""
+    return max((term_depth(a) for l in c for a in l.pred.args), default=0)
 
 def pretty_clause(c: Clause) -> str:
     return " ∨ ".join(sorted(map(str, c))) if c else "□"
@@ -166,91 +303,543 @@ class FolStep:
 # Resolución FOL (núcleo)
 # -----------------------------------------------------------------------------
 
-def resolve_first_order(clauses_init: Iterable[Clause], keep_steps: bool = True):
+def factors(c: Clause) -> Iterator[Tuple[Literal, Literal, Subst, Clause]]:
     """
-    Ejecuta la resolución FOL sobre una KB en CNF con los criterios de la práctica.
-    Retorna: (entails_empty, derived_set, proof_map, steps)
+    Factores binarios de `c`: por cada par de literales del mismo signo y
+    predicado cuyos argumentos unifican, la cláusula `c`θ (que colapsa ambos).
+    """
+    lits = list(c)
+    for a in range(len(lits)):
+        for b in range(a + 1, len(lits)):
+            la, lb = lits[a], lits[b]
+            if la.neg != lb.neg or la.pred.name != lb.pred.name or len(la.pred.args) != len(lb.pred.args):
+                continue
+            u = Unifier()
+            if all(u.unify(x, y) for x, y in zip(la.pred.args, lb.pred.args)):
+                theta = u.subst()
+                yield la, lb, theta, apply_subst_clause(c, theta)
+
+INFERENCES = ("binary", "hyper", "ur")
+
+def _is_positive(c: Clause) -> bool:
+    return not any(l.neg for l in c)
+
+def _is_unit(c: Clause) -> bool:
+    return len(c) == 1
+
+class FolProver:
+    """
+    Estado del bucle de *cláusula dada*: cláusulas retenidas, `seen`, índices,
+    banco de términos y traza. `resolve_first_order` crea uno por llamada;
+    `motor/knowledge_base.py` lo conserva entre consultas y usa `mark` /
+    `rollback` para deshacer lo derivado de cada meta.
 
-    - `entails_empty` es True si se derivó `□` (la sentencia original es verdadera).
-    - `derived_set` contiene todas las cláusulas visitadas/derivadas (canónicas).
-    - `proof_map` enlaza resolventes con sus padres (opcional para reconstrucción).
-    - `steps` trae la traza completa si `keep_steps=True`.
+    Con `ordering` (LPO/KBO) y/o `selection` la resolución es **ordenada**: cada
+    pivote debe ser elegible en su cláusula (ver `motor/ordering.py`).
+
+    `inference` elige la regla de inferencia: 'binary' (resolución binaria),
+    'hyper' (hiper-resolución positiva) o 'ur' (resolución *unit-resulting*).
+
+    Cada paso se guarda en `steps` si `keep_steps` y se entrega a `sink` (una
+    función que recibe el `FolStep`, p. ej. `JsonlSink` de `motor/trace.py`).
     """
-    clauses: List[Clause] = []
-    seen: Set[Clause] = set()  # almacenamiento de cláusulas en forma canónica
-    proof: Dict[Clause, Tuple[Clause, Clause]] = {}
-    steps: List[FolStep] = []
-
-    def add_clause(c: Clause, parents: Optional[Tuple[Clause, Clause]] = None) -> bool:
-        canon = canonicalize_clause(c)
-        if canon in seen:
+
+    def __init__(self, keep_steps: bool = True, subsumption: bool = True,
+                 stats: Optional[ResolutionStats] = None, ordering: Optional[TermOrdering] = None,
+                 selection: Union[Selection, str, None] = None, inference: str = "binary",
+                 sink: Optional[Callable[[FolStep], None]] = None) -> None:
+        if inference not in INFERENCES:
+            raise ValueError(f"Regla de inferencia desconocida: {inference!r}")
+        self.inference = inference
+        self.keep_steps = keep_steps
+        self.sink = sink
+        self._tracing = keep_steps or sink is not None
+        self.subsumption = subsumption
+        self.ordering = ordering
+        self.selection = SELECTIONS[selection] if isinstance(selection, str) else selection
+        self._eligible: Dict[int, Tuple[FrozenSet[Literal], bool]] = {}
+        self.stats = stats if stats is not None else ResolutionStats()
+        self.clauses: List[Optional[Clause]] = []  # None = retirada por subsunción
+        self.seen: Set[Clause] = set()  # almacenamiento de cláusulas en forma canónica
+        self.proof: Dict[Clause, Tuple[Clause, Clause]] = {}
+        self._intermediate: List[Clause] = []  # claves de `proof` de pasos internos (hiper/UR)
+        self.steps: List[FolStep] = []
+        self.index = TermLiteralIndex()
+        self.subs = SubsumptionIndex(self.index)
+        self.bank = TermBank()
+        self.deleted: Set[int] = set()  # ids retirados por subsunción hacia atrás
+        self.retired: List[Tuple[int, Clause]] = []  # (id, cláusula) en orden de retiro
+        self.given = 0       # siguiente cláusula por procesar (las anteriores están activas)
+        self.round_end = 0   # fin de la "ronda" actual, para numerar iteraciones
+        self.iteration = 0
+        self.refuted = False
+        self.pruned = 0      # resolventes descartados por profundidad (saturar ya no decide)
+        self._fresh = 0
+        self._meter: Optional[Meter] = None
+        self._max_depth: Optional[int] = None
+
+    def add_clause(self, c: Clause, parents: Optional[Tuple[Clause, Clause]] = None) -> bool:
+        if parents and self._max_depth is not None and clause_depth(c) > self._max_depth:
+            self.pruned += 1
+            self.stats.depth_pruned += 1
             return False
-        seen.add(canon)
-        clauses.append(canon)
+        canon = self.bank.clause(canonicalize_clause(c))
+        if canon in self.seen:
+            return False
+        if self.subsumption and canon:
+            t0 = time.perf_counter()
+            if self.subs.forward(canon) is not None:
+                self.stats.forward_subsumed += 1
+                self.stats.add_time("subsunción", time.perf_counter() - t0)
+                return False
+            for old in self.subs.backward(canon):
+                self.subs.remove(old)
+                self.seen.discard(self.clauses[old])
+                self.retired.append((old, self.clauses[old]))
+                self.clauses[old] = None  # se suelta para que el banco pueda liberarla
+                self.deleted.add(old)
+                self.stats.backward_subsumed += 1
+            self.stats.add_time("subsunción", time.perf_counter() - t0)
+        self.stats.kept += 1
+        self.seen.add(canon)
+        self.subs.add(len(self.clauses), canon)
+        self.clauses.append(canon)
         if parents:
-            proof[canon] = parents
+            self.proof[canon] = parents
+        if not canon:
+            self.refuted = True
         return True
 
-    # Carga inicial
-    for c in clauses_init:
-        add_clause(c)
+    def _emit(self, step: FolStep) -> None:
+        if self.keep_steps:
+            self.steps.append(step)
+        if self.sink is not None:
+            self.sink(step)
+
+    def clause_ids(self) -> Dict[Clause, int]:
+        """Id de cada cláusula añadida, incluidas las retiradas por subsunción."""
+        ids = {c: cid for cid, c in self.retired}
+        ids.update((c, cid) for cid, c in enumerate(self.clauses) if c is not None)
+        return ids
+
+    def retained(self) -> Set[Clause]:
+        return {c for c in self.clauses if c is not None}
+
+    def eligible(self, cid: int, c: Clause) -> Tuple[FrozenSet[Literal], bool]:
+        """
+        Literales que pueden ser pivote en la cláusula `c` (id `cid`) según el
+        criterio a priori, y si provienen de la selección. Sin orden ni selección: todos.
+        """
+        hit = self._eligible.get(cid)
+        if hit is None:
+            sel = self.selection(c) if self.selection is not None else frozenset()
+            if sel:
+                hit = (sel, True)
+            elif self.ordering is not None:
+                hit = (frozenset(l for l in c if self.ordering.is_maximal(l, c)), False)
+            else:
+                hit = (c, False)
+            self._eligible[cid] = hit
+        return hit
+
+    # -------------------------------------------------------------------------
+    # Puntos de retorno
+    # -------------------------------------------------------------------------
+
+    def mark(self) -> Tuple[int, ...]:
+        """Punto al que `rollback` puede volver."""
+        return (len(self.clauses), len(self.retired), len(self.steps),
+                self.given, self.round_end, self.iteration, self.refuted, len(self._intermediate),
+                self.pruned)
+
+    def rollback(self, mark: Tuple[int, ...]) -> None:
+        """Descarta las cláusulas añadidas desde `mark` y restaura las que ellas retiraron."""
+        n, n_retired, n_steps, given, round_end, iteration, refuted, n_inter, pruned = mark
+        self.pruned = pruned
+        for c in self._intermediate[n_inter:]:
+            self.proof.pop(c, None)
+        del self._intermediate[n_inter:]
+        for cid in range(n, len(self.clauses)):
+            c = self.clauses[cid]
+            if c is not None:
+                self.subs.remove(cid)
+                self.seen.discard(c)
+                self.proof.pop(c, None)
+            self.deleted.discard(cid)
+            self._eligible.pop(cid, None)
+        del self.clauses[n:]
+        for cid, c in reversed(self.retired[n_retired:]):
+            if cid < n:
+                self.clauses[cid] = c
+                self.seen.add(c)
+                self.subs.add(cid, c)
+                self.deleted.discard(cid)
+        del self.retired[n_retired:]
+        del self.steps[n_steps:]
+        self.given, self.round_end, self.iteration, self.refuted = given, round_end, iteration, refuted
+
+    # -------------------------------------------------------------------------
+    # Hiper-resolución y resolución UR
+    # -------------------------------------------------------------------------
+
+    def _nuclei(self, j: int, Cj: Clause):
+        """
+        Inferencias en las que participa la cláusula dada `Cj`, como tuplas
+        (id_núcleo, núcleo, literales a resolver, id máximo de electrón, electrón fijo).
+        Cada combinación se genera cuando llega su participante más reciente:
+        si `Cj` es núcleo, con electrones ya activos; si es electrón, contra los
+        núcleos activos que tienen un literal complementario (el índice los
+        entrega), fijándolo en esa posición.
+        """
+        key = str
+        if self.inference == "hyper":
+            if not _is_positive(Cj):
+                yield j, Cj, sorted((l for l in Cj if l.neg), key=key), j - 1, None
+                return
+            for i, pairs in self.index.partners(Cj).items():
+                if i >= j or i in self.deleted:
+                    continue
+                N = self.clauses[i]
+                negs = sorted((l for l in N if l.neg), key=key)
+                for le, ln in pairs:
+                    yield i, N, negs, j, (ln, j, le)
+        else:
+            # UR: se resuelven todos los literales del núcleo menos uno (o todos: `□`)
+            if len(Cj) > 1:
+                for keep in [None] + sorted(Cj, key=key):
+                    yield j, Cj, sorted((l for l in Cj if l != keep), key=key), j - 1, None
+                return
+            for i, pairs in self.index.partners(Cj).items():
+                if i >= j or i in self.deleted:
+                    continue
+                N = self.clauses[i]
+                for le, ln in pairs:
+                    for keep in [None] + sorted((l for l in N if l != ln), key=key):
+                        yield i, N, sorted((l for l in N if l != keep), key=key), j, (ln, j, le)
+
+    def _electrons(self, ln: Literal, max_id: int, accept) -> List[Tuple[int, Literal]]:
+        """Literales complementarios de `ln` en electrones activos (id ≤ `max_id`)."""
+        deleted, clauses = self.deleted, self.clauses
+        return [(eid, le) for eid, le in self.index.complementary(ln)
+                if eid <= max_id and eid not in deleted and accept(clauses[eid])]
+
+    def _combinations(self, N_std: Clause, ren_n: Dict[Var, Var], targets: List[Literal],
+                      max_id: int, accept, fixed) -> List[Tuple[list, Subst]]:
+        """
+        Todas las formas de resolver **a la vez** los `targets` del núcleo con
+        electrones, con una MGU simultánea: el `Unifier` se extiende literal a
+        literal y `undo` retrocede al probar otro electrón. Cada electrón se
+        renombra aparte en cada uso (puede repetirse en varias posiciones).
+        """
+        u = Unifier()
+        chosen: list = []
+        out: List[Tuple[list, Subst]] = []
+
+        def search(k: int) -> None:
+            if k == len(targets):
+                out.append((list(chosen), u.subst()))
+                return
+            ln = targets[k]
+            ln_std = rename_vars_lit(ln, ren_n)
+            cands = [fixed[1:]] if fixed is not None and fixed[0] == ln else self._electrons(ln, max_id, accept)
+            for eid, le in cands:
+                E = self.clauses[eid]
+                self._fresh += 1
+                ren_e = renaming_apart(E, f'e{self._fresh}')
+                le_std = rename_vars_lit(le, ren_e)
+                m = u.mark()
+                self.stats.unify_attempts += 1
+                if all(u.unify(a, b) for a, b in zip(ln_std.pred.args, le_std.pred.args)):
+                    self.stats.unify_successes += 1
+                    chosen.append((ln_std, eid, E, rename_vars_clause(E, ren_e), le_std))
+                    search(k + 1)
+                    chosen.pop()
+                u.undo(m)
+
+        search(0)
+        return out
+
+    def _multi_step(self, j: int, Cj: Clause, iteration: int):
+        """
+        Hiper-resolución / UR para la cláusula dada. Solo se retiene la cláusula
+        final; los resolventes intermedios (uno por electrón) quedan en la traza
+        y en `proof` para reconstruir la prueba como cadena binaria.
+        Retorna True (`□`), False o `UNKNOWN` (presupuesto agotado).
+        """
+        accept = _is_positive if self.inference == "hyper" else _is_unit
+        for nid, N, targets, max_id, fixed in list(self._nuclei(j, Cj)):
+            if j in self.deleted:
+                break  # la cláusula dada fue subsumida por un resolvente suyo
+            if nid in self.deleted:
+                continue
+            ren_n = renaming_apart(N, f'a{nid}')
+            N_std = rename_vars_clause(N, ren_n)
+            for chosen, theta in self._combinations(N_std, ren_n, targets, max_id, accept, fixed):
+                cur = N_std
+                for ln_std, _, _, E_std, le_std in chosen:
+                    cur = (cur - {ln_std}) | (E_std - {le_std})
+                R = apply_subst_clause(cur, theta)
+                if is_tautology(R):
+                    continue
+                self.stats.generated += 1
+                if self._over_budget():
+                    return UNKNOWN
+                # Cadena binaria equivalente: cada intermedio usa la MGU de los
+                # electrones ya resueltos (composición incremental de MGUs), así
+                # que es un resolvente binario de su antecesor y el electrón.
+                chain: List[Tuple[Clause, Clause, Clause]] = []  # (padre izq., electrón, resolvente)
+                u = Unifier()
+                cur, prev = N_std, N
+                for ln_std, eid, E, E_std, le_std in chosen:
+                    for a, b in zip(ln_std.pred.args, le_std.pred.args):
+                        u.unify(a, b)
+                    theta_k = u.subst()
+                    cur = (cur - {ln_std}) | (E_std - {le_std})
+                    inter = apply_subst_clause(cur, theta_k)
+                    chain.append((prev, E, inter))
+                    if self._tracing:
+                        self._emit(FolStep(iteration, nid, eid, ln_std, le_std, theta_k, inter))
+                    prev = inter
+                left, E, _ = chain[-1]
+                if not self.add_clause(R, parents=(left, E)):
+                    continue
+                for left, E, inter in chain[:-1]:
+                    if inter not in self.proof:
+                        self.proof[inter] = (left, E)
+                        self._intermediate.append(inter)
+                if len(R) == 0:
+                    return True
+        return False
+
+    def binary_resolvents(self, j: int, Cj: Clause, detail: Optional[bool] = None):
+        """
+        Resolventes binarios (no tautológicos) de la cláusula dada `Cj` (id `j`)
+        con las activas (ids < j), como (i, Ci, lit_i, lit_j, θ, R). Es perezoso:
+        entre resolvente y resolvente revisa las retiradas por subsunción, así
+        que el bucle puede añadir cada uno antes de pedir el siguiente.
+
+        La estandarización-aparte es implícita (`OffsetUnifier`): intentar un
+        par no copia nada. Con `detail` (por defecto, si hay traza) los
+        pivotes, θ y el resolvente usan los nombres `x_a{i}`/`x_b{j}` de
+        siempre; sin él, lit_i, lit_j y θ son None y las variables del
+        resolvente salen del banco `v1, v2, ...` sin formatear nombres.
+        """
+        if detail is None:
+            detail = self._tracing
+        clauses, deleted = self.clauses, self.deleted
+        ordered = self.ordering is not None or self.selection is not None
+        if ordered:
+            elig_j, sel_j = self.eligible(j, Cj)
+
+        # Solo las cláusulas activas (ids < j) con un literal complementario unificable
+        for i, pairs in self.index.partners(Cj).items():
+            if i >= j or i in deleted:
+                continue
+            if j in deleted:
+                break  # la cláusula dada fue subsumida por un resolvente suyo
+            Ci = clauses[i]
+            if ordered:
+                elig_i, sel_i = self.eligible(i, Ci)
+                pairs = [(lj, li) for lj, li in pairs if lj in elig_j and li in elig_i]
+                if not pairs:
+                    continue
+
+            # Estandarización-aparte implícita: Ci con desplazamiento 0 y Cj con 1;
+            # los renombrados solo se construyen si algún par unifica
+            names = None
+
+            for lj, li in pairs:
+                # Unifica argumento a argumento (union-find, sin copiar θ ni las cláusulas)
+                u = OffsetUnifier()
+                self.stats.unify_attempts += 1
+                if not all(u.unify(a, 0, b, 1) for a, b in zip(li.pred.args, lj.pred.args)):
+                    continue  # no unificó este par
+                self.stats.unify_successes += 1
+                if detail:
+                    if names is None:
+                        names = (renaming_apart(Ci, f'a{i}'), renaming_apart(Cj, f'b{j}'))
+                    pair_names = names
+                else:
+                    pair_names = _pooled_names()
+                memo: Dict = {}
+                def inst(l: Literal, k: int) -> Literal:
+                    if l.pred.ground: return l
+                    return Literal(Pred(l.pred.name, tuple(u.resolve(t, k, pair_names, memo) for t in l.pred.args)), l.neg)
+
+                if self.ordering is not None and (
+                        (not sel_i and not self.ordering.is_eligible(inst(li, 0), [inst(x, 0) for x in Ci if x != li])) or
+                        (not sel_j and not self.ordering.is_eligible(inst(lj, 1), [inst(x, 1) for x in Cj if x != lj]))):
+                    continue  # algún pivote dejó de ser (estrictamente) maximal tras θ
+
+                # Resolvente (sin los pivotes) con θ aplicado directamente sobre los literales originales
+                R = frozenset([inst(x, 0) for x in Ci if x != li] + [inst(x, 1) for x in Cj if x != lj])
+
+                if is_tautology(R):
+                    continue
+                if detail:
+                    yield i, Ci, rename_vars_lit(li, names[0]), rename_vars_lit(lj, names[1]), u.subst(names), R
+                else:
+                    yield i, Ci, None, None, None, R
+
+    # -------------------------------------------------------------------------
+    # Bucle principal
+    # -------------------------------------------------------------------------
+
+    def _over_budget(self) -> bool:
+        meter = self._meter
+        return meter is not None and meter.exceeded(len(self.clauses) - len(self.deleted)) is not None
+
+    def run(self, max_given: Optional[int] = None, budget: Optional[Budget] = None):
+        """
+        Procesa cláusulas dadas hasta derivar `□` (True), agotar los pares
+        (False) o procesar `max_given` cláusulas (None: sin decidir).
+
+        Con `budget` (`motor/budget.py`) retorna `UNKNOWN` si algún límite se
+        agota; la cláusula dada interrumpida se vuelve a procesar completa en
+        la siguiente llamada. Si se descartaron resolventes por
+        `max_term_depth`, saturar también da `UNKNOWN` en vez de False.
+        """
+        self._meter = budget.start(self.stats) if budget is not None else None
+        self._max_depth = budget.max_term_depth if budget is not None else None
+        self.stats.stopped = None
+        t0 = time.perf_counter()
+        try:
+            result = self._run(max_given)
+        finally:
+            self.stats.add_time("búsqueda", time.perf_counter() - t0)
+            self._meter = None
+            self._max_depth = None
+        if result is False and self.pruned:
+            self.stats.stopped = "profundidad"
+            return UNKNOWN
+        return result
+
+    def _run(self, max_given: Optional[int]):
+        clauses, deleted = self.clauses, self.deleted
+        tracing, emit = self._tracing, self._emit
+        if self.refuted:
+            return True
+        processed = 0
+
+        while self.given < len(clauses):
+            if max_given is not None and processed >= max_given:
+                return None
+            if self.given >= self.round_end:
+                self.iteration += 1
+                self.round_end = len(clauses)
+            iteration = self.iteration
+
+            j = self.given
+            if self._over_budget():
+                return UNKNOWN
+            self.given += 1
+            if j in deleted:
+                continue
+            processed += 1
+            Cj = clauses[j]
+
+            # Factores: la subsunción y el orden (pivote positivo estrictamente
+            # maximal) son incompletos sin ellos
+            if self.subsumption or self.ordering is not None:
+                for la, lb, theta, F in factors(Cj):
+                    if tracing:
+                        emit(FolStep(iteration, j, j, la, lb, theta, F))
+                    if self.add_clause(F, parents=(Cj, Cj)):
+                        self.stats.factors += 1
+                        if self.refuted:
+                            return True
+
+            if self.inference != "binary":
+                r = self._multi_step(j, Cj, iteration)
+                if r is UNKNOWN:
+                    self.given = j
+                if r is not False:
+                    return r
+                continue
+
+            for i, Ci, li_std, lj_std, theta, R in self.binary_resolvents(j, Cj):
+                self.stats.generated += 1
+                if self._over_budget():
+                    self.given = j
+                    return UNKNOWN
+
+                if tracing:
+                    emit(FolStep(iteration, i, j, li_std, lj_std, dict(theta), R))
+
+                if not self.add_clause(R, parents=(Ci, Cj)):
+                    continue
 
-    processed_pairs: Set[Tuple[int, int]] = set()  # evita re-uso de pares
-    iteration = 0
+                if len(R) == 0:
+                    return True
 
-    while True:
-        new_any = False
-        iteration += 1
+        return False
 
-        for i in range(len(clauses)):
-            for j in range(i+1, len(clauses)):
-                key = (i, j)
-                if key in processed_pairs:
-                    continue
-                processed_pairs.add(key)
-
-                Ci = clauses[i]
-                Cj = clauses[j]
-
-                # Estandarización-aparte por par
-                Ci_std = standardize_apart(Ci, f'a{i}')
-                Cj_std = standardize_apart(Cj, f'b{j}')
-
-                # Intenta todas las parejas de literales complementarios
-                for li in Ci_std:
-                    for lj in Cj_std:
-                        if not literal_complementary(li, lj):
-                            continue
-
-                        theta: Subst = {}
-                        # Unifica argumento a argumento
-                        for a, b in zip(li.pred.args, lj.pred.args):
-                            theta = unify(a, b, theta)
-                            if theta is None:
-                                break
-                        if theta is None:
-                            continue  # no unificó este par
-
-                        # Construir resolvente (sin los pivotes) y aplicar θ
-                        Ri = frozenset(x for x in Ci_std if x != li)
-                        Rj = frozenset(x for x in Cj_std if x != lj)
-                        R  = apply_subst_clause(Ri.union(Rj), theta)
-
-                        if is_tautology(R):
-                            continue
-
-                        if keep_steps:
-                            steps.append(FolStep(iteration, i, j, li, lj, dict(theta), R))
-
-                        if not add_clause(R, parents=(clauses[i], clauses[j])):
-                            continue
-
-                        new_any = True
-                        if len(R) == 0:
-                            return True, set(clauses), proof, steps
-
-        if not new_any:
-            return False, set(clauses), proof, steps
+
+def resolve_first_order(clauses_init: Iterable[Clause], keep_steps: bool = True,
+                        subsumption: bool = True, stats: Optional[ResolutionStats] = None,
+                        ordering: Optional[TermOrdering] = None,
+                        selection: Union[Selection, str, None] = None, inference: str = "binary",
+                        budget: Optional[Budget] = None,
+                        sink: Optional[Callable[[FolStep], None]] = None):
+    """
+    Ejecuta la resolución FOL sobre una KB en CNF con los criterios de la práctica.
+    Retorna: (entails_empty, derived_set, proof_map, steps)
+
+    - `entails_empty` es True si se derivó `□` (la sentencia original es verdadera),
+      False si se saturó sin derivarla y `UNKNOWN` si se agotó `budget`.
+    - `derived_set` contiene las cláusulas visitadas/derivadas (canónicas) que
+      siguen retenidas (sin las retiradas por subsunción).
+    - `proof_map` enlaza resolventes con sus padres (opcional para reconstrucción).
+    - `steps` trae la traza completa si `keep_steps=True`. En corridas largas
+      conviene `keep_steps=False` con un `sink` (callback o `JsonlSink`) que
+      reciba cada paso, y reconstruir solo la refutación mínima desde
+      `proof_map` con `refutation_steps` de `motor/trace.py`.
+    - `stats` (opcional) se llena con los contadores: generadas, retenidas,
+      subsumidas, unificaciones y tiempo por fase (carga, búsqueda, subsunción).
+    - `budget` (`Budget` de `motor/budget.py`) acota tiempo, resolventes
+      generados, cláusulas retenidas, memoria y profundidad de término.
+
+    Con `subsumption=True` cada resolvente nuevo se descarta si una cláusula
+    retenida lo subsume (*forward*) y, si se retiene, retira las cláusulas que
+    él subsume (*backward*); ver `motor/subsumption.py`. Para no perder
+    completitud, en ese modo (y con `ordering`) cada cláusula dada aporta también sus **factores**
+    (el paso aparece en la traza con ambos ids iguales).
+
+    Cada resolvente se interna en un `TermBank` antes de consultar `seen`: cada
+    término, literal y subtérmino compartido existe una sola vez en memoria y
+    se libera cuando el motor deja de referenciar la cláusula.
+
+    Bucle de *cláusula dada* (`FolProver.run`): las cláusulas se procesan en
+    orden de llegada y cada una solo se resuelve contra las cláusulas ya
+    activas que contienen un literal complementario con argumentos
+    compatibles, recuperadas con el árbol de discriminación de
+    `TermLiteralIndex`. El mismo índice (con todas las cláusulas retenidas)
+    respalda las consultas de subsunción.
+
+    `ordering` (`LPO()`/`KBO()` de `motor/ordering.py`) y `selection` (función o
+    nombre: 'first_negative', 'heaviest_negative', 'nonunique_max') activan la
+    resolución ordenada con selección: menos resolventes redundantes sin
+    perder completitud de refutación.
+
+    `inference` cambia la regla del bucle (el orden y la selección solo aplican
+    a 'binary'):
+    - 'hyper': **hiper-resolución positiva**. Un núcleo (cláusula con negativos)
+      resuelve todos sus negativos a la vez con electrones (cláusulas positivas)
+      y solo se retiene el resolvente final, que es positivo. Completa para la
+      refutación junto con los factores.
+    - 'ur': **resolución UR**. Un núcleo de n literales resuelve n-1 (o n) de
+      ellos con cláusulas unitarias y solo se retiene la unitaria (o `□`)
+      resultante. Completa en KBs de Horn, incompleta en general.
+    Los electrones de cada literal se buscan en `TermLiteralIndex`.
+    """
+    prover = FolProver(keep_steps=keep_steps, subsumption=subsumption, stats=stats,
+                       ordering=ordering, selection=selection, inference=inference, sink=sink)
+    t0 = time.perf_counter()
+    for c in clauses_init:
+        prover.add_clause(c)
+    prover.stats.add_time("carga", time.perf_counter() - t0)
+    entails = prover.run(budget=budget)
+    return entails, prover.retained(), prover.proof, prover.steps
 
 # -----------------------------------------------------------------------------
 # Helper para crear literales de forma legible en ejemplos
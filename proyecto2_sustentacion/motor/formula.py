@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+motor/formula.py
+================
+**Fórmulas** (árbol de sintaxis) y **parser de texto** para lógica proposicional
+y de primer orden, previo a la conversión a CNF (`motor/cnf.py`).
+
+Sintaxis aceptada (ASCII o Unicode), de menor a mayor precedencia:
+- `A <-> B`  / `A ↔ B`        bicondicional
+- `A -> B`   / `A → B`        implicación (asocia a la derecha)
+- `A | B`    / `A ∨ B`        disyunción
+- `A & B`    / `A ∧ B`        conjunción
+- `~A`, `¬A`, `!A`            negación
+- `forall x y. F` / `∀x. F`   cuantificadores (el alcance llega lo más a la derecha posible)
+- `exists x. F`   / `∃x. F`
+
+Átomos: `A` (proposicional) o `Gato(Tuna)`, `Mata(y, f(x))` (primer orden).
+Dentro de un argumento, un nombre ligado por un cuantificador es una `Var`;
+cualquier otro nombre es una `Const` (o una `Func` si lleva argumentos).
+"""
+
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import List, Set, Tuple, Union
+
+from motor.unification import Var, Const, Func, Term
+
+# -----------------------------------------------------------------------------
+# Árbol de sintaxis
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Atom:
+    name: str
+    args: Tuple[Term, ...] = ()
+    def __str__(self) -> str:
+        if not self.args: return self.name
+        return f'{self.name}({", ".join(map(str, self.args))})'
+
+@dataclass(frozen=True)
+class Not:
+    arg: "Formula"
+    def __str__(self) -> str: return f'¬{_paren(self.arg)}'
+
+@dataclass(frozen=True)
+class And:
+    args: Tuple["Formula", ...]
+    def __str__(self) -> str: return " ∧ ".join(map(_paren, self.args))
+
+@dataclass(frozen=True)
+class Or:
+    args: Tuple["Formula", ...]
+    def __str__(self) -> str: return " ∨ ".join(map(_paren, self.args))
+
+@dataclass(frozen=True)
+class Implies:
+    left: "Formula"
+    right: "Formula"
+    def __str__(self) -> str: return f'{_paren(self.left)} → {_paren(self.right)}'
+
+@dataclass(frozen=True)
+class Iff:
+    left: "Formula"
+    right: "Formula"
+    def __str__(self) -> str: return f'{_paren(self.left)} ↔ {_paren(self.right)}'
+
+@dataclass(frozen=True)
+class Forall:
+    var: Var
+    body: "Formula"
+    def __str__(self) -> str: return f'∀{self.var}. {self.body}'
+
+@dataclass(frozen=True)
+class Exists:
+    var: Var
+    body: "Formula"
+    def __str__(self) -> str: return f'∃{self.var}. {self.body}'
+
+Formula = Union[Atom, Not, And, Or, Implies, Iff, Forall, Exists]
+
+def _paren(f: Formula) -> str:
+    return str(f) if isinstance(f, (Atom, Not)) else f'({f})'
+
+def conj(*fs: Formula) -> Formula:
+    """Conjunción aplanada (una sola fórmula se devuelve tal cual)."""
+    flat: List[Formula] = []
+    for f in fs:
+        flat.extend(f.args if isinstance(f, And) else (f,))
+    return flat[0] if len(flat) == 1 else And(tuple(flat))
+
+def disj(*fs: Formula) -> Formula:
+    """Disyunción aplanada (una sola fórmula se devuelve tal cual)."""
+    flat: List[Formula] = []
+    for f in fs:
+        flat.extend(f.args if isinstance(f, Or) else (f,))
+    return flat[0] if len(flat) == 1 else Or(tuple(flat))
+
+def is_first_order(f: Formula) -> bool:
+    """¿Tiene cuantificadores o átomos con argumentos?"""
+    stack = [f]
+    while stack:
+        g = stack.pop()
+        if isinstance(g, (Forall, Exists)): return True
+        if isinstance(g, Atom):
+            if g.args: return True
+        elif isinstance(g, Not): stack.append(g.arg)
+        elif isinstance(g, (And, Or)): stack.extend(g.args)
+        else: stack.extend((g.left, g.right))
+    return False
+
+# -----------------------------------------------------------------------------
+# Parser (descenso recursivo)
+# -----------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"\s*(<->|<=>|->|=>|[()~!¬&∧|∨→↔∀∃,.]|[A-Za-z_][A-Za-z0-9_']*)")
+_SYMBOLS = {"<=>": "<->", "↔": "<->", "=>": "->", "→": "->", "∧": "&", "∨": "|",
+            "¬": "~", "!": "~", "∀": "forall", "∃": "exists"}
+
+def tokenize(text: str) -> List[str]:
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise SyntaxError(f"símbolo inesperado en la posición {pos}: {text[pos:pos + 10]!r}")
+        tok = m.group(1)
+        tokens.append(_SYMBOLS.get(tok, tok))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self.bound: List[str] = []
+
+    def peek(self) -> str:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ""
+
+    def take(self, expected: str = "") -> str:
+        tok = self.peek()
+        if not tok or (expected and tok != expected):
+            raise SyntaxError(f"se esperaba {expected or 'un símbolo'!r} y se encontró {tok or 'el final'!r}")
+        self.pos += 1
+        return tok
+
+    def parse(self) -> Formula:
+        f = self.iff()
+        if self.peek():
+            raise SyntaxError(f"símbolo sobrante: {self.peek()!r}")
+        return f
+
+    def iff(self) -> Formula:
+        f = self.implies()
+        while self.peek() == "<->":
+            self.take()
+            f = Iff(f, self.implies())
+        return f
+
+    def implies(self) -> Formula:
+        f = self.disjunction()
+        if self.peek() == "->":
+            self.take()
+            return Implies(f, self.implies())
+        return f
+
+    def disjunction(self) -> Formula:
+        fs = [self.conjunction()]
+        while self.peek() == "|":
+            self.take()
+            fs.append(self.conjunction())
+        return disj(*fs)
+
+    def conjunction(self) -> Formula:
+        fs = [self.unary()]
+        while self.peek() == "&":
+            self.take()
+            fs.append(self.unary())
+        return conj(*fs)
+
+    def unary(self) -> Formula:
+        tok = self.peek()
+        if tok == "~":
+            self.take()
+            return Not(self.unary())
+        if tok in ("forall", "exists"):
+            self.take()
+            names = []
+            while self.peek() not in (".", ""):
+                names.append(self.take())
+            self.take(".")
+            if not names:
+                raise SyntaxError(f"'{tok}' sin variables")
+            self.bound.extend(names)
+            body = self.iff()
+            del self.bound[-len(names):]
+            q = Forall if tok == "forall" else Exists
+            for name in reversed(names):
+                body = q(Var(name), body)
+            return body
+        if tok == "(":
+            self.take()
+            f = self.iff()
+            self.take(")")
+            return f
+        name = self.take()
+        if not re.match(r"[A-Za-z_]", name):
+            raise SyntaxError(f"se esperaba un átomo y se encontró {name!r}")
+        return Atom(name, self.arguments())
+
+    def arguments(self) -> Tuple[Term, ...]:
+        if self.peek() != "(":
+            return ()
+        self.take("(")
+        args = [self.term()]
+        while self.peek() == ",":
+            self.take()
+            args.append(self.term())
+        self.take(")")
+        return tuple(args)
+
+    def term(self) -> Term:
+        name = self.take()
+        args = self.arguments()
+        if args:
+            return Func(name, args)
+        return Var(name) if name in self.bound else Const(name)
+
+
+def parse_formula(text: str) -> Formula:
+    """Texto -> fórmula. Lanza `SyntaxError` con la posición del problema."""
+    return _Parser(text).parse()
+
+
+def free_vars(f: Formula) -> Set[Var]:
+    """Variables libres de la fórmula."""
+    if isinstance(f, Atom):
+        vs: Set[Var] = set()
+        for a in f.args: vs |= a.variables
+        return vs
+    if isinstance(f, Not): return free_vars(f.arg)
+    if isinstance(f, (And, Or)):
+        vs = set()
+        for g in f.args: vs |= free_vars(g)
+        return vs
+    if isinstance(f, (Forall, Exists)): return free_vars(f.body) - {f.var}
+    return free_vars(f.left) | free_vars(f.right)
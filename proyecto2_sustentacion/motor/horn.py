@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+motor/horn.py
+=============
+Motor **SLD dirigido por la meta** para KBs de **cláusulas de Horn** (a lo sumo
+un literal positivo), con los mismos `Literal`/`Clause` de
+`motor/first_order_resolution.py`.
+
+- Cláusula con un positivo: regla `cabeza :- cuerpo` (los negativos son el cuerpo);
+  sin cuerpo es un hecho. Cláusula sin positivos: consulta (meta negada).
+- **Indexación por primer argumento**: para cada predicado, las reglas se agrupan
+  por el símbolo principal de su primer argumento (`Const`/`Func`); las de
+  primer argumento variable entran en todos los grupos. Una llamada con primer
+  argumento instanciado solo recorre su grupo.
+- **Tabulación** (al estilo SLG, evaluación lineal con punto fijo): cada
+  subobjetivo, salvo renombrado de variables, tiene una tabla de respuestas.
+  Una llamada repetida consume la tabla en vez de re-derivar, y una llamada
+  recursiva a un subobjetivo en curso consume las respuestas parciales; el
+  *líder* de cada componente recursiva re-evalúa hasta que ninguna tabla crece.
+  Así `ancestro(x, z) :- ancestro(x, y), padre(y, z)` termina.
+- Las respuestas salen como **sustituciones** sobre las variables de la meta
+  (`solve` es un generador), pero la tabla de cada subobjetivo se completa
+  antes de consumirse: con recursión sobre términos crecientes
+  (`nat(s(x)) :- nat(x)`) la tabla es infinita y ni la primera respuesta
+  llegaría. `max_term_depth` acota la tabulación: las llamadas y respuestas
+  más profundas se descartan y el programa queda `truncated`, así que no
+  encontrar respuesta ya no prueba nada.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from motor.unification import Var, Const, Func, Term, Subst, Unifier, term_depth
+from motor.first_order_resolution import Pred, Literal, Clause, vars_in_pred, resolve_first_order
+from motor.budget import Budget, UNKNOWN
+
+# -----------------------------------------------------------------------------
+# Detección de Horn
+# -----------------------------------------------------------------------------
+
+def is_horn_clause(c: Clause) -> bool:
+    """¿A lo sumo un literal positivo?"""
+    return sum(1 for l in c if not l.neg) <= 1
+
+def is_horn(clauses: Iterable[Clause]) -> bool:
+    return all(is_horn_clause(c) for c in clauses)
+
+# -----------------------------------------------------------------------------
+# Programa
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Rule:
+    head: Pred
+    body: Tuple[Pred, ...] = ()
+    def __str__(self) -> str:
+        if not self.body: return f'{self.head}.'
+        return f'{self.head} :- {", ".join(map(str, self.body))}.'
+
+def _first_key(t: Term):
+    if t.__class__ is Var: return None
+    if t.__class__ is Const: return ('c', t.name)
+    return ('f', t.name, len(t.args))
+
+@dataclass
+class _Table:
+    answers: List[Pred] = field(default_factory=list)
+    seen: Set[Pred] = field(default_factory=set)   # respuestas canónicas
+    depth: Optional[int] = None                    # posición en la pila si está en curso
+    complete: bool = False
+    started: int = -1                              # reloj al empezar su iteración actual
+    finished: int = -1                             # reloj al terminar su última evaluación
+    dep: Optional["_Table"] = None                 # tabla en curso de la que depende (si incompleta)
+
+_INF = float("inf")
+
+# Profundidad de término con la que `prove_auto` intenta SLD antes de recurrir
+# a la resolución general
+SLD_MAX_TERM_DEPTH = 8
+
+def _pred_depth(p: Pred) -> int:
+    return max((term_depth(a) for a in p.args), default=0)
+
+
+class HornProgram:
+    """
+    Reglas de Horn indexadas por (predicado, aridad) y primer argumento.
+    Con `max_term_depth` (solo con tabulación) las tablas son finitas; si se
+    descartó algo por profundidad, `truncated` queda en True.
+    """
+
+    def __init__(self, clauses: Iterable[Clause] = (), tabling: bool = True,
+                 max_term_depth: Optional[int] = None) -> None:
+        self.tabling = tabling
+        self.max_term_depth = max_term_depth
+        self.truncated = False
+        self.queries: List[Tuple[Pred, ...]] = []     # cláusulas sin positivos
+        self._rules: Dict[Tuple[str, int], List[Rule]] = {}
+        self._by_first: Dict[Tuple[str, int], Dict[object, List[Rule]]] = {}
+        self._var_first: Dict[Tuple[str, int], List[Rule]] = {}
+        self._tables: Dict[Pred, _Table] = {}
+        self._stack: List[_Table] = []
+        self._pending: List[_Table] = []  # tablas incompletas a la espera de su líder
+        self._low = _INF
+        self._changes = 0
+        self._clock = 0
+        self._fresh = 0
+        # Contadores
+        self.calls = 0
+        self.table_hits = 0
+        for c in clauses:
+            self.add_clause(c)
+
+    def add_clause(self, c: Clause) -> None:
+        if not is_horn_clause(c):
+            raise ValueError(f"la cláusula no es de Horn: {c}")
+        heads = [l.pred for l in c if not l.neg]
+        body = tuple(sorted((l.pred for l in c if l.neg), key=str))
+        if heads:
+            self.add_rule(Rule(heads[0], body))
+        else:
+            self.queries.append(body)
+
+    def add_rule(self, r: Rule) -> None:
+        key = (r.head.name, len(r.head.args))
+        self._rules.setdefault(key, []).append(r)
+        groups = self._by_first.setdefault(key, {})
+        first = _first_key(r.head.args[0]) if r.head.args else None
+        if first is None:
+            self._var_first.setdefault(key, []).append(r)
+            for rules in groups.values():
+                rules.append(r)
+        else:
+            groups.setdefault(first, list(self._var_first.get(key, ()))).append(r)
+        self._tables.clear()  # las tablas dependen del programa
+        self.truncated = False
+
+    def candidates(self, atom: Pred) -> List[Rule]:
+        """Reglas cuya cabeza puede unificar con `atom` según el primer argumento."""
+        key = (atom.name, len(atom.args))
+        first = _first_key(atom.args[0]) if atom.args else None
+        if first is None:
+            return self._rules.get(key, [])
+        groups = self._by_first.get(key)
+        if groups is None:
+            return []
+        rules = groups.get(first)
+        return rules if rules is not None else self._var_first.get(key, [])
+
+    # -------------------------------------------------------------------------
+    # Utilidades
+    # -------------------------------------------------------------------------
+
+    def _rename(self, preds: Sequence[Pred]) -> List[Pred]:
+        """Variables frescas para una regla o respuesta (estandarización-aparte)."""
+        vs: Set[Var] = set()
+        for p in preds:
+            vs |= vars_in_pred(p)
+        if not vs:
+            return list(preds)
+        self._fresh += 1
+        ren = {v: Var(f'{v.name}_s{self._fresh}') for v in vs}
+        def r(t: Term) -> Term:
+            if t.__class__ is Var: return ren[t]
+            if t.ground: return t
+            return Func(t.name, tuple(r(a) for a in t.args))
+        return [Pred(p.name, tuple(r(a) for a in p.args)) for p in preds]
+
+    @staticmethod
+    def _resolve(u: Unifier, p: Pred) -> Pred:
+        if p.ground: return p
+        return Pred(p.name, tuple(u.resolve(a) for a in p.args))
+
+    @staticmethod
+    def _unify_args(u: Unifier, a: Pred, b: Pred) -> bool:
+        m = u.mark()
+        if all(u.unify(x, y) for x, y in zip(a.args, b.args)):
+            return True
+        u.undo(m)
+        return False
+
+    @staticmethod
+    def _variant(p: Pred) -> Pred:
+        """Forma canónica salvo renombrado (clave de tabla y de respuesta)."""
+        if p.ground: return p
+        mapping: Dict[Var, Var] = {}
+        def c(t: Term) -> Term:
+            if t.__class__ is Var:
+                v = mapping.get(t)
+                if v is None:
+                    v = mapping[t] = Var(f'v{len(mapping) + 1}')
+                return v
+            if t.ground: return t
+            return Func(t.name, tuple(c(a) for a in t.args))
+        return Pred(p.name, tuple(c(a) for a in p.args))
+
+    # -------------------------------------------------------------------------
+    # SLD sin tabulación (búsqueda en profundidad)
+    # -------------------------------------------------------------------------
+
+    def _sld(self, goals: Tuple[Pred, ...], u: Unifier) -> Iterator[None]:
+        if not goals:
+            yield None
+            return
+        atom = self._resolve(u, goals[0])
+        self.calls += 1
+        for rule in self.candidates(atom):
+            head, *body = self._rename((rule.head,) + rule.body)
+            m = u.mark()
+            if self._unify_args(u, atom, head):
+                yield from self._sld(tuple(body) + goals[1:], u)
+            u.undo(m)
+
+    # -------------------------------------------------------------------------
+    # SLD con tabulación
+    # -------------------------------------------------------------------------
+
+    def _sld_tabled(self, goals: Tuple[Pred, ...], u: Unifier) -> Iterator[None]:
+        if not goals:
+            yield None
+            return
+        atom = self._resolve(u, goals[0])
+        for ans in self._call(atom):
+            (ans,) = self._rename((ans,))
+            m = u.mark()
+            if self._unify_args(u, atom, ans):
+                yield from self._sld_tabled(goals[1:], u)
+            u.undo(m)
+
+    def _call(self, atom: Pred) -> List[Pred]:
+        """Respuestas (instancias de `atom`) de su tabla; la evalúa si hace falta."""
+        self.calls += 1
+        key = self._variant(atom)
+        t = self._tables.get(key)
+        if t is not None:
+            if t.complete:
+                self.table_hits += 1
+                return t.answers
+            if t.depth is not None:
+                # Llamada recursiva a un subobjetivo en curso: respuestas parciales
+                self._low = min(self._low, t.depth)
+                return list(t.answers)
+            d = t.dep
+            while d is not None and d.depth is None:
+                d = d.dep
+            if d is not None and t.finished > d.started:
+                # Incompleta pero ya evaluada en la iteración actual de la tabla
+                # de la que depende: esa tabla itera hasta el punto fijo
+                self._low = min(self._low, d.depth)
+                return list(t.answers)
+        else:
+            if self.max_term_depth is not None and _pred_depth(atom) > self.max_term_depth:
+                self.truncated = True
+                return []
+            t = self._tables[key] = _Table()
+
+        t.depth = len(self._stack)
+        self._stack.append(t)
+        pending_mark = len(self._pending)
+        outer_low = self._low
+        while True:
+            self._low = _INF
+            self._clock += 1
+            t.started = self._clock
+            changes = self._changes
+            for rule in self.candidates(atom):
+                head, *body = self._rename((rule.head,) + rule.body)
+                u = Unifier()
+                if not self._unify_args(u, atom, head):
+                    continue
+                for _ in self._sld_tabled(tuple(body), u):
+                    ans = self._resolve(u, atom)
+                    if self.max_term_depth is not None and _pred_depth(ans) > self.max_term_depth:
+                        self.truncated = True
+                        continue
+                    canon = self._variant(ans)
+                    if canon not in t.seen:
+                        t.seen.add(canon)
+                        t.answers.append(ans)
+                        self._changes += 1
+            low = self._low
+            # Sin depender de tablas en curso basta una pasada; si depende de una
+            # más externa, su líder re-evaluará. El líder (low == depth) itera
+            # hasta que ninguna tabla de su componente gana respuestas.
+            if low != t.depth or self._changes == changes:
+                break
+        self._stack.pop()
+        if low >= t.depth:
+            t.complete = True
+            for p in self._pending[pending_mark:]:
+                p.complete = True
+            del self._pending[pending_mark:]
+            self._low = outer_low
+        else:
+            t.dep = self._stack[low]
+            self._pending.append(t)
+            self._low = min(outer_low, low)
+        t.depth = None
+        self._clock += 1
+        t.finished = self._clock
+        return t.answers
+
+    # -------------------------------------------------------------------------
+    # API
+    # -------------------------------------------------------------------------
+
+    def solve(self, goals: Sequence[Union[Pred, Literal]]) -> Iterator[Subst]:
+        """
+        Respuestas a la conjunción `goals` (átomos positivos), una sustitución
+        sobre sus variables por respuesta, generadas de forma perezosa.
+        """
+        preds = tuple(g.pred if isinstance(g, Literal) else g for g in goals)
+        qvars: List[Var] = []
+        for p in preds:
+            for v in sorted(vars_in_pred(p), key=lambda v: v.name):
+                if v not in qvars:
+                    qvars.append(v)
+        u = Unifier()
+        run = self._sld_tabled if self.tabling else self._sld
+        emitted: Set[Tuple[Term, ...]] = set()
+        for _ in run(preds, u):
+            answer = {v: u.resolve(v) for v in qvars}
+            key = tuple(answer.values())
+            if self.tabling:
+                if key in emitted:
+                    continue
+                emitted.add(key)
+            yield {v: t for v, t in answer.items() if t != v}
+
+
+def prove_horn(clauses_init: Iterable[Clause], tabling: bool = True,
+               max_term_depth: Optional[int] = None):
+    """
+    Refutación SLD de una KB de Horn con la meta negada incluida.
+    Retorna la primera respuesta (sustitución, `{}` si la meta es cerrada) de
+    alguna cláusula-consulta, None si ninguna tiene respuesta y `UNKNOWN` si
+    no la hay pero `max_term_depth` truncó alguna tabla.
+    """
+    program = HornProgram(clauses_init, tabling=tabling, max_term_depth=max_term_depth)
+    for query in program.queries:
+        for answer in program.solve(query):
+            return answer
+    return UNKNOWN if program.truncated else None
+
+
+def prove_auto(clauses_init: Iterable[Clause], max_term_depth: int = SLD_MAX_TERM_DEPTH,
+               budget: Optional[Budget] = None):
+    """
+    Detección automática: SLD con tabulación acotada a `max_term_depth` si la
+    KB es de Horn, resolución general (`resolve_first_order`, con `budget`) si
+    no lo es o si SLD no encontró respuesta tras truncar alguna tabla.
+    Retorna (entails, motor_usado); entails puede ser `UNKNOWN` si se agotó
+    `budget`.
+    """
+    clauses = list(clauses_init)
+    if is_horn(clauses):
+        answer = prove_horn(clauses, max_term_depth=max_term_depth)
+        if answer is not UNKNOWN:
+            return answer is not None, "sld"
+    return resolve_first_order(clauses, keep_steps=False, budget=budget)[0], "resolución"
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+motor/indexing.py
+=================
+**Índice de literales** por (predicado, aridad, polaridad) para recuperar
+cláusulas con literales complementarios sin recorrer toda la KB.
+
+Idea:
+- Cada literal de una cláusula activa se registra bajo su clave.
+- Al llegar una cláusula nueva, para cada literal se consulta la clave
+  complementaria y solo se visitan las cláusulas que la contienen.
+
+El índice es genérico: recibe la función que calcula la clave de un literal y
+la que calcula la clave de su complemento. Así sirve tanto para FOL
+(`Literal` con `Pred`) como para proposicional (literales en texto).
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+Key = Hashable
+
+# -----------------------------------------------------------------------------
+# Claves estándar
+# -----------------------------------------------------------------------------
+
+def fol_key(l: Any) -> Key:
+    """Clave de un literal FOL: (nombre del predicado, aridad, negado)."""
+    return (l.pred.name, len(l.pred.args), l.neg)
+
+def fol_complement_key(l: Any) -> Key:
+    """Clave del complemento de un literal FOL (misma firma, signo opuesto)."""
+    return (l.pred.name, len(l.pred.args), not l.neg)
+
+# -----------------------------------------------------------------------------
+# Índice
+# -----------------------------------------------------------------------------
+
+class LiteralIndex:
+    """
+    Índice clave -> {id_cláusula: [literales]} con inserción y borrado O(1)
+    por cláusula y literal.
+    """
+
+    def __init__(self, key: Callable[[Any], Key], complement_key: Callable[[Any], Key]):
+        self._key = key
+        self._complement_key = complement_key
+        self._entries: Dict[Key, Dict[int, List[Any]]] = {}
+
+    def add(self, cid: int, clause: Iterable[Any]) -> None:
+        """Registra todos los literales de la cláusula `cid`."""
+        for l in clause:
+            self._entries.setdefault(self._key(l), {}).setdefault(cid, []).append(l)
+
+    def remove(self, cid: int, clause: Iterable[Any]) -> None:
+        """Retira la cláusula `cid` del índice (p. ej. al ser subsumida)."""
+        for l in clause:
+            bucket = self._entries.get(self._key(l))
+            if bucket is not None:
+                bucket.pop(cid, None)
+
+    def complementary(self, l: Any) -> Iterator[Tuple[int, Any]]:
+        """Pares (id, literal) cuyo literal tiene la clave complementaria de `l`."""
+        bucket = self._entries.get(self._complement_key(l))
+        if not bucket:
+            return
+        for cid, lits in list(bucket.items()):
+            for other in lits:
+                yield cid, other
+
+    def partners(self, clause: Iterable[Any]) -> Dict[int, List[Tuple[Any, Any]]]:
+        """
+        Agrupa por cláusula compañera los pares (literal_propio, literal_ajeno)
+        complementarios. Las claves se devuelven en orden ascendente de id para
+        que la traza sea determinista.
+        """
+        found: Dict[int, List[Tuple[Any, Any]]] = {}
+        for l in clause:
+            for cid, other in self.complementary(l):
+                found.setdefault(cid, []).append((l, other))
+        return {cid: found[cid] for cid in sorted(found)}
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._entries.values())
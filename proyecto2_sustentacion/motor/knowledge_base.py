@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+motor/knowledge_base.py
+=======================
+**Base de conocimiento persistente** para consultas repetidas sobre los mismos
+axiomas.
+
+`resolve_first_order` reconstruye todo desde los axiomas en cada llamada. En
+uso real los axiomas son fijos y solo cambia la meta, así que `KnowledgeBase`
+conserva un `FolProver` con sus cláusulas canónicas, índices, banco de términos
+y consecuencias ya derivadas:
+
+- `tell(axioma)` añade axiomas (texto, fórmula o cláusulas) de forma permanente.
+- `warm_up(max_given)` procesa cláusulas de los axiomas por adelantado.
+- `ask(meta)` marca el estado, añade la meta **negada** y continúa el bucle
+  de cláusula dada desde donde quedó; con `rollback=True` (por defecto) todo lo
+  derivado a partir de la meta se descarta al terminar y las cláusulas de los
+  axiomas que la consulta retiró por subsunción se restauran.
+
+Las consecuencias de los axiomas derivadas durante una consulta también se
+descartan con el rollback (el estado vuelve exactamente a la marca); conviene
+calentar la base con `warm_up` para que las consultas solo hagan el trabajo
+propio de la meta.
+
+`save(ruta)` / `KnowledgeBase.load(ruta)` guardan y recuperan la base ya
+calentada en el formato binario de `motor/serialization.py`, de modo que otro
+proceso arranca con el estado saturado en vez de repetir `warm_up`.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from motor.first_order_resolution import Clause, FolProver, FolStep
+from motor.formula import Formula, Not, parse_formula
+from motor.cnf import CNFConverter
+from motor.stats import ResolutionStats
+from motor.budget import Budget
+from motor.trace import refutation_proof
+from motor.serialization import save_prover, load_state
+
+Sentence = Union[str, Formula]
+
+
+class KnowledgeBase:
+    """Axiomas FOL ya procesados que se reutilizan entre consultas."""
+
+    def __init__(self, axioms: Iterable[Union[Sentence, Clause]] = (), keep_steps: bool = False,
+                 subsumption: bool = True, stats: Optional[ResolutionStats] = None) -> None:
+        self.prover = FolProver(keep_steps=keep_steps, subsumption=subsumption, stats=stats)
+        self.converter = CNFConverter()
+        for a in axioms:
+            self.tell(a)
+
+    @property
+    def stats(self) -> ResolutionStats:
+        return self.prover.stats
+
+    @property
+    def inconsistent(self) -> bool:
+        """Los axiomas por sí solos ya derivaron `□`."""
+        return self.prover.refuted
+
+    def __len__(self) -> int:
+        """Cláusulas retenidas (axiomas y consecuencias)."""
+        return len(self.prover.clauses) - len(self.prover.deleted)
+
+    def _clauses(self, s: Union[Sentence, Clause]) -> List[Clause]:
+        if isinstance(s, frozenset):
+            return [s]
+        if isinstance(s, str):
+            s = parse_formula(s)
+        return self.converter.first_order(s)
+
+    def tell(self, axiom: Union[Sentence, Clause]) -> None:
+        """Añade un axioma de forma permanente."""
+        for c in self._clauses(axiom):
+            self.prover.add_clause(c)
+
+    def warm_up(self, max_given: Optional[int] = None) -> bool:
+        """
+        Procesa hasta `max_given` cláusulas de los axiomas (todas si es None).
+        Retorna True si la base quedó saturada (no hay pares pendientes).
+        """
+        self.prover.run(max_given)
+        return self.prover.given >= len(self.prover.clauses)
+
+    def ask(self, goal: Union[Sentence, Iterable[Clause]], rollback: bool = True,
+            max_given: Optional[int] = None, budget: Optional[Budget] = None
+            ) -> Tuple[Optional[bool], Dict[Clause, Tuple[Clause, Clause]], List[FolStep]]:
+        """
+        ¿Los axiomas implican `goal`?
+        Retorna: (entails, proof_map, steps)
+
+        - `goal` es texto o fórmula (se niega y se pasa a CNF) o bien una lista
+          (o tupla) de cláusulas que **ya** representan la meta negada.
+        - `entails` es True si se derivó `□`, False si se agotaron los pares y
+          None si se alcanzó `max_given` sin decidir y `UNKNOWN` si se agotó
+          `budget` (ver `motor/budget.py`).
+        - `proof_map` trae solo las derivaciones que llevan a `□` (vacío si no
+          se refutó); `steps` solo los pasos de esta consulta (con `keep_steps`).
+        """
+        prover = self.prover
+        if isinstance(goal, (list, tuple)):
+            negated = list(goal)
+        else:
+            g = parse_formula(goal) if isinstance(goal, str) else goal
+            negated = self.converter.first_order(Not(g))
+        mark = prover.mark()
+        for c in negated:
+            prover.add_clause(c)
+        entails = prover.run(max_given, budget)
+        proof = refutation_proof(prover.proof) if entails else {}
+        steps = prover.steps[mark[2]:]
+        if rollback:
+            prover.rollback(mark)
+        return entails, proof, steps
+
+    def save(self, path: str) -> None:
+        """Guarda el motor (cláusulas, progreso del bucle, estadísticas) y los contadores del clausulado."""
+        conv = self.converter
+        save_prover(self.prover, path, extra={"converter": [conv.def_limit, conv._tseitin, conv._skolem, conv._defs]})
+
+    @classmethod
+    def load(cls, path: str, keep_steps: bool = False) -> "KnowledgeBase":
+        """Base guardada con `save`; los símbolos nuevos (Skolem, definiciones) no chocan con los previos."""
+        kb = cls.__new__(cls)
+        kb.prover, extra = load_state(path, keep_steps=keep_steps)
+        def_limit, tseitin, skolem, defs = extra["converter"]
+        kb.converter = CNFConverter(def_limit)
+        kb.converter._tseitin, kb.converter._skolem, kb.converter._defs = tseitin, skolem, defs
+        return kb
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+motor/ordering.py
+=================
+**Órdenes de reducción** sobre términos (LPO y KBO) y **funciones de selección**
+para la resolución ordenada de `resolve_first_order`.
+
+Resolución ordenada con selección: una inferencia entre C ∨ L y D ∨ ¬L' solo se
+intenta si cada literal pivote es **elegible** en su cláusula:
+- si la cláusula tiene literales negativos **seleccionados**, solo esos;
+- si no, el pivote debe ser **maximal** en la cláusula tras aplicar la MGU
+  (estrictamente maximal si es positivo).
+
+Los literales se comparan por su átomo (el predicado se trata como un símbolo de
+función más); para el mismo átomo, `¬A ≻ A`. Ambos órdenes son estables bajo
+sustitución, así que un literal menor que otro de su cláusula ya antes de
+unificar se descarta sin intentar `unify` (criterio *a priori*).
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple, Union
+
+from motor.unification import Var, Const, Func, Term
+
+Precedence = Union[Dict[str, int], Iterable[str], None]
+
+
+def _symbol(t: Term) -> Tuple[str, int]:
+    return (t.name, 0) if t.__class__ is Const else (t.name, len(t.args))
+
+def _args(t: Term) -> Tuple[Term, ...]:
+    return () if t.__class__ is Const else t.args
+
+def _var_counts(t: Term, out: Dict[Var, int]) -> Dict[Var, int]:
+    stack = [t]
+    while stack:
+        s = stack.pop()
+        if s.__class__ is Var:
+            out[s] = out.get(s, 0) + 1
+        elif s.__class__ is Func and not s.ground:
+            stack.extend(s.args)
+    return out
+
+
+class TermOrdering:
+    """
+    Base común: precedencia entre símbolos y comparación de literales.
+
+    `precedence` puede ser un dict símbolo -> rango (mayor rango = mayor símbolo)
+    o una lista de menor a mayor; los símbolos ausentes se ordenan por
+    (aridad, nombre) por debajo de los listados.
+    """
+
+    def __init__(self, precedence: Precedence = None) -> None:
+        if precedence is None:
+            self._rank: Dict[str, int] = {}
+        elif isinstance(precedence, dict):
+            self._rank = dict(precedence)
+        else:
+            self._rank = {name: i for i, name in enumerate(precedence)}
+
+    def prec_key(self, sym: Tuple[str, int]):
+        name, arity = sym
+        r = self._rank.get(name)
+        return (1, r, 0, "") if r is not None else (0, 0, arity, name)
+
+    def prec_greater(self, f: Tuple[str, int], g: Tuple[str, int]) -> bool:
+        return self.prec_key(f) > self.prec_key(g)
+
+    def greater(self, s: Term, t: Term) -> bool:  # pragma: no cover - abstracto
+        raise NotImplementedError
+
+    # -- literales -------------------------------------------------------------
+
+    def atom_greater(self, a, b) -> bool:
+        """Átomos (`Pred`) comparados como términos con el predicado por cabeza."""
+        return self.greater(Func(a.name, a.args), Func(b.name, b.args))
+
+    def literal_greater(self, l1, l2) -> bool:
+        if l1.pred == l2.pred:
+            return l1.neg and not l2.neg
+        return self.atom_greater(l1.pred, l2.pred)
+
+    def is_maximal(self, l, clause) -> bool:
+        """¿Ningún otro literal de `clause` es mayor que `l`?"""
+        return not any(m != l and self.literal_greater(m, l) for m in clause)
+
+    def is_strictly_maximal(self, l, others) -> bool:
+        """¿Ningún literal de `others` (el resto de la cláusula) es mayor o igual que `l`?"""
+        return not any(m == l or self.literal_greater(m, l) for m in others)
+
+    def is_eligible(self, l, others) -> bool:
+        """Criterio tras la MGU: maximal si `l` es negativo, estrictamente maximal si es positivo."""
+        if l.neg:
+            return not any(self.literal_greater(m, l) for m in others)
+        return self.is_strictly_maximal(l, others)
+
+
+class LPO(TermOrdering):
+    """Orden lexicográfico de caminos (*lexicographic path ordering*)."""
+
+    def greater(self, s: Term, t: Term) -> bool:
+        if s.__class__ is Var:
+            return False
+        if t.__class__ is Var:
+            return t in s.variables
+        if s == t:
+            return False
+        s_args, t_args = _args(s), _args(t)
+        # (1) algún argumento de s es ⪰ t
+        if any(a == t or self.greater(a, t) for a in s_args):
+            return True
+        f, g = _symbol(s), _symbol(t)
+        if f != g:
+            # (2) f ≻ g y s ≻ cada argumento de t
+            return self.prec_greater(f, g) and all(self.greater(s, b) for b in t_args)
+        # (3) mismo símbolo: lexicográfico en los argumentos y s ≻ cada argumento de t
+        for a, b in zip(s_args, t_args):
+            if a != b:
+                return self.greater(a, b) and all(self.greater(s, c) for c in t_args)
+        return False
+
+
+class KBO(TermOrdering):
+    """
+    Orden de Knuth-Bendix: compara primero pesos (suma de pesos de símbolos,
+    `var_weight` por variable), después precedencia y luego argumentos.
+    """
+
+    def __init__(self, precedence: Precedence = None, weights: Optional[Dict[str, int]] = None,
+                 var_weight: int = 1) -> None:
+        super().__init__(precedence)
+        self.weights = weights or {}
+        self.var_weight = var_weight
+
+    def weight(self, t: Term) -> int:
+        if t.__class__ is Var:
+            return self.var_weight
+        return self.weights.get(t.name, 1) + sum(self.weight(a) for a in _args(t))
+
+    def greater(self, s: Term, t: Term) -> bool:
+        if s.__class__ is Var or s == t:
+            return False
+        vs, vt = _var_counts(s, {}), _var_counts(t, {})
+        if any(vs.get(v, 0) < n for v, n in vt.items()):
+            return False
+        ws, wt = self.weight(s), self.weight(t)
+        if ws != wt:
+            return ws > wt
+        if t.__class__ is Var:
+            return True  # mismo peso y x contenida: s = f(...f(x)) con símbolos de peso 0
+        f, g = _symbol(s), _symbol(t)
+        if f != g:
+            return self.prec_greater(f, g)
+        for a, b in zip(_args(s), _args(t)):
+            if a != b:
+                return self.greater(a, b)
+        return False
+
+
+# -----------------------------------------------------------------------------
+# Funciones de selección (solo literales negativos)
+# -----------------------------------------------------------------------------
+
+Selection = Callable[[FrozenSet], FrozenSet]
+
+def no_selection(c: FrozenSet) -> FrozenSet:
+    return frozenset()
+
+def _size(l) -> int:
+    n, stack = 1, list(l.pred.args)
+    while stack:
+        t = stack.pop()
+        n += 1
+        if t.__class__ is Func:
+            stack.extend(t.args)
+    return n
+
+def select_first_negative(c: FrozenSet) -> FrozenSet:
+    """El primer negativo en orden textual (determinista)."""
+    negs = sorted((l for l in c if l.neg), key=str)
+    return frozenset(negs[:1])
+
+def select_heaviest_negative(c: FrozenSet) -> FrozenSet:
+    """El negativo de mayor tamaño: suele ser el más instanciado y el más restrictivo."""
+    negs = [l for l in c if l.neg]
+    if not negs:
+        return frozenset()
+    return frozenset((max(negs, key=lambda l: (_size(l), str(l))),))
+
+def select_negative_if_no_unique_max(c: FrozenSet) -> FrozenSet:
+    """Selecciona un negativo solo si la cláusula tiene más de un positivo (casi-Horn)."""
+    if sum(1 for l in c if not l.neg) <= 1:
+        return frozenset()
+    return select_heaviest_negative(c)
+
+SELECTIONS: Dict[str, Selection] = {
+    "none": no_selection,
+    "first_negative": select_first_negative,
+    "heaviest_negative": select_heaviest_negative,
+    "nonunique_max": select_negative_if_no_unique_max,
+}
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+motor/parallel.py
+=================
+Resolución FOL **en paralelo** sobre un grupo de procesos.
+
+1) `resolve_first_order_parallel`: saturación por **rondas**. Las cláusulas
+   pendientes al empezar una ronda se reparten (por id, en turno rotativo)
+   entre procesos trabajadores; cada trabajador genera los factores y los
+   resolventes binarios de sus cláusulas dadas contra las activas (ids menores)
+   con `FolProver.binary_resolvents`. El proceso principal los **fusiona en
+   orden de id** (cláusula dada, compañera, literales) y los añade con su
+   subsunción y su traza, así que el resultado no depende del número de
+   trabajadores: la misma entrada da la misma prueba.
+   - Cada trabajador conserva su copia de las cláusulas, su índice y su banco
+     de términos; por ronda solo viajan las cláusulas nuevas (id, cláusula) y
+     los ids retirados, serializados **una vez** para todos. Los términos ya
+     internados se comparten dentro del mensaje, así que pickle escribe cada
+     subtérmino común una sola vez.
+   - Con `workers <= 1` las rondas se calculan en el mismo proceso con el
+     mismo código (útil como referencia del paralelo).
+2) `portfolio`: lanza varias configuraciones (`resolve_first_order` con
+   distinto orden, selección o regla) en procesos separados; gana la primera
+   que refuta. Una saturación sin `□` de una estrategia completa también
+   decide (False); UR y los presupuestos agotados no deciden.
+"""
+
+from __future__ import annotations
+import multiprocessing as mp
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from motor.first_order_resolution import Clause, FolProver, FolStep, factors, resolve_first_order
+from motor.ordering import TermOrdering, Selection
+from motor.stats import ResolutionStats
+from motor.budget import UNKNOWN
+from motor.trace import refutation_proof
+
+# -----------------------------------------------------------------------------
+# Trabajadores
+# -----------------------------------------------------------------------------
+
+class _Shard:
+    """Réplica de las cláusulas del proceso principal que calcula inferencias de sus cláusulas dadas."""
+
+    def __init__(self, ordering, selection, subsumption: bool, keep_steps: bool) -> None:
+        self.prover = FolProver(keep_steps=False, subsumption=False, ordering=ordering, selection=selection)
+        self.subsumption = subsumption
+        self.keep_steps = keep_steps
+
+    def sync(self, delta: List[Tuple[int, Optional[Clause]]], gone: List[int]) -> None:
+        p = self.prover
+        for cid, c in delta:
+            if c is None:  # ya retirada en el principal: solo ocupa su id
+                p.clauses.append(None)
+                p.deleted.add(cid)
+                continue
+            c = p.bank.clause(c)
+            p.clauses.append(c)
+            p.index.add(cid, c)
+        for cid in gone:
+            c = p.clauses[cid]
+            if c is not None:
+                p.index.remove(cid, c)
+                p.clauses[cid] = None
+                p.deleted.add(cid)
+
+    def infer(self, givens: Sequence[int]) -> Dict[int, tuple]:
+        """Por cláusula dada: (factores, resolventes, intentos de unificación, éxitos)."""
+        p, stats, keep = self.prover, self.prover.stats, self.keep_steps
+        out: Dict[int, tuple] = {}
+        for j in givens:
+            Cj = p.clauses[j]
+            a0, s0 = stats.unify_attempts, stats.unify_successes
+            facs = []
+            if self.subsumption:
+                facs = sorted(((la, lb, theta if keep else {}, F) for la, lb, theta, F in factors(Cj)),
+                              key=lambda f: (str(f[0]), str(f[1])))
+            res = [(i, li, lj, theta if keep else {}, R) for i, _, li, lj, theta, R in p.binary_resolvents(j, Cj, detail=True)]
+            res.sort(key=lambda r: (r[0], str(r[1]), str(r[2])))
+            out[j] = (facs, res, stats.unify_attempts - a0, stats.unify_successes - s0)
+        return out
+
+
+def _worker_main(conn, ordering, selection, subsumption: bool, keep_steps: bool) -> None:
+    shard = _Shard(ordering, selection, subsumption, keep_steps)
+    while True:
+        payload = conn.recv_bytes()
+        if not payload:
+            break
+        delta, gone = pickle.loads(payload)
+        givens = conn.recv()
+        shard.sync(delta, gone)
+        conn.send(shard.infer(givens))
+    conn.close()
+
+
+class _ShardPool:
+    """`workers` procesos (o una réplica local si `workers <= 1`) con una réplica cada uno."""
+
+    def __init__(self, workers: int, ordering, selection, subsumption: bool, keep_steps: bool) -> None:
+        self.workers = max(1, workers)
+        self.local: Optional[_Shard] = None
+        self.conns = []
+        self.procs = []
+        if self.workers == 1:
+            self.local = _Shard(ordering, selection, subsumption, keep_steps)
+            return
+        ctx = mp.get_context()
+        for _ in range(self.workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker_main, args=(child, ordering, selection, subsumption, keep_steps),
+                               daemon=True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+
+    def round(self, delta, gone, givens: List[int]) -> Dict[int, tuple]:
+        if self.local is not None:
+            self.local.sync(delta, gone)
+            return self.local.infer(givens)
+        payload = pickle.dumps((delta, gone), protocol=pickle.HIGHEST_PROTOCOL)
+        n = self.workers
+        for k, conn in enumerate(self.conns):
+            conn.send_bytes(payload)
+            conn.send(givens[k::n])
+        out: Dict[int, tuple] = {}
+        for conn in self.conns:
+            out.update(conn.recv())
+        return out
+
+    def close(self) -> None:
+        for conn in self.conns:
+            try:
+                conn.send_bytes(b"")
+                conn.close()
+            except OSError:
+                pass
+        for proc in self.procs:
+            proc.join(timeout=1)
+            if proc.is_alive():
+                proc.terminate()
+
+# -----------------------------------------------------------------------------
+# Saturación por rondas
+# -----------------------------------------------------------------------------
+
+def _saturate(prover: FolProver, pool: _ShardPool) -> bool:
+    clauses, deleted, stats = prover.clauses, prover.deleted, prover.stats
+    if prover.refuted:
+        return True
+    synced = 0
+    known_deleted: set = set()
+    while prover.given < len(clauses):
+        start, end = prover.given, len(clauses)
+        prover.iteration += 1
+        prover.round_end = end
+        iteration = prover.iteration
+        givens = [j for j in range(start, end) if j not in deleted]
+        delta = [(cid, clauses[cid]) for cid in range(synced, end)]
+        gone = sorted(d for d in deleted if d < synced and d not in known_deleted)
+        known_deleted = set(deleted)
+        synced = end
+        results = pool.round(delta, gone, givens)
+        prover.given = end
+
+        # Fusión determinista: cláusulas dadas por id y, en cada una, el orden del trabajador
+        for j in givens:
+            if j in deleted:
+                continue
+            Cj = clauses[j]
+            facs, res, attempts, successes = results[j]
+            stats.unify_attempts += attempts
+            stats.unify_successes += successes
+            for la, lb, theta, F in facs:
+                if prover._tracing:
+                    prover._emit(FolStep(iteration, j, j, la, lb, theta, F))
+                if prover.add_clause(F, parents=(Cj, Cj)):
+                    stats.factors += 1
+                    if prover.refuted:
+                        return True
+            for i, li, lj, theta, R in res:
+                if j in deleted:
+                    break  # la cláusula dada fue subsumida por un resolvente suyo
+                if i in deleted:
+                    continue
+                stats.generated += 1
+                if prover._tracing:
+                    prover._emit(FolStep(iteration, i, j, li, lj, theta, R))
+                if prover.add_clause(R, parents=(clauses[i], Cj)) and not R:
+                    return True
+    return False
+
+
+def resolve_first_order_parallel(clauses_init: Iterable[Clause], workers: Optional[int] = None,
+                                 keep_steps: bool = True, subsumption: bool = True,
+                                 stats: Optional[ResolutionStats] = None,
+                                 ordering: Optional[TermOrdering] = None,
+                                 selection: Union[Selection, str, None] = None):
+    """
+    Mismo contrato que `resolve_first_order` (resolución binaria, con orden y
+    selección opcionales): (entails_empty, derived_set, proof_map, steps).
+    `workers` = número de procesos (por defecto `os.cpu_count()`).
+
+    Las rondas siguen el bucle de cláusula dada por niveles, así que la traza
+    puede diferir de la secuencial, pero es idéntica para cualquier `workers`.
+    """
+    prover = FolProver(keep_steps=keep_steps, subsumption=subsumption, stats=stats,
+                       ordering=ordering, selection=selection)
+    t0 = time.perf_counter()
+    for c in clauses_init:
+        prover.add_clause(c)
+    prover.stats.add_time("carga", time.perf_counter() - t0)
+    pool = _ShardPool(workers if workers is not None else (os.cpu_count() or 1),
+                      ordering, selection, subsumption, keep_steps)
+    t0 = time.perf_counter()
+    try:
+        entails = _saturate(prover, pool)
+    finally:
+        pool.close()
+        prover.stats.add_time("búsqueda", time.perf_counter() - t0)
+    return entails, prover.retained(), prover.proof, prover.steps
+
+# -----------------------------------------------------------------------------
+# Portafolio de estrategias
+# -----------------------------------------------------------------------------
+
+DEFAULT_PORTFOLIO: List[Tuple[str, Dict[str, Any]]] = [
+    ("binaria", {}),
+    ("KBO + selección", {"selection": "heaviest_negative"}),  # el orden KBO se añade al lanzar
+    ("hiper", {"inference": "hyper"}),
+    ("UR", {"inference": "ur"}),
+]
+
+@dataclass
+class PortfolioResult:
+    entails: Any                   # True, False o UNKNOWN
+    winner: Optional[str]          # estrategia que decidió
+    proof: Dict[Clause, Tuple[Clause, Clause]]  # refutación mínima del ganador (si refutó)
+    elapsed: float                 # segundos hasta decidir
+    finished: Dict[str, Any] = field(default_factory=dict)  # resultado de cada estrategia que terminó
+
+
+def _decisive(entails, kwargs: Dict[str, Any]) -> bool:
+    if entails is True:
+        return True
+    return entails is False and kwargs.get("inference", "binary") != "ur"
+
+
+def _portfolio_main(conn, name: str, clauses: List[Clause], kwargs: Dict[str, Any]) -> None:
+    entails, _, proof, _ = resolve_first_order(clauses, keep_steps=False, **kwargs)
+    conn.send((name, entails, refutation_proof(proof) if entails is True else {}))
+    conn.close()
+
+
+def portfolio(clauses_init: Iterable[Clause],
+              strategies: Optional[Sequence[Tuple[str, Dict[str, Any]]]] = None,
+              timeout: Optional[float] = None) -> PortfolioResult:
+    """
+    Corre cada estrategia `(nombre, kwargs de resolve_first_order)` en su
+    propio proceso; la primera que decide gana y las demás se terminan.
+    Sin decisión antes de `timeout` (segundos) el resultado es `UNKNOWN`.
+    """
+    if strategies is None:
+        from motor.ordering import KBO
+        strategies = [(n, dict(kw, ordering=KBO()) if n.startswith("KBO") else kw) for n, kw in DEFAULT_PORTFOLIO]
+    clauses = list(clauses_init)
+    ctx = mp.get_context()
+    t0 = time.perf_counter()
+    running: Dict[Any, Tuple[Any, str, Dict[str, Any]]] = {}
+    for name, kwargs in strategies:
+        parent, child = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_portfolio_main, args=(child, name, clauses, kwargs), daemon=True)
+        proc.start()
+        child.close()
+        running[parent] = (proc, name, kwargs)
+    result = PortfolioResult(UNKNOWN, None, {}, 0.0)
+    try:
+        while running:
+            left = None if timeout is None else timeout - (time.perf_counter() - t0)
+            if left is not None and left <= 0:
+                break
+            ready = wait(list(running), timeout=left)
+            for conn in ready:
+                proc, name, kwargs = running.pop(conn)
+                try:
+                    _, entails, proof = conn.recv()
+                except EOFError:  # el proceso murió sin responder
+                    continue
+                result.finished[name] = entails
+                if _decisive(entails, kwargs):
+                    result.entails, result.winner, result.proof = entails, name, proof
+                    return result
+    finally:
+        for conn, (proc, _, _) in running.items():
+            proc.terminate()
+            conn.close()
+        result.elapsed = time.perf_counter() - t0
+    return result
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+motor/preprocessing.py
+======================
+**Preprocesamiento** de KBs proposicionales en CNF, antes de cualquier motor
+(`resolve_propositional` o `resolve_propositional_cdcl`).
+
+Técnicas, aplicadas hasta punto fijo:
+1. **Propagación unitaria**: un literal unitario `l` satisface y elimina las
+   cláusulas que lo contienen y borra `¬l` del resto (resolución con la unidad).
+2. **Literales puros**: si `l` aparece y `¬l` no, se eliminan sus cláusulas.
+3. **Subsunción** (C ⊆ D ⇒ se elimina D) y **resolución auto-subsumiente**
+   (C = C' ∨ l, D ⊇ C' ∨ ¬l ⇒ D pierde `¬l`).
+4. **Eliminación acotada de variables** (BVE): se reemplazan las cláusulas con
+   `v`/`¬v` por sus resolventes si no son más que las originales.
+
+Las técnicas que **derivan** cláusulas (1, 3b, 4) son pasos de resolución y se
+registran en `proof`, de modo que una refutación del motor sobre la KB
+simplificada se extiende a una refutación desde las cláusulas originales.
+Las que **eliminan** cláusulas (2, 4) preservan satisfacibilidad y se apilan
+para reconstruir un modelo de la KB original con `extend_model`.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from motor.prop_compiled import PropCompiler, iter_literals
+from motor.propositional_resolution import Clause, PropStep, resolve_propositional
+
+Lits = FrozenSet[int]
+
+
+@dataclass
+class PreprocessStats:
+    clauses_before: int = 0
+    clauses_after: int = 0
+    vars_before: int = 0
+    vars_after: int = 0
+    units: int = 0              # variables fijadas por propagación unitaria
+    pure: int = 0               # literales puros
+    subsumed: int = 0           # cláusulas subsumidas eliminadas
+    strengthened: int = 0       # cláusulas acortadas por resolución auto-subsumiente
+    eliminated_vars: int = 0    # variables eliminadas por BVE
+
+    @property
+    def removed_clauses(self) -> int:
+        return self.clauses_before - self.clauses_after
+
+    @property
+    def removed_vars(self) -> int:
+        return self.vars_before - self.vars_after
+
+    def __str__(self) -> str:
+        return (f"cláusulas {self.clauses_before}→{self.clauses_after} "
+                f"variables {self.vars_before}→{self.vars_after} "
+                f"(unidades={self.units} puros={self.pure} subsumidas={self.subsumed} "
+                f"fortalecidas={self.strengthened} eliminadas(BVE)={self.eliminated_vars})")
+
+
+@dataclass
+class Preprocessed:
+    """Resultado del preprocesamiento."""
+    clauses: List[Clause]                       # KB simplificada (texto)
+    unsat: bool                                  # se derivó □ durante el preprocesamiento
+    stats: PreprocessStats
+    proof: Dict[Clause, Tuple[Clause, Clause]]   # cláusula derivada -> padres
+    steps: List[PropStep]                        # pasos de resolución realizados (iteración 0)
+    _compiler: PropCompiler = field(repr=False, default_factory=PropCompiler)
+    _stack: List[Tuple[str, object]] = field(repr=False, default_factory=list)
+
+    def extend_model(self, model: Dict[str, bool]) -> Dict[str, bool]:
+        """
+        Extiende un modelo de la KB simplificada a un modelo de la original.
+        Las variables no mencionadas se toman como falsas.
+        """
+        comp = self._compiler
+        values = {v: model.get(comp.var_name(v), False) for v in range(comp.num_vars)}
+
+        def true(l: int) -> bool:
+            return values[l >> 1] == (not l & 1)
+
+        for kind, data in reversed(self._stack):
+            if kind == "lit":                      # unidad o literal puro
+                l = data
+                values[l >> 1] = not l & 1
+            else:                                   # variable eliminada
+                v, pos = data
+                # v verdadera solo si alguna cláusula con v no queda satisfecha sin ella
+                values[v] = any(not any(true(l) for l in c if l >> 1 != v) for c in pos)
+        return {comp.var_name(v): val for v, val in values.items()}
+
+
+def preprocess(clauses_init: Iterable[Clause], bve: bool = True, bve_max_len: int = 16,
+               bve_max_pairs: int = 400) -> Preprocessed:
+    """Simplifica la KB. `bve=False` desactiva la eliminación de variables."""
+    comp = PropCompiler()
+    contents: List[Lits] = []                 # todas las cláusulas vistas (por id)
+    live: Dict[int, Lits] = {}                # cláusulas vigentes
+    by_content: Dict[Lits, int] = {}
+    occ: Dict[int, Set[int]] = {}
+    derived: Dict[int, Tuple[int, int, int]] = {}   # id -> (izq, der, pivote en izq)
+    stack: List[Tuple[str, object]] = []
+    stats = PreprocessStats()
+    empty: List[int] = []
+
+    def add(lits: Lits, parents: Optional[Tuple[int, int, int]] = None) -> int:
+        if any((l ^ 1) in lits for l in lits if not l & 1):
+            return -1  # tautología
+        cid = by_content.get(lits)
+        if cid is not None and cid in live:
+            return cid
+        cid = len(contents)
+        contents.append(lits)
+        live[cid] = lits
+        by_content[lits] = cid
+        for l in lits:
+            occ.setdefault(l, set()).add(cid)
+        if parents is not None:
+            derived[cid] = parents
+        if not lits:
+            empty.append(cid)
+        return cid
+
+    def remove(cid: int) -> None:
+        lits = live.pop(cid)
+        for l in lits:
+            occ[l].discard(cid)
+
+    def resolve(a: int, b: int, pivot: int) -> int:
+        return add((contents[a] - {pivot}) | (contents[b] - {pivot ^ 1}), (a, b, pivot))
+
+    for c in clauses_init:
+        add(frozenset(iter_literals(comp.clause(c))))
+    stats.clauses_before = len(live)
+    stats.vars_before = len({l >> 1 for c in live.values() for l in c})
+
+    def unit_propagate() -> bool:
+        queue = [cid for cid, c in live.items() if len(c) == 1]
+        changed = False
+        while queue and not empty:
+            cid = queue.pop()
+            if cid not in live or len(live[cid]) != 1:
+                continue
+            (l,) = live[cid]
+            changed = True
+            stats.units += 1
+            stack.append(("lit", l))
+            for d in list(occ.get(l, ())):
+                remove(d)                       # satisfecha (incluye la propia unidad)
+            for d in list(occ.get(l ^ 1, ())):
+                remove(d)
+                nid = resolve(d, cid, l ^ 1)
+                if nid >= 0 and len(contents[nid]) <= 1 and nid in live:
+                    queue.append(nid)
+        return changed
+
+    def pure_literals() -> bool:
+        changed = False
+        for l in list(occ):
+            if occ.get(l) and not occ.get(l ^ 1):
+                stats.pure += 1
+                stack.append(("lit", l))
+                for d in list(occ[l]):
+                    remove(d)
+                changed = True
+        return changed
+
+    def subsumption() -> bool:
+        changed = False
+        for cid in sorted(live, key=lambda k: len(live[k])):
+            if cid not in live:
+                continue
+            c = live[cid]
+            if not c:
+                continue
+            # Subsunción: candidatos en la lista de ocurrencias más corta
+            pivot = min(c, key=lambda l: len(occ.get(l, ())))
+            for d in list(occ.get(pivot, ())):
+                if d != cid and d in live and len(live[d]) >= len(c) and c <= live[d]:
+                    remove(d)
+                    stats.subsumed += 1
+                    changed = True
+            # Resolución auto-subsumiente: C = C' ∨ l, D ⊇ C' ∨ ¬l  ⇒  D := D - {¬l}
+            for l in c:
+                rest = c - {l}
+                for d in list(occ.get(l ^ 1, ())):
+                    if d in live and rest <= live[d]:
+                        remove(d)
+                        resolve(d, cid, l ^ 1)
+                        stats.strengthened += 1
+                        changed = True
+            if empty:
+                break
+        return changed
+
+    def eliminate() -> bool:
+        changed = False
+        vars_ = sorted({l >> 1 for c in live.values() for l in c},
+                       key=lambda v: len(occ.get(2 * v, ())) + len(occ.get(2 * v + 1, ())))
+        for v in vars_:
+            pos = [d for d in occ.get(2 * v, ()) if d in live]
+            neg = [d for d in occ.get(2 * v + 1, ()) if d in live]
+            if not pos or not neg or len(pos) * len(neg) > bve_max_pairs:
+                continue
+            resolvents = []
+            for p in pos:
+                for n in neg:
+                    r = (live[p] - {2 * v}) | (live[n] - {2 * v + 1})
+                    if any((q ^ 1) in r for q in r if not q & 1):
+                        continue
+                    resolvents.append((p, n, r))
+            if len(resolvents) > len(pos) + len(neg) or any(len(r) > bve_max_len for *_, r in resolvents):
+                continue
+            stack.append(("elim", (v, [contents[p] for p in pos])))
+            for d in pos + neg:
+                remove(d)
+            for p, n, _ in resolvents:
+                resolve(p, n, 2 * v)
+            stats.eliminated_vars += 1
+            changed = True
+            if empty:
+                break
+        return changed
+
+    while not empty:
+        changed = unit_propagate()
+        if empty:
+            break
+        changed |= pure_literals()
+        changed |= subsumption()
+        if bve and not empty:
+            changed |= eliminate()
+        if not changed:
+            break
+
+    # Salida en texto
+    def text(lits: Lits) -> Clause:
+        return frozenset(comp.literal_text(l) for l in lits)
+
+    proof: Dict[Clause, Tuple[Clause, Clause]] = {}
+    steps: List[PropStep] = []
+    for cid, (a, b, pivot) in derived.items():
+        proof.setdefault(text(contents[cid]), (text(contents[a]), text(contents[b])))
+        steps.append(PropStep(0, a, b, comp.literal_text(pivot), comp.literal_text(pivot ^ 1),
+                              text(contents[cid])))
+
+    unsat = bool(empty)
+    remaining = [frozenset()] if unsat else [text(c) for c in live.values()]
+    stats.clauses_after = len(remaining)
+    stats.vars_after = len({l >> 1 for c in live.values() for l in c}) if not unsat else 0
+    return Preprocessed(remaining, unsat, stats, proof, steps, comp, stack)
+
+
+def resolve_with_preprocessing(clauses_init: Iterable[Clause], engine: Callable = resolve_propositional,
+                               keep_steps: bool = True, bve: bool = True):
+    """
+    Preprocesa y luego ejecuta `engine` (`resolve_propositional` o
+    `resolve_propositional_cdcl`) sobre la KB simplificada.
+    Retorna: (entails_empty, derived_set, proof_map, steps, stats)
+
+    `proof_map` combina las derivaciones del preprocesamiento con las del motor,
+    así la cadena de padres de `□` llega hasta las cláusulas originales.
+    `steps` lista primero los pasos del preprocesamiento (iteración 0, ids
+    propios) y luego los del motor (ids sobre la KB simplificada).
+    """
+    pre = preprocess(clauses_init, bve=bve)
+    if pre.unsat:
+        return True, set(pre.clauses), dict(pre.proof), list(pre.steps) if keep_steps else [], pre.stats
+    entails, derived, proof, steps = engine(pre.clauses, keep_steps=keep_steps)
+    merged = dict(pre.proof)
+    merged.update(proof)
+    return entails, derived, merged, (pre.steps + steps) if keep_steps else steps, pre.stats
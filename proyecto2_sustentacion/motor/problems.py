@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+"""
+motor/problems.py
+=================
+**Carga de problemas** desde archivos para alimentar los motores con cargas
+realistas:
+
+- **TPTP** (`.p`, `.ax`, `.tptp`): sentencias `cnf(...)` y `fof(...)` e
+  `include('...')`. Las variables son los nombres en mayúscula; `=`/`!=` se
+  leen como el predicado `=` y, si aparece, se añaden los **axiomas de
+  igualdad** (reflexividad, simetría, transitividad y congruencia por cada
+  función y predicado), porque los motores no tienen paramodulación. Las
+  `fof` pasan por `CNFConverter`; la `conjecture` se **niega**. El estado
+  esperado se toma de la cabecera `% Status : ...`.
+- **DIMACS CNF** (`.cnf`, `.dimacs`): la variable `n` se llama `x<n>`. Un
+  comentario `c SZS status <estado>` (si existe) fija el resultado esperado.
+
+`Problem.clauses` queda en la forma nativa (texto para problemas
+proposicionales, `Literal` para primer orden); `propositional()` y
+`first_order()` convierten entre ambas para usar cualquiera de los motores.
+"""
+
+from __future__ import annotations
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from motor.unification import Var, Const, Func, Term
+from motor.formula import Formula, Atom, Not, And, Or, Implies, Iff, Forall, Exists, conj, disj, is_first_order
+from motor.cnf import CNFConverter, AnyClause
+from motor.first_order_resolution import Pred, Literal, Clause as FolClause, is_tautology
+from motor.propositional_resolution import Clause as PropClause, neg
+
+TPTP_SUFFIXES = (".p", ".ax", ".tptp")
+DIMACS_SUFFIXES = (".cnf", ".dimacs")
+
+# Estados SZS que deciden la refutación de la KB cargada
+_UNSAT = {"Unsatisfiable", "Theorem", "ContradictoryAxioms"}
+_SAT = {"Satisfiable", "CounterSatisfiable"}
+
+EQUALITY = "="
+_TRUE = "$true"
+
+
+@dataclass
+class Problem:
+    """Problema cargado: nombre, origen, cláusulas y estado SZS esperado (si se conoce)."""
+    name: str
+    path: str
+    format: str                              # "tptp" | "dimacs"
+    clauses: List[AnyClause]
+    status: Optional[str] = None
+    equality: bool = False                   # se añadieron axiomas de igualdad
+
+    @property
+    def kind(self) -> str:
+        """'prop' si las cláusulas están en texto (proposicional), 'fol' si no."""
+        return "prop" if all(isinstance(l, str) for c in self.clauses for l in c) else "fol"
+
+    @property
+    def expected(self) -> Optional[bool]:
+        """True si la KB debe refutarse (`□`), False si es satisfacible, None si se desconoce."""
+        if self.status in _UNSAT:
+            return True
+        if self.status in _SAT:
+            return False
+        return None
+
+    def propositional(self) -> List[PropClause]:
+        """Cláusulas para `resolve_propositional`; ValueError si hay argumentos o variables."""
+        return [frozenset(_prop_literal(l) for l in c) for c in self.clauses]
+
+    def first_order(self) -> List[FolClause]:
+        """Cláusulas para `resolve_first_order` (los átomos proposicionales quedan sin argumentos)."""
+        return [frozenset(_fol_literal(l) for l in c) for c in self.clauses]
+
+
+def _fol_literal(l: Union[str, Literal]) -> Literal:
+    if isinstance(l, Literal):
+        return l
+    return Literal(Pred(l[1:], ()), True) if l.startswith("~") else Literal(Pred(l, ()))
+
+
+def _prop_literal(l: Union[str, Literal]) -> str:
+    if isinstance(l, str):
+        return l
+    if l.pred.args:
+        raise ValueError(f"literal de primer orden en un problema proposicional: {l}")
+    return neg(l.pred.name) if l.neg else l.pred.name
+
+# -----------------------------------------------------------------------------
+# DIMACS
+# -----------------------------------------------------------------------------
+
+def parse_dimacs(text: str) -> Tuple[List[PropClause], Optional[str]]:
+    """Texto DIMACS CNF -> (cláusulas, estado SZS del comentario o None)."""
+    clauses: List[PropClause] = []
+    status: Optional[str] = None
+    current: List[str] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("p"):
+            continue
+        if line.startswith("c"):
+            m = re.search(r"SZS status\s+(\w+)", line)
+            if m:
+                status = m.group(1)
+            continue
+        if line.startswith("%"):
+            break  # fin de archivo al estilo SATLIB
+        for tok in line.split():
+            n = int(tok)
+            if n == 0:
+                c = frozenset(current)
+                if not any(neg(l) in c for l in c):
+                    clauses.append(c)
+                current = []
+            else:
+                current.append(f"x{n}" if n > 0 else f"~x{-n}")
+    if current:
+        clauses.append(frozenset(current))
+    return clauses, status
+
+# -----------------------------------------------------------------------------
+# TPTP: tokens y parser
+# -----------------------------------------------------------------------------
+
+_TPTP_TOKEN = re.compile(r"""
+    (?P<space>\s+|%[^\n]*|/\*.*?\*/)
+  | (?P<op><=>|<~>|=>|<=|~\||~&|!=|[()\[\],.:!?~|&=])
+  | (?P<quoted>'(?:[^'\\]|\\.)*')
+  | (?P<distinct>"(?:[^"\\]|\\.)*")
+  | (?P<word>\$?\$?[A-Za-z0-9_]+)
+""", re.VERBOSE | re.DOTALL)
+
+
+def _tptp_tokens(text: str) -> List[str]:
+    tokens: List[str] = []
+    pos = 0
+    while pos < len(text):
+        m = _TPTP_TOKEN.match(text, pos)
+        if not m:
+            raise SyntaxError(f"símbolo TPTP inesperado en la posición {pos}: {text[pos:pos + 20]!r}")
+        pos = m.end()
+        if m.lastgroup != "space":
+            tok = m.group(m.lastgroup)
+            if m.lastgroup == "quoted":
+                tok = tok[1:-1]
+            tokens.append(tok)
+    return tokens
+
+
+def _is_variable(name: str) -> bool:
+    return name[:1].isupper()
+
+
+class _TptpParser:
+    """Descenso recursivo sobre la sintaxis FOF/CNF de TPTP; produce fórmulas de `motor/formula.py`."""
+
+    def __init__(self, tokens: List[str]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+        self.equality = False
+        self.truth = False  # se usó $true/$false
+
+    def peek(self, k: int = 0) -> str:
+        i = self.pos + k
+        return self.tokens[i] if i < len(self.tokens) else ""
+
+    def take(self, expected: str = "") -> str:
+        tok = self.peek()
+        if not tok or (expected and tok != expected):
+            raise SyntaxError(f"TPTP: se esperaba {expected or 'un símbolo'!r} y se encontró {tok or 'el final'!r}")
+        self.pos += 1
+        return tok
+
+    def skip_balanced(self) -> None:
+        """Salta un término general (anotaciones de fuente / información útil)."""
+        depth = 0
+        while True:
+            tok = self.take()
+            if tok in "([":
+                depth += 1
+            elif tok in ")]":
+                depth -= 1
+            if depth == 0 and self.peek() in (",", ")"):
+                return
+
+    # -- sentencias ------------------------------------------------------------
+
+    def statements(self) -> Iterator[Tuple[str, str, str, object]]:
+        """(lenguaje, nombre, rol, fórmula | lista de includes) por sentencia."""
+        while self.peek():
+            lang = self.take()
+            self.take("(")
+            if lang == "include":
+                path = self.take()
+                names: Optional[List[str]] = None
+                if self.peek() == ",":
+                    self.take(",")
+                    self.take("[")
+                    names = []
+                    while self.peek() != "]":
+                        names.append(self.take())
+                        if self.peek() == ",":
+                            self.take()
+                    self.take("]")
+                self.take(")")
+                self.take(".")
+                yield lang, path, "include", names
+                continue
+            if lang not in ("cnf", "fof"):
+                raise ValueError(f"TPTP: lenguaje no soportado {lang!r} (solo cnf y fof)")
+            name = self.take()
+            self.take(",")
+            role = self.take()
+            self.take(",")
+            f = self.formula()
+            while self.peek() == ",":
+                self.take()
+                self.skip_balanced()
+            self.take(")")
+            self.take(".")
+            yield lang, name, role, f
+
+    # -- fórmulas --------------------------------------------------------------
+
+    def formula(self) -> Formula:
+        # Más permisivo que la gramática TPTP: `a => b | c` se lee `a => (b | c)`
+        left = self.associative()
+        op = self.peek()
+        if op in ("=>", "<=", "<=>", "<~>", "~|", "~&"):
+            self.take()
+            right = self.associative()
+            if op == "=>": return Implies(left, right)
+            if op == "<=": return Implies(right, left)
+            if op == "<=>": return Iff(left, right)
+            if op == "<~>": return Not(Iff(left, right))
+            if op == "~|": return Not(disj(left, right))
+            return Not(conj(left, right))
+        return left
+
+    def associative(self) -> Formula:
+        left = self.unitary()
+        op = self.peek()
+        if op not in ("|", "&"):
+            return left
+        fs = [left]
+        while self.peek() == op:
+            self.take()
+            fs.append(self.unitary())
+        return disj(*fs) if op == "|" else conj(*fs)
+
+    def unitary(self) -> Formula:
+        tok = self.peek()
+        if tok == "~":
+            self.take()
+            return Not(self.unitary())
+        if tok in ("!", "?"):
+            self.take()
+            self.take("[")
+            names = [self.take()]
+            while self.peek() == ",":
+                self.take()
+                names.append(self.take())
+            self.take("]")
+            self.take(":")
+            body = self.unitary()
+            q = Forall if tok == "!" else Exists
+            for name in reversed(names):
+                body = q(Var(name), body)
+            return body
+        if tok == "(":
+            self.take()
+            f = self.formula()
+            self.take(")")
+            return f
+        return self.atom()
+
+    def atom(self) -> Formula:
+        if self.peek() in ("$true", "$false"):
+            self.truth = True
+            a = Atom(_TRUE)
+            return a if self.take() == "$true" else Not(a)
+        left = self.term()
+        if self.peek() in ("=", "!="):
+            op = self.take()
+            self.equality = True
+            a = Atom(EQUALITY, (left, self.term()))
+            return a if op == "=" else Not(a)
+        if isinstance(left, Var):
+            raise SyntaxError(f"TPTP: variable {left} usada como átomo")
+        return Atom(left.name, left.args if isinstance(left, Func) else ())
+
+    def term(self) -> Term:
+        name = self.take()
+        if self.peek() == "(":
+            self.take()
+            args = [self.term()]
+            while self.peek() == ",":
+                self.take()
+                args.append(self.term())
+            self.take(")")
+            return Func(name, tuple(args))
+        return Var(name) if _is_variable(name) else Const(name)
+
+# -----------------------------------------------------------------------------
+# Igualdad
+# -----------------------------------------------------------------------------
+
+def _symbols(clauses: Sequence[FolClause]) -> Tuple[Set[Tuple[str, int]], Set[Tuple[str, int]]]:
+    """(funciones, predicados) con su aridad (> 0), sin contar `=`."""
+    funcs: Set[Tuple[str, int]] = set()
+    preds: Set[Tuple[str, int]] = set()
+    stack: List[Term] = []
+    for c in clauses:
+        for l in c:
+            if l.pred.name != EQUALITY and l.pred.args:
+                preds.add((l.pred.name, len(l.pred.args)))
+            stack.extend(l.pred.args)
+    while stack:
+        t = stack.pop()
+        if isinstance(t, Func):
+            funcs.add((t.name, len(t.args)))
+            stack.extend(t.args)
+    return funcs, preds
+
+
+def equality_axioms(clauses: Sequence[FolClause]) -> List[FolClause]:
+    """Reflexividad, simetría, transitividad y congruencia de `=` para los símbolos de `clauses`."""
+    X, Y, Z = Var("X"), Var("Y"), Var("Z")
+    def eq(a: Term, b: Term, negated: bool = False) -> Literal:
+        return Literal(Pred(EQUALITY, (a, b)), negated)
+    out: List[FolClause] = [
+        frozenset({eq(X, X)}),
+        frozenset({eq(X, Y, True), eq(Y, X)}),
+        frozenset({eq(X, Y, True), eq(Y, Z, True), eq(X, Z)}),
+    ]
+    funcs, preds = _symbols(clauses)
+    for name, n in sorted(funcs):
+        args = [Var(f"A{k}") for k in range(n)]
+        for k in range(n):
+            lhs, rhs = list(args), list(args)
+            lhs[k], rhs[k] = X, Y
+            out.append(frozenset({eq(X, Y, True), eq(Func(name, tuple(lhs)), Func(name, tuple(rhs)))}))
+    for name, n in sorted(preds):
+        args = [Var(f"A{k}") for k in range(n)]
+        for k in range(n):
+            lhs, rhs = list(args), list(args)
+            lhs[k], rhs[k] = X, Y
+            out.append(frozenset({eq(X, Y, True), Literal(Pred(name, tuple(lhs)), True),
+                                  Literal(Pred(name, tuple(rhs)))}))
+    return out
+
+# -----------------------------------------------------------------------------
+# Carga
+# -----------------------------------------------------------------------------
+
+def _clause_literals(f: Formula) -> List[Formula]:
+    """Literales de una fórmula `cnf(...)` (disyunción de átomos con o sin `~`)."""
+    if isinstance(f, Or):
+        return [l for a in f.args for l in _clause_literals(a)]
+    if isinstance(f, Forall):  # `![X]: (...)` en cnf es redundante pero válido
+        return _clause_literals(f.body)
+    if isinstance(f, Atom) or (isinstance(f, Not) and isinstance(f.arg, Atom)):
+        return [f]
+    raise SyntaxError(f"TPTP: cnf con algo que no es una disyunción de literales: {f}")
+
+
+def _read_tptp(path: str, root: Optional[str], only: Optional[List[str]],
+               out: List[Tuple[str, str, Formula]], parser_flags: Dict[str, bool],
+               visiting: Set[str]) -> Optional[str]:
+    """Agrega (lenguaje, rol, fórmula) de `path` y sus includes a `out`; retorna el estado SZS."""
+    real = os.path.realpath(path)
+    if real in visiting:
+        raise ValueError(f"TPTP: include cíclico de {path}")
+    visiting.add(real)
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    m = re.search(r"^%\s*Status\s*:\s*(\w+)", text, re.MULTILINE)
+    parser = _TptpParser(_tptp_tokens(text))
+    for lang, name, role, f in parser.statements():
+        if role == "include":
+            base = root or os.environ.get("TPTP") or os.path.dirname(path)
+            target = name if os.path.isabs(name) else os.path.join(base, name)
+            _read_tptp(target, root, f, out, parser_flags, visiting)
+        elif only is None or name in only:
+            out.append((lang, role, f))
+    parser_flags["equality"] |= parser.equality
+    parser_flags["truth"] |= parser.truth
+    visiting.discard(real)
+    return m.group(1) if m else None
+
+
+def load_tptp(path: str, root: Optional[str] = None) -> Problem:
+    """
+    Archivo TPTP (CNF/FOF) -> `Problem`. Los `include` se buscan en `root`,
+    luego en `$TPTP` y por último junto al archivo.
+    """
+    statements: List[Tuple[str, str, Formula]] = []
+    flags = {"equality": False, "truth": False}
+    status = _read_tptp(path, root, None, statements, flags, set())
+
+    propositional = not flags["equality"] and not any(is_first_order(f) for _, _, f in statements)
+    conv = CNFConverter()
+    clauses: List[AnyClause] = []
+    goals: List[Formula] = []
+    for lang, role, f in statements:
+        if lang == "cnf":
+            lits = _clause_literals(f)
+            if propositional:
+                c = frozenset(l.name if isinstance(l, Atom) else neg(l.arg.name) for l in lits)
+                if any(neg(x) in c for x in c):
+                    continue
+            else:
+                c = frozenset(Literal(Pred(l.name, l.args)) if isinstance(l, Atom)
+                              else Literal(Pred(l.arg.name, l.arg.args), True) for l in lits)
+                if is_tautology(c):
+                    continue
+            clauses.append(c)
+        elif role == "conjecture":
+            goals.append(f)
+        else:
+            clauses.extend(conv.propositional(f) if propositional else conv.first_order(f))
+    if goals:
+        g = Not(conj(*goals))
+        clauses.extend(conv.propositional(g) if propositional else conv.first_order(g))
+    if flags["truth"]:
+        clauses.append(frozenset({_TRUE}) if propositional else frozenset({Literal(Pred(_TRUE, ()))}))
+    if flags["equality"]:
+        clauses.extend(equality_axioms(clauses))
+    name = os.path.splitext(os.path.basename(path))[0]
+    return Problem(name, path, "tptp", clauses, status, flags["equality"])
+
+
+def load_dimacs(path: str) -> Problem:
+    """Archivo DIMACS CNF -> `Problem` proposicional."""
+    with open(path, encoding="utf-8") as fh:
+        clauses, status = parse_dimacs(fh.read())
+    name = os.path.splitext(os.path.basename(path))[0]
+    return Problem(name, path, "dimacs", clauses, status)
+
+
+def load_problem(path: str, root: Optional[str] = None) -> Problem:
+    """Elige el lector por la extensión del archivo."""
+    low = path.lower()
+    if low.endswith(DIMACS_SUFFIXES):
+        return load_dimacs(path)
+    if low.endswith(TPTP_SUFFIXES):
+        return load_tptp(path, root)
+    raise ValueError(f"extensión de problema desconocida: {path}")
+
+
+def load_directory(directory: str, root: Optional[str] = None) -> List[Problem]:
+    """Todos los problemas (TPTP y DIMACS) de `directory`, ordenados por nombre de archivo."""
+    out: List[Problem] = []
+    for entry in sorted(os.listdir(directory)):
+        if entry.lower().endswith(TPTP_SUFFIXES + DIMACS_SUFFIXES) and not entry.lower().endswith(".ax"):
+            out.append(load_problem(os.path.join(directory, entry), root))
+    return out
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+motor/prop_compiled.py
+======================
+Representación **compilada** de cláusulas proposicionales.
+
+- Cada variable recibe un id entero `v` (en orden de aparición).
+- Literal positivo `A` -> `2v`; literal negativo `~A` -> `2v+1`.
+  El complemento de un literal es `lit ^ 1`.
+- Una cláusula es un **bitset** en un `int` de Python: el bit `lit` está
+  encendido si la cláusula contiene ese literal.
+
+Con esta forma las operaciones del motor son unas pocas operaciones de bits:
+- resolvente:   `(Ci & ~(1 << l)) | (Cj & ~(1 << (l ^ 1)))`
+- tautología:   `bits & (bits >> 1) & PARES` distinto de 0
+- duplicados:   comparación/hash de enteros.
+
+`PropCompiler` traduce desde y hacia la forma en texto (`frozenset` de
+literales como `"A"`/`"~A"`), de modo que los llamadores no notan el cambio.
+"""
+
+from __future__ import annotations
+from typing import Dict, FrozenSet, Iterable, Iterator, List
+
+Bits = int
+
+
+def iter_literals(bits: Bits) -> Iterator[int]:
+    """Literales (posiciones de bits encendidos) en orden ascendente."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class PropCompiler:
+    """Tabla de símbolos variable <-> id y conversión texto <-> bitset."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._even = 0  # máscara con los bits de literales positivos (0, 2, 4, ...)
+
+    @property
+    def num_vars(self) -> int:
+        return len(self._names)
+
+    def var_id(self, name: str) -> int:
+        v = self._ids.get(name)
+        if v is None:
+            v = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._even = (4 ** len(self._names) - 1) // 3
+        return v
+
+    def var_name(self, v: int) -> str:
+        return self._names[v]
+
+    # -- literales -------------------------------------------------------------
+
+    def literal(self, text: str) -> int:
+        """`"A"` -> 2v, `"~A"` -> 2v+1."""
+        if text.startswith("~"):
+            return 2 * self.var_id(text[1:]) + 1
+        return 2 * self.var_id(text)
+
+    def literal_text(self, lit: int) -> str:
+        name = self._names[lit >> 1]
+        return "~" + name if lit & 1 else name
+
+    # -- cláusulas -------------------------------------------------------------
+
+    def clause(self, lits: Iterable[str]) -> Bits:
+        bits = 0
+        for l in lits:
+            bits |= 1 << self.literal(str(l))
+        return bits
+
+    def clause_list(self, raw: Iterable[Iterable[str]]) -> List[Bits]:
+        """Equivalente compilado de `parse_clause_list`."""
+        return [self.clause(c) for c in raw]
+
+    def clause_text(self, bits: Bits) -> FrozenSet[str]:
+        return frozenset(self.literal_text(l) for l in iter_literals(bits))
+
+    def is_tautology(self, bits: Bits) -> bool:
+        """¿Contiene algún par 2v / 2v+1?"""
+        return bool(bits & (bits >> 1) & self._even)
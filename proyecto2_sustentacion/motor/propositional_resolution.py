@@ -12,12 +12,19 @@ Cumple el algoritmo solicitado por la práctica:
    - Generar resolventes y añadir si son nuevos.
 4) Si se deriva `□` ⇒ la sentencia original es **verdadera**.
 5) Si no hay más resoluciones ⇒ **falsa**.
-6) Evita re-uso de pares y duplicados de cláusulas.
+6) Evita re-uso de pares y duplicados de cláusulas: cada cláusula se procesa una
+   vez contra las activas que contienen un literal complementario (índice de literales).
 """
 
 from __future__ import annotations
+import time
+from collections.abc import Mapping, Set as AbstractSet
 from dataclasses import dataclass
 from typing import List, Tuple, Optional, Set, Dict, Iterable, FrozenSet
+from motor.indexing import LiteralIndex
+from motor.prop_compiled import PropCompiler, iter_literals
+from motor.stats import ResolutionStats
+from motor.budget import Budget, UNKNOWN
 
 Literal = str            # "A" o "~A"
 Clause  = FrozenSet[str] # frozenset({"A","~B"})
@@ -54,67 +61,155 @@ def parse_clause_list(raw: Iterable[Iterable[str]]) -> List[Clause]:
 def pretty_clause(c: Clause) -> str:
     return " ∨ ".join(sorted(c)) if c else "□"
 
+# -----------------------------------------------------------------------------
+# Resultado en texto, convertido a pedido
+# -----------------------------------------------------------------------------
+
+class DerivedClauses(AbstractSet):
+    """
+    Conjunto de cláusulas retenidas en texto. Se guardan los bitsets y cada
+    cláusula se convierte al recorrerla: con cientos de miles de retenidas
+    (por ejemplo al agotarse un presupuesto) retornar no cuesta nada.
+    """
+
+    def __init__(self, comp: PropCompiler, clauses: List[int], seen: Set[int], text) -> None:
+        self._comp, self._clauses, self._seen, self._text = comp, clauses, seen, text
+
+    def __contains__(self, c) -> bool:
+        return self._comp.clause(c) in self._seen
+
+    def __iter__(self):
+        return map(self._text, self._clauses)
+
+    def __len__(self) -> int:
+        return len(self._clauses)
+
+
+class ProofMap(Mapping):
+    """Mapa resolvente -> (padre, padre) en texto, convertido entrada a entrada."""
+
+    def __init__(self, comp: PropCompiler, parents_of: Dict[int, Tuple[int, int]], text) -> None:
+        self._comp, self._parents, self._text = comp, parents_of, text
+
+    def __getitem__(self, c: Clause) -> Tuple[Clause, Clause]:
+        a, b = self._parents[self._comp.clause(c)]
+        return self._text(a), self._text(b)
+
+    def __iter__(self):
+        return map(self._text, self._parents)
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
 # -----------------------------------------------------------------------------
 # Resolución proposicional
 # -----------------------------------------------------------------------------
 
-def resolve_propositional(clauses_init: Iterable[Clause], keep_steps: bool = True):
+def resolve_propositional(clauses_init: Iterable[Clause], keep_steps: bool = True,
+                          stats: Optional[ResolutionStats] = None, budget: Optional[Budget] = None):
     """
     Ejecuta la resolución proposicional sobre una KB en CNF.
     Retorna: (entails_empty, derived_set, proof_map, steps)
+
+    `entails_empty` es `UNKNOWN` si se agotó `budget` (tiempo, generadas,
+    retenidas o memoria; la profundidad de término no aplica). `stats`
+    (opcional) recibe generadas, retenidas y tiempo por fase.
+
+    Cada cláusula nueva solo visita las cláusulas activas con un literal
+    complementario (`LiteralIndex`), no toda la KB.
+
+    Internamente las cláusulas se compilan a bitsets (`motor/prop_compiled.py`):
+    resolventes, tautologías y duplicados se resuelven con operaciones de bits.
+    La entrada, la traza y el resultado conservan la forma en texto; el
+    conjunto derivado y el mapa de prueba son vistas (`DerivedClauses`,
+    `ProofMap`) que convierten a texto solo lo que se recorre o consulta, y
+    ese tiempo se suma a la fase "conversión" de `stats`.
     """
-    clauses: List[Clause] = []
-    seen: Set[Clause] = set()
-    proof: Dict[Clause, Tuple[Clause, Clause]] = {}
+    comp = PropCompiler()
+    clauses: List[int] = []
+    seen: Set[int] = set()
+    parents_of: Dict[int, Tuple[int, int]] = {}
+    texts: Dict[int, Clause] = {}
     steps: List[PropStep] = []
-
-    def add_clause(c: Clause, parents: Optional[Tuple[Clause, Clause]] = None) -> bool:
+    stats = stats if stats is not None else ResolutionStats()
+    stats.stopped = None
+    meter = budget.start(stats) if budget is not None else None
+
+    def text(bits: int) -> Clause:
+        t = texts.get(bits)
+        if t is None:
+            t = texts[bits] = comp.clause_text(bits)
+        return t
+
+    def converted(bits: int) -> Clause:
+        # Para las vistas del resultado: la conversión posterior también se mide
+        t = texts.get(bits)
+        if t is None:
+            t0 = time.perf_counter()
+            t = texts[bits] = comp.clause_text(bits)
+            stats.add_time("conversión", time.perf_counter() - t0)
+        return t
+
+    def add_clause(c: int, parents: Optional[Tuple[int, int]] = None) -> bool:
         if c in seen:
             return False
         seen.add(c); clauses.append(c)
-        if parents: proof[c] = parents
+        stats.kept += 1
+        if parents: parents_of[c] = parents
         return True
 
+    def result(entails):
+        stats.add_time("búsqueda", time.perf_counter() - t_search)
+        return (entails, DerivedClauses(comp, clauses, seen, converted),
+                ProofMap(comp, parents_of, converted), steps)
+
     # Carga inicial
+    t0 = time.perf_counter()
     for c in clauses_init:
-        add_clause(frozenset(c))
+        add_clause(comp.clause(c))
+    t_search = time.perf_counter()
+    stats.add_time("carga", t_search - t0)
 
-    processed_pairs: Set[Tuple[int, int]] = set()
+    index = LiteralIndex(key=lambda l: l, complement_key=lambda l: l ^ 1)
+    given = 0
+    round_end = 0
     iteration = 0
 
-    while True:
-        new_any = False
-        iteration += 1
-
-        for i in range(len(clauses)):
-            for j in range(i+1, len(clauses)):
-                key = (i, j)
-                if key in processed_pairs: 
+    while given < len(clauses):
+        if given >= round_end:
+            iteration += 1
+            round_end = len(clauses)
+
+        if meter is not None and meter.exceeded(len(clauses)):
+            return result(UNKNOWN)
+        j = given
+        given += 1
+        Cj = clauses[j]
+        lits_j = list(iter_literals(Cj))
+
+        # Solo las cláusulas activas que contienen el complemento de algún literal de Cj
+        for i, pairs in index.partners(lits_j).items():
+            Ci = clauses[i]
+            for lj, li in pairs:
+                # Resolvente = (Ci - {l}) ∪ (Cj - {~l})
+                R = (Ci & ~(1 << li)) | (Cj & ~(1 << lj))
+                if comp.is_tautology(R):
                     continue
-                processed_pairs.add(key)
-
-                Ci, Cj = clauses[i], clauses[j]
 
-                # Para cada literal de Ci, busca su complemento en Cj
-                for l in Ci:
-                    comp = neg(l)
-                    if comp not in Cj:
-                        continue
+                stats.generated += 1
+                if meter is not None and meter.exceeded(len(clauses)):
+                    return result(UNKNOWN)
 
-                    # Resolvente = (Ci - {l}) ∪ (Cj - {~l})
-                    R = (Ci - {l}) | (Cj - {comp})
-                    if is_tautology(R):
-                        continue
+                if keep_steps:
+                    steps.append(PropStep(iteration, i, j, comp.literal_text(li),
+                                          comp.literal_text(lj), text(R)))
 
-                    if keep_steps:
-                        steps.append(PropStep(iteration, i, j, l, comp, R))
+                if not add_clause(R, parents=(Ci, Cj)):
+                    continue
 
-                    if not add_clause(R, parents=(Ci, Cj)):
-                        continue
+                if R == 0:
+                    return result(True)
 
-                    new_any = True
-                    if len(R) == 0:
-                        return True, set(clauses), proof, steps
+        index.add(j, lits_j)
 
-        if not new_any:
-            return False, set(clauses), proof, steps
+    return result(False)
@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""
+motor/sat_solver.py
+===================
+Solucionador **CDCL** (*conflict-driven clause learning*) para consultas de
+implicación proposicional: ¿es KB ∧ ¬meta insatisfacible?
+
+Componentes:
+- **Dos literales vigilados** por cláusula para la propagación unitaria.
+- Análisis de conflictos **1UIP** con aprendizaje de cláusulas.
+- Heurística **VSIDS** (actividad por variable con decaimiento) y fase guardada.
+- **Reinicios** según la secuencia de Luby.
+- **Reducción** periódica de la base de cláusulas aprendidas (por LBD).
+
+Los literales usan la codificación de `motor/prop_compiled.py` (2v / 2v+1).
+
+Con `proof=True` cada cláusula aprendida guarda su **cadena de resolución**
+(cláusula de conflicto y, en orden, las razones resueltas). Al llegar a `□`
+se reconstruye una refutación por resolución binaria usando solo las
+cláusulas necesarias, de modo que el resultado sigue siendo explicable con
+la misma traza (`PropStep`) que `resolve_propositional`.
+"""
+
+from __future__ import annotations
+import heapq
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from motor.prop_compiled import PropCompiler, iter_literals
+from motor.propositional_resolution import Clause, PropStep
+
+Chain = Tuple[int, List[Tuple[int, int]]]  # (cláusula inicial, [(variable pivote, cláusula), ...])
+
+
+def luby(i: int) -> int:
+    """i-ésimo término (desde 1) de la secuencia de Luby: 1 1 2 1 1 2 4 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class CDCLSolver:
+    """Solucionador CDCL sobre literales enteros (2v / 2v+1)."""
+
+    def __init__(self, proof: bool = False, restart_base: int = 100,
+                 reduce_base: int = 2000, var_decay: float = 0.95):
+        self.proof = proof
+        self.restart_base = restart_base
+        self.max_learnts = reduce_base
+        self.var_decay = var_decay
+
+        self.clauses: List[Optional[List[int]]] = []
+        self.learnt: List[bool] = []
+        self.lbd: List[int] = []
+        self.contents: List[FrozenSet[int]] = []   # literales de cada cláusula (para pruebas)
+        self.chains: Dict[int, Chain] = {}          # cláusula aprendida -> cadena de resolución
+        self.empty_chain: Optional[Chain] = None    # derivación final de □
+
+        self.watches: List[List[int]] = []
+        self.value: List[int] = []      # -1 sin asignar, 0 falso, 1 verdadero
+        self.level: List[int] = []
+        self.reason: List[int] = []     # cláusula que forzó la asignación (-1 = decisión)
+        self.phase: List[int] = []
+        self.activity: List[float] = []
+        self.var_inc = 1.0
+        self.heap: List[Tuple[float, int]] = []
+
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.unsat = False
+        self.pending_units: List[int] = []
+
+        self.num_learnts = 0
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.deleted = 0
+
+    # -------------------------------------------------------------------------
+    # Construcción
+    # -------------------------------------------------------------------------
+
+    @property
+    def num_vars(self) -> int:
+        return len(self.value)
+
+    def _ensure_var(self, v: int) -> None:
+        while len(self.value) <= v:
+            w = len(self.value)
+            self.value.append(-1); self.level.append(0); self.reason.append(-1)
+            self.phase.append(0); self.activity.append(0.0)
+            self.watches.append([]); self.watches.append([])
+            heapq.heappush(self.heap, (0.0, w))
+
+    def _new_clause(self, lits: List[int], learnt: bool, lbd: int = 0) -> int:
+        cid = len(self.clauses)
+        self.clauses.append(lits)
+        self.learnt.append(learnt)
+        self.lbd.append(lbd)
+        self.contents.append(frozenset(lits) if self.proof else frozenset())
+        if len(lits) >= 2:
+            self.watches[lits[0]].append(cid)
+            self.watches[lits[1]].append(cid)
+        return cid
+
+    def add_clause(self, lits: Iterable[int]) -> int:
+        """Añade una cláusula de entrada (a nivel 0). Retorna su id."""
+        uniq = sorted(set(lits))
+        for l in uniq:
+            self._ensure_var(l >> 1)
+        if any((l ^ 1) in uniq for l in uniq if not l & 1):
+            # Tautología: se registra (para ids estables) pero no se vigila
+            cid = self._new_clause(list(uniq), False)
+            self.clauses[cid] = None
+            return cid
+        cid = self._new_clause(list(uniq), False)
+        if not uniq:
+            self.unsat = True
+            self.empty_chain = (cid, [])
+        elif len(uniq) == 1:
+            self.pending_units.append(cid)
+        return cid
+
+    # -------------------------------------------------------------------------
+    # Asignación y propagación
+    # -------------------------------------------------------------------------
+
+    def _lit_value(self, l: int) -> int:
+        v = self.value[l >> 1]
+        return -1 if v < 0 else v ^ (l & 1)
+
+    def _assign(self, l: int, reason: int) -> None:
+        v = l >> 1
+        self.value[v] = 1 - (l & 1)
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(l)
+
+    def _propagate(self) -> int:
+        """Propagación con literales vigilados. Retorna la cláusula en conflicto o -1."""
+        clauses = self.clauses
+        watches = self.watches
+        while self.qhead < len(self.trail):
+            p = self.trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            false_lit = p ^ 1
+            ws = watches[false_lit]
+            watches[false_lit] = kept = []
+            i = 0
+            n = len(ws)
+            while i < n:
+                cid = ws[i]
+                i += 1
+                c = clauses[cid]
+                if c is None:
+                    continue  # cláusula eliminada: se descarta de la lista
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], c[0]
+                first = c[0]
+                if self._lit_value(first) == 1:
+                    kept.append(cid)
+                    continue
+                for k in range(2, len(c)):
+                    if self._lit_value(c[k]) != 0:
+                        c[1], c[k] = c[k], c[1]
+                        watches[c[1]].append(cid)
+                        break
+                else:
+                    kept.append(cid)
+                    if self._lit_value(first) == 0:
+                        kept.extend(ws[i:])
+                        self.qhead = len(self.trail)
+                        return cid
+                    self._assign(first, cid)
+        return -1
+
+    # -------------------------------------------------------------------------
+    # Análisis de conflictos (1UIP)
+    # -------------------------------------------------------------------------
+
+    def _bump_var(self, v: int) -> None:
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-a, w) for w, a in enumerate(self.activity)]
+            heapq.heapify(self.heap)
+        heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def _eliminate_level0(self, lits: Set[int], steps: List[Tuple[int, int]]) -> None:
+        """Resuelve fuera los literales falsos a nivel 0 (solo para la prueba)."""
+        pending = {l >> 1 for l in lits if self.level[l >> 1] == 0}
+        for l in reversed(self.trail):
+            v = l >> 1
+            if v not in pending or self.level[v] != 0:
+                continue
+            pending.discard(v)
+            r = self.reason[v]
+            steps.append((v, r))
+            for q in self.contents[r]:
+                if (q >> 1) != v:
+                    pending.add(q >> 1)
+
+    def _analyze(self, confl: int) -> Tuple[List[int], int, int, Chain]:
+        seen: Set[int] = set()
+        learnt: List[int] = [0]
+        level0: Set[int] = set()
+        steps: List[Tuple[int, int]] = []
+        current = len(self.trail_lim)
+        counter = 0
+        p = -1
+        idx = len(self.trail) - 1
+        c = self.clauses[confl]
+        while True:
+            for q in c:
+                if q == p:
+                    continue
+                v = q >> 1
+                if v in seen:
+                    continue
+                if self.level[v] == 0:
+                    level0.add(q)
+                    continue
+                seen.add(v)
+                self._bump_var(v)
+                if self.level[v] == current:
+                    counter += 1
+                else:
+                    learnt.append(q)
+            while (self.trail[idx] >> 1) not in seen:
+                idx -= 1
+            p = self.trail[idx]
+            idx -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            r = self.reason[p >> 1]
+            steps.append((p >> 1, r))
+            c = self.clauses[r]
+        learnt[0] = p ^ 1
+        if self.proof and level0:
+            self._eliminate_level0(level0, steps)
+        self.var_inc /= self.var_decay
+
+        if len(learnt) == 1:
+            back = 0
+        else:
+            k = max(range(1, len(learnt)), key=lambda k: self.level[learnt[k] >> 1])
+            learnt[1], learnt[k] = learnt[k], learnt[1]
+            back = self.level[learnt[1] >> 1]
+        lbd = len({self.level[l >> 1] for l in learnt})
+        return learnt, back, lbd, (confl, steps)
+
+    def _final_chain(self, confl: int) -> Chain:
+        """Cadena que deriva □ desde un conflicto a nivel 0."""
+        steps: List[Tuple[int, int]] = []
+        if self.proof:
+            self._eliminate_level0(set(self.contents[confl]), steps)
+        return confl, steps
+
+    # -------------------------------------------------------------------------
+    # Búsqueda
+    # -------------------------------------------------------------------------
+
+    def _backtrack(self, level: int) -> None:
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for l in self.trail[start:]:
+            v = l >> 1
+            self.phase[v] = self.value[v]
+            self.value[v] = -1
+            self.reason[v] = -1
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch(self) -> int:
+        while self.heap:
+            act, v = heapq.heappop(self.heap)
+            if self.value[v] < 0 and -act == self.activity[v]:
+                return 2 * v + (0 if self.phase[v] == 1 else 1)
+        return -1
+
+    def _reduce_db(self) -> None:
+        locked = {self.reason[l >> 1] for l in self.trail}
+        cands = [cid for cid, c in enumerate(self.clauses)
+                 if c is not None and self.learnt[cid] and len(c) > 2 and cid not in locked]
+        cands.sort(key=lambda cid: self.lbd[cid], reverse=True)
+        for cid in cands[:len(cands) // 2]:
+            self.clauses[cid] = None
+            self.deleted += 1
+            self.num_learnts -= 1
+        self.max_learnts = int(self.max_learnts * 1.1)
+
+    def solve(self) -> bool:
+        """True si la KB es satisfacible; False si es insatisfacible (□)."""
+        if self.unsat:
+            return False
+        for cid in self.pending_units:
+            l = self.clauses[cid][0]
+            val = self._lit_value(l)
+            if val == 0:
+                self.unsat = True
+                self.empty_chain = self._final_chain(cid)
+                return False
+            if val < 0:
+                self._assign(l, cid)
+        self.pending_units = []
+
+        restarts = 0
+        budget = self.restart_base * luby(1)
+        since_restart = 0
+        while True:
+            confl = self._propagate()
+            if confl >= 0:
+                self.conflicts += 1
+                since_restart += 1
+                if not self.trail_lim:
+                    self.unsat = True
+                    self.empty_chain = self._final_chain(confl)
+                    return False
+                learnt, back, lbd, chain = self._analyze(confl)
+                self._backtrack(back)
+                cid = self._new_clause(learnt, True, lbd)
+                self.num_learnts += 1
+                if self.proof:
+                    self.chains[cid] = chain
+                self._assign(learnt[0], cid)
+                continue
+
+            if since_restart >= budget:
+                restarts += 1
+                since_restart = 0
+                budget = self.restart_base * luby(restarts + 1)
+                self._backtrack(0)
+            if self.num_learnts > self.max_learnts:
+                self._reduce_db()
+
+            lit = self._pick_branch()
+            if lit < 0:
+                return True  # todas las variables asignadas sin conflicto
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._assign(lit, -1)
+
+    def model(self) -> Dict[int, bool]:
+        """Asignación encontrada (variable -> valor) tras un `solve()` satisfacible."""
+        return {v: val == 1 for v, val in enumerate(self.value) if val >= 0}
+
+    # -------------------------------------------------------------------------
+    # Reconstrucción de la refutación
+    # -------------------------------------------------------------------------
+
+    def refutation(self) -> List[Tuple[FrozenSet[int], FrozenSet[int], FrozenSet[int], int]]:
+        """
+        Pasos de resolución binaria (izquierda, derecha, resolvente, literal
+        pivote de la izquierda) que llevan de las cláusulas de entrada a `□`.
+        Solo incluye las cláusulas aprendidas realmente usadas.
+        """
+        if not self.proof or self.empty_chain is None:
+            return []
+        needed: List[int] = []
+        visited: Set[int] = set()
+
+        def visit(chain: Chain) -> None:
+            start, steps = chain
+            for cid in [start] + [r for _, r in steps]:
+                if cid in self.chains and cid not in visited:
+                    visited.add(cid)
+                    visit(self.chains[cid])
+                    needed.append(cid)
+
+        visit(self.empty_chain)
+        out = []
+        for chain in [self.chains[cid] for cid in needed] + [self.empty_chain]:
+            start, steps = chain
+            cur = self.contents[start]
+            for v, r in steps:
+                other = self.contents[r]
+                pivot = 2 * v if 2 * v in cur else 2 * v + 1
+                res = (cur - {pivot}) | (other - {pivot ^ 1})
+                out.append((cur, other, res, pivot))
+                cur = res
+        return out
+
+
+# -----------------------------------------------------------------------------
+# Interfaz con el contrato de los motores de resolución
+# -----------------------------------------------------------------------------
+
+def resolve_propositional_cdcl(clauses_init: Iterable[Clause], keep_steps: bool = True):
+    """
+    Igual contrato que `resolve_propositional`:
+    Retorna: (entails_empty, derived_set, proof_map, steps)
+
+    - `entails_empty` es True si la KB es insatisfacible (se deriva `□`).
+    - `derived_set` son las cláusulas de entrada más las aprendidas vigentes.
+    - Con `keep_steps=True`, `proof_map` y `steps` describen una refutación
+      por resolución extraída de las cláusulas aprendidas.
+    """
+    comp = PropCompiler()
+    solver = CDCLSolver(proof=keep_steps)
+    for c in clauses_init:
+        solver.add_clause(iter_literals(comp.clause(c)))
+    unsat = not solver.solve()
+
+    def text(lits: Iterable[int]) -> Clause:
+        return frozenset(comp.literal_text(l) for l in lits)
+
+    derived = {text(c) for c in solver.clauses if c is not None}
+    proof: Dict[Clause, Tuple[Clause, Clause]] = {}
+    steps: List[PropStep] = []
+    if unsat:
+        derived.add(frozenset())
+        ids: Dict[FrozenSet[int], int] = {}
+        for cid, c in enumerate(solver.contents):
+            if cid not in solver.chains:
+                ids.setdefault(c, cid)
+        for k, (left, right, res, pivot) in enumerate(solver.refutation(), start=1):
+            proof.setdefault(text(res), (text(left), text(right)))
+            ids.setdefault(res, len(solver.clauses) + k)
+            steps.append(PropStep(k, ids[left], ids[right], comp.literal_text(pivot),
+                                  comp.literal_text(pivot ^ 1), text(res)))
+    return unsat, derived, proof, steps
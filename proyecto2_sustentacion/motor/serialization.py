@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+motor/serialization.py
+======================
+**Formato binario compacto** para conjuntos de cláusulas FOL y estados del
+motor (`FolProver`) parcialmente saturados.
+
+Reconstruir una KB grande con `L(...)`/`frozenset` en cada arranque cuesta más
+que la propia consulta. El archivo guarda, en cambio:
+
+- una **tabla de símbolos** (nombres de variables, constantes, funciones y
+  predicados, UTF-8);
+- **arreglos planos de enteros** (int32, little-endian) para términos,
+  literales y cláusulas, cada uno con su arreglo de desplazamientos. Un
+  término se escribe como `tipo, símbolo, aridad, ids de argumentos` y sus
+  argumentos tienen ids menores: los subtérminos compartidos se guardan una vez,
+  igual que en el `TermBank`;
+- opcionalmente, el **estado del bucle de cláusula dada**: ids por posición
+  (-1 = retirada), retiradas, mapa de prueba, contadores y configuración.
+
+`MappedClauses` abre el archivo con `mmap` y decodifica cada cláusula al
+pedirla (con caché por id de término/literal), sin leer el archivo entero a
+memoria. `save_prover`/`load_prover` permiten que un trabajador retome una KB
+ya calentada en vez de saturar desde cero; la traza (`steps`) no se guarda.
+"""
+
+from __future__ import annotations
+import dataclasses
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from motor.unification import Var, Const, Func, Term
+from motor.first_order_resolution import Clause, FolProver, Literal, Pred, canonicalize_clause
+from motor.stats import ResolutionStats
+
+MAGIC = b"RSLV"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHI")     # magia, versión, reservado, nº de secciones
+_ENTRY = struct.Struct("<4sQQ")       # etiqueta, desplazamiento, longitud
+
+_VAR, _CONST, _FUNC = 0, 1, 2
+_SWAP = sys.byteorder != "little"
+
+# -----------------------------------------------------------------------------
+# Escritura
+# -----------------------------------------------------------------------------
+
+class _Encoder:
+    """Asigna ids a símbolos, términos, literales y cláusulas (estructuras iguales comparten id)."""
+
+    def __init__(self) -> None:
+        self.symbols: Dict[str, int] = {}
+        self.terms: Dict[Term, int] = {}
+        self.literals: Dict[Literal, int] = {}
+        self.clauses: Dict[Clause, int] = {}
+        self.term_data, self.term_off = array("i"), array("i", [0])
+        self.lit_data, self.lit_off = array("i"), array("i", [0])
+        self.clause_data, self.clause_off = array("i"), array("i", [0])
+
+    def symbol(self, name: str) -> int:
+        i = self.symbols.get(name)
+        if i is None:
+            i = self.symbols[name] = len(self.symbols)
+        return i
+
+    def term(self, t: Term) -> int:
+        i = self.terms.get(t)
+        if i is not None:
+            return i
+        # Recorrido iterativo en postorden: los argumentos reciben id antes que su padre
+        stack: List[Tuple[Term, bool]] = [(t, False)]
+        while stack:
+            x, ready = stack.pop()
+            if x in self.terms:
+                continue
+            if x.__class__ is Func and not ready:
+                stack.append((x, True))
+                stack.extend((a, False) for a in reversed(x.args) if a not in self.terms)
+                continue
+            if x.__class__ is Var:
+                self.term_data.extend((_VAR, self.symbol(x.name), 0))
+            elif x.__class__ is Const:
+                self.term_data.extend((_CONST, self.symbol(x.name), 0))
+            else:
+                self.term_data.extend((_FUNC, self.symbol(x.name), len(x.args)))
+                self.term_data.extend(self.terms[a] for a in x.args)
+            self.terms[x] = len(self.term_off) - 1
+            self.term_off.append(len(self.term_data))
+        return self.terms[t]
+
+    def literal(self, l: Literal) -> int:
+        i = self.literals.get(l)
+        if i is None:
+            args = [self.term(a) for a in l.pred.args]
+            self.lit_data.extend((self.symbol(l.pred.name), int(l.neg), len(args)))
+            self.lit_data.extend(args)
+            i = self.literals[l] = len(self.lit_off) - 1
+            self.lit_off.append(len(self.lit_data))
+        return i
+
+    def clause(self, c: Clause) -> int:
+        i = self.clauses.get(c)
+        if i is None:
+            self.clause_data.extend([self.literal(l) for l in c])
+            i = self.clauses[c] = len(self.clause_off) - 1
+            self.clause_off.append(len(self.clause_data))
+        return i
+
+    def sections(self) -> List[Tuple[bytes, bytes]]:
+        names = sorted(self.symbols, key=self.symbols.get)
+        blob = array("i", [0])
+        text = bytearray()
+        for n in names:
+            text += n.encode("utf-8")
+            blob.append(len(text))
+        return [(b"SOFF", _bytes(blob)), (b"SYMS", bytes(text)),
+                (b"TOFF", _bytes(self.term_off)), (b"TERM", _bytes(self.term_data)),
+                (b"LOFF", _bytes(self.lit_off)), (b"LITS", _bytes(self.lit_data)),
+                (b"COFF", _bytes(self.clause_off)), (b"CLAU", _bytes(self.clause_data))]
+
+
+def _bytes(a: array) -> bytes:
+    if _SWAP:
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def _write(path: str, sections: List[Tuple[bytes, bytes]]) -> None:
+    """Cabecera + tabla de secciones + secciones alineadas a 8 bytes (para `cast` sobre el mmap)."""
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    table, layout = [], []
+    for tag, data in sections:
+        offset += -offset % 8
+        table.append(_ENTRY.pack(tag, offset, len(data)))
+        layout.append((offset, data))
+        offset += len(data)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(sections)))
+        f.write(b"".join(table))
+        for off, data in layout:
+            f.write(b"\0" * (off - f.tell()))
+            f.write(data)
+    os.replace(tmp, path)  # nunca queda un archivo a medio escribir
+
+
+def save_clauses(clauses: Iterable[Clause], path: str) -> int:
+    """Guarda las cláusulas en el orden dado; retorna cuántas se escribieron."""
+    enc = _Encoder()
+    order = array("i", (enc.clause(c) for c in clauses))
+    _write(path, enc.sections() + [(b"ORDR", _bytes(order))])
+    return len(order)
+
+# -----------------------------------------------------------------------------
+# Lectura con mmap
+# -----------------------------------------------------------------------------
+
+class MappedClauses(Sequence[Clause]):
+    """
+    Cláusulas de un archivo binario, mapeado en memoria. `clauses[i]` decodifica
+    solo lo necesario; cada término y literal se construye una vez, así que
+    los subtérminos repetidos quedan compartidos como en un `TermBank`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, n = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: no es un archivo de cláusulas (magia {magic!r})")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: versión {version} no soportada")
+        self._sections: Dict[bytes, Tuple[int, int]] = {}
+        for k in range(n):
+            tag, off, size = _ENTRY.unpack_from(self._mm, _HEADER.size + k * _ENTRY.size)
+            self._sections[tag] = (off, size)
+        soff = self.ints(b"SOFF")
+        syms = self.raw(b"SYMS")
+        self._symbols = [bytes(syms[soff[k]:soff[k + 1]]).decode("utf-8") for k in range(len(soff) - 1)]
+        self._toff, self._term = self.ints(b"TOFF"), self.ints(b"TERM")
+        self._loff, self._lits = self.ints(b"LOFF"), self.ints(b"LITS")
+        self._coff, self._clau = self.ints(b"COFF"), self.ints(b"CLAU")
+        self._order = self.ints(b"ORDR") if b"ORDR" in self._sections else range(len(self._coff) - 1)
+        self._terms: List[Optional[Term]] = [None] * (len(self._toff) - 1)
+        self._literals: List[Optional[Literal]] = [None] * (len(self._loff) - 1)
+        self._clauses: List[Optional[Clause]] = [None] * (len(self._coff) - 1)
+
+    # -- secciones -------------------------------------------------------------
+
+    def has(self, tag: bytes) -> bool:
+        return tag in self._sections
+
+    def raw(self, tag: bytes) -> memoryview:
+        off, size = self._sections[tag]
+        return memoryview(self._mm)[off:off + size]
+
+    def ints(self, tag: bytes) -> Sequence[int]:
+        """Sección como arreglo de int32 sin copiar (salvo en máquinas big-endian)."""
+        view = self.raw(tag).cast("i")
+        if _SWAP:
+            a = array("i", view)
+            a.byteswap()
+            return a
+        return view
+
+    # -- decodificación ----------------------------------------------------------
+
+    def term(self, i: int) -> Term:
+        t = self._terms[i]
+        if t is not None:
+            return t
+        data, off, cache, syms = self._term, self._toff, self._terms, self._symbols
+        stack = [i]
+        while stack:
+            k = stack[-1]
+            if cache[k] is not None:
+                stack.pop()
+                continue
+            p = off[k]
+            kind, sym, arity = data[p], data[p + 1], data[p + 2]
+            if kind == _VAR:
+                cache[k] = Var(syms[sym])
+            elif kind == _CONST:
+                cache[k] = Const(syms[sym])
+            else:
+                args = data[p + 3:p + 3 + arity]
+                missing = [a for a in args if cache[a] is None]
+                if missing:
+                    stack.extend(missing)
+                    continue
+                cache[k] = Func(syms[sym], tuple(cache[a] for a in args))
+            stack.pop()
+        return cache[i]
+
+    def literal(self, i: int) -> Literal:
+        l = self._literals[i]
+        if l is None:
+            data, p = self._lits, self._loff[i]
+            sym, negated, arity = data[p], data[p + 1], data[p + 2]
+            args = tuple(self.term(a) for a in data[p + 3:p + 3 + arity])
+            l = self._literals[i] = Literal(Pred(self._symbols[sym], args), bool(negated))
+        return l
+
+    def clause(self, i: int) -> Clause:
+        """Cláusula por id interno (el del archivo, no la posición en el orden guardado)."""
+        c = self._clauses[i]
+        if c is None:
+            c = self._clauses[i] = frozenset(self.literal(l) for l in self._clau[self._coff[i]:self._coff[i + 1]])
+        return c
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.clause(self._order[k]) for k in range(*i.indices(len(self)))]
+        return self.clause(self._order[i])
+
+    def __iter__(self) -> Iterator[Clause]:
+        for k in self._order:
+            yield self.clause(k)
+
+    def close(self) -> None:
+        # Las vistas (`cast`) deben soltarse antes de cerrar el mmap
+        for name in ("_toff", "_term", "_loff", "_lits", "_coff", "_clau", "_order"):
+            v = self.__dict__.pop(name, None)
+            if isinstance(v, memoryview):
+                v.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedClauses":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_clauses(path: str) -> List[Clause]:
+    """Todas las cláusulas del archivo, en el orden en que se guardaron."""
+    with MappedClauses(path) as m:
+        return list(m)
+
+# -----------------------------------------------------------------------------
+# Estado del motor
+# -----------------------------------------------------------------------------
+
+def save_prover(prover: FolProver, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Guarda el estado de `prover`: cláusulas por id (retiradas incluidas),
+    mapa de prueba, posición del bucle, estadísticas y configuración (orden,
+    selección, regla de inferencia, subsunción). `extra` (JSON) viaja con el
+    estado, p. ej. los contadores del `CNFConverter` de una `KnowledgeBase`.
+    """
+    enc = _Encoder()
+    slots = array("i", (-1 if c is None else enc.clause(c) for c in prover.clauses))
+    retired = array("i")
+    for cid, c in prover.retired:
+        retired.extend((cid, enc.clause(c)))
+    proof = array("i")
+    for c, (a, b) in prover.proof.items():
+        proof.extend((enc.clause(c), enc.clause(a), enc.clause(b)))
+    inter = array("i", (enc.clause(c) for c in prover._intermediate))
+    meta = {
+        "given": prover.given, "round_end": prover.round_end, "iteration": prover.iteration,
+        "refuted": prover.refuted, "pruned": prover.pruned, "fresh": prover._fresh,
+        "stats": dataclasses.asdict(prover.stats), "extra": extra or {},
+    }
+    conf = pickle.dumps((prover.inference, prover.subsumption, prover.ordering, prover.selection))
+    _write(path, enc.sections() + [
+        (b"SLOT", _bytes(slots)), (b"RETD", _bytes(retired)), (b"PRUF", _bytes(proof)),
+        (b"INTR", _bytes(inter)), (b"META", json.dumps(meta).encode("utf-8")), (b"CONF", conf),
+    ])
+
+
+def load_state(path: str, keep_steps: bool = False, sink=None,
+               stats: Optional[ResolutionStats] = None) -> Tuple[FolProver, Dict[str, Any]]:
+    """
+    Reconstruye el `FolProver` guardado con `save_prover` (índices, `seen` y
+    subsunción incluidos) y retorna (prover, extra). `prover.run()` continúa
+    exactamente donde quedó. `stats`, si se da, recibe los contadores guardados.
+    """
+    with MappedClauses(path) as m:
+        if not m.has(b"SLOT"):
+            raise ValueError(f"{path}: el archivo no trae estado del motor (solo cláusulas)")
+        meta = json.loads(bytes(m.raw(b"META")).decode("utf-8"))
+        inference, subsumption, ordering, selection = pickle.loads(bytes(m.raw(b"CONF")))
+        saved = ResolutionStats(**meta["stats"])
+        if stats is not None:
+            stats.__dict__.update(saved.__dict__)
+        else:
+            stats = saved
+        p = FolProver(keep_steps=keep_steps, subsumption=subsumption, stats=stats,
+                      ordering=ordering, selection=selection, inference=inference, sink=sink)
+        # Igual que `add_clause` (canónica y luego al banco): el frozenset
+        # resultante itera en el mismo orden que el original, y con él el bucle
+        get = lambda k: p.bank.clause(canonicalize_clause(m.clause(k)))
+        for cid, k in enumerate(m.ints(b"SLOT").tolist()):
+            if k < 0:
+                p.clauses.append(None)
+                p.deleted.add(cid)
+                continue
+            c = get(k)
+            p.clauses.append(c)
+            p.seen.add(c)
+            p.subs.add(cid, c)
+        r = m.ints(b"RETD").tolist()
+        p.retired = [(r[t], get(r[t + 1])) for t in range(0, len(r), 2)]
+        pr = m.ints(b"PRUF").tolist()
+        p.proof = {get(pr[t]): (get(pr[t + 1]), get(pr[t + 2])) for t in range(0, len(pr), 3)}
+        p._intermediate = [get(k) for k in m.ints(b"INTR").tolist()]
+    p.given, p.round_end, p.iteration = meta["given"], meta["round_end"], meta["iteration"]
+    p.refuted, p.pruned, p._fresh = meta["refuted"], meta["pruned"], meta["fresh"]
+    return p, meta["extra"]
+
+
+def load_prover(path: str, keep_steps: bool = False, sink=None,
+                stats: Optional[ResolutionStats] = None) -> FolProver:
+    """Como `load_state`, sin los datos `extra`."""
+    return load_state(path, keep_steps, sink, stats)[0]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+motor/stats.py
+==============
+Estadísticas de una ejecución de resolución: cláusulas generadas y retenidas,
+cuántas eliminó el motor por redundancia (subsunción), cuántos factores añadió,
+intentos de unificación, tiempo por fase y, si se usó un `Budget`, qué límite
+detuvo la búsqueda.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class ResolutionStats:
+    """Contadores de una ejecución (se llenan si se pasan al motor)."""
+    factors: int = 0            # factores añadidos (necesarios para la subsunción)
+    forward_subsumed: int = 0   # resolventes descartados por una cláusula previa
+    backward_subsumed: int = 0  # cláusulas previas retiradas por una nueva
+    generated: int = 0          # resolventes construidos (sin contar tautologías)
+    kept: int = 0               # cláusulas retenidas (entrada y derivadas)
+    unify_attempts: int = 0     # pares de literales que se intentó unificar
+    unify_successes: int = 0
+    depth_pruned: int = 0       # resolventes descartados por `max_term_depth`
+    stopped: Optional[str] = None  # límite del presupuesto que se agotó
+    phase_times: Dict[str, float] = field(default_factory=dict)  # segundos por fase
+
+    @property
+    def deleted(self) -> int:
+        """Total de cláusulas eliminadas por subsunción."""
+        return self.forward_subsumed + self.backward_subsumed
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + seconds
+
+    def __str__(self) -> str:
+        s = (f"factores={self.factors} subsumidas(fwd)={self.forward_subsumed} "
+             f"subsumidas(bwd)={self.backward_subsumed} eliminadas={self.deleted} "
+             f"generadas={self.generated} retenidas={self.kept} "
+             f"unificaciones={self.unify_successes}/{self.unify_attempts}")
+        if self.depth_pruned:
+            s += f" podadas(profundidad)={self.depth_pruned}"
+        if self.phase_times:
+            s += " " + " ".join(f"t({k})={v * 1e3:.1f}ms" for k, v in self.phase_times.items())
+        if self.stopped:
+            s += f" detenido-por={self.stopped}"
+        return s
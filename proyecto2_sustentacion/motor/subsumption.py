@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+motor/subsumption.py
+====================
+**Subsunción** de cláusulas FOL para mantener pequeño el conjunto de cláusulas.
+
+C subsume a D si existe una sustitución σ tal que cada literal de Cσ es un
+literal distinto de D (subsunción θ *multiconjunto*: la correspondencia es
+inyectiva). Entonces D es redundante.
+
+Borrar cláusulas subsumidas solo conserva la completitud si el cálculo incluye
+**factorización**: el motor FOL la activa junto con la subsunción (ver
+`factors` en `motor/first_order_resolution.py`). Sin ella, una cláusula como
+`Q(y) ∨ Q(b)` puede ser la única vía hacia `Q(b)` y no debe retirarse.
+
+Dos filtros de coste creciente:
+1. **Vector de características**: nº de literales y conteo por
+   (predicado, aridad, polaridad). Si C subsume a D, cada componente de C es
+   ≤ la de D; basta una comparación para descartar la mayoría de candidatos.
+2. **Emparejamiento θ** (*matching*, unificación en un solo sentido) con
+   *backtracking* sobre los literales de C.
+
+`SubsumptionIndex` aplica ambas direcciones sobre las cláusulas retenidas:
+- *forward*:  ¿alguna cláusula retenida subsume al resolvente nuevo?
+- *backward*: ¿qué cláusulas retenidas quedan subsumidas por el nuevo?
+Los candidatos salen del mismo árbol de discriminación (`TermLiteralIndex`)
+que usa el motor para buscar compañeros de resolución: no se duplica el índice.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from motor.unification import Var, Const, Term, Subst
+from motor.indexing import fol_key
+from motor.term_index import TermLiteralIndex
+
+# -----------------------------------------------------------------------------
+# Vectores de características
+# -----------------------------------------------------------------------------
+
+FeatureVector = Tuple[int, Dict[tuple, int]]
+
+def feature_vector(c: Iterable) -> FeatureVector:
+    """(nº de literales, conteo por clave de literal)."""
+    counts: Dict[tuple, int] = {}
+    n = 0
+    for l in c:
+        k = fol_key(l)
+        counts[k] = counts.get(k, 0) + 1
+        n += 1
+    return n, counts
+
+def fv_compatible(small: FeatureVector, big: FeatureVector) -> bool:
+    """Condición necesaria para que la cláusula de `small` subsuma a la de `big`."""
+    if small[0] > big[0]:
+        return False
+    bc = big[1]
+    return all(bc.get(k, 0) >= v for k, v in small[1].items())
+
+# -----------------------------------------------------------------------------
+# Emparejamiento θ
+# -----------------------------------------------------------------------------
+
+def match_term(p: Term, t: Term, s: Subst) -> Optional[Subst]:
+    """
+    Extiende `s` para que `p`σ == `t`. Solo se enlazan variables del patrón:
+    las variables de `t` se tratan como constantes.
+    """
+    if isinstance(p, Var):
+        bound = s.get(p)
+        if bound is None:
+            s = dict(s); s[p] = t
+            return s
+        return s if bound == t else None
+    if isinstance(p, Const) or p.ground:
+        return s if p == t else None
+    if t.__class__ is not p.__class__ or t.name != p.name or len(t.args) != len(p.args):
+        return None
+    for a, b in zip(p.args, t.args):
+        s = match_term(a, b, s)
+        if s is None:
+            return None
+    return s
+
+def match_literal(p, t, s: Subst) -> Optional[Subst]:
+    if p.neg != t.neg or p.pred.name != t.pred.name or len(p.pred.args) != len(t.pred.args):
+        return None
+    for a, b in zip(p.pred.args, t.pred.args):
+        s = match_term(a, b, s)
+        if s is None:
+            return None
+    return s
+
+def subsumes(c: Iterable, d: Iterable) -> bool:
+    """True si `c` subsume (θ, multiconjunto) a `d`."""
+    c_lits = list(c)
+    d_lits = list(d)
+    if len(c_lits) > len(d_lits):
+        return False
+    # Candidatos por literal; primero los literales más restringidos
+    options: List[List[int]] = []
+    for l in c_lits:
+        opts = [k for k, m in enumerate(d_lits) if match_literal(l, m, {}) is not None]
+        if not opts:
+            return False
+        options.append(opts)
+    order = sorted(range(len(c_lits)), key=lambda k: len(options[k]))
+
+    def search(pos: int, s: Subst, used: frozenset) -> bool:
+        if pos == len(order):
+            return True
+        k = order[pos]
+        for m in options[k]:
+            if m in used:
+                continue
+            s2 = match_literal(c_lits[k], d_lits[m], s)
+            if s2 is not None and search(pos + 1, s2, used | {m}):
+                return True
+        return False
+
+    return search(0, {}, frozenset())
+
+# -----------------------------------------------------------------------------
+# Índice de subsunción sobre las cláusulas retenidas
+# -----------------------------------------------------------------------------
+
+class SubsumptionIndex:
+    """
+    Cláusulas retenidas (id -> cláusula) con sus vectores de características.
+    `add`/`remove` también mantienen el `TermLiteralIndex` compartido.
+    """
+
+    def __init__(self, index: TermLiteralIndex) -> None:
+        self._index = index
+        self._clauses: Dict[int, object] = {}
+        self._fvs: Dict[int, FeatureVector] = {}
+
+    def add(self, cid: int, c) -> None:
+        self._clauses[cid] = c
+        self._fvs[cid] = feature_vector(c)
+        self._index.add(cid, c)
+
+    def remove(self, cid: int) -> None:
+        c = self._clauses.pop(cid, None)
+        if c is not None:
+            del self._fvs[cid]
+            self._index.remove(cid, c)
+
+    def forward(self, c) -> Optional[int]:
+        """Id de una cláusula retenida que subsume a `c`, o None."""
+        if not c:
+            return None
+        fv = feature_vector(c)
+        tried = set()
+        for l in c:
+            for cid, _ in self._index.generalizations(l):
+                if cid in tried:
+                    continue
+                tried.add(cid)
+                if fv_compatible(self._fvs[cid], fv) and subsumes(self._clauses[cid], c):
+                    return cid
+        return None
+
+    def backward(self, c) -> List[int]:
+        """Ids de las cláusulas retenidas subsumidas por `c` (en orden ascendente)."""
+        if not c:
+            return []
+        fv = feature_vector(c)
+        # Todo literal de c debe caer en la cláusula subsumida: basta un literal
+        # para generar candidatos; se usa el de argumentos más específicos.
+        pivot = max(c, key=lambda l: sum(a.ground for a in l.pred.args))
+        tried = set()
+        found = set()
+        for cid, _ in self._index.instances(pivot):
+            if cid in tried:
+                continue
+            tried.add(cid)
+            if fv_compatible(fv, self._fvs[cid]) and subsumes(c, self._clauses[cid]):
+                found.add(cid)
+        return sorted(found)
+
+    def __len__(self) -> int:
+        return len(self._clauses)
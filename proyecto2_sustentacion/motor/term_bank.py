@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+motor/term_bank.py
+==================
+**Banco de términos** (*hash-consing*): interna términos, predicados y literales
+para que cada estructura distinta exista **una sola vez** en memoria.
+
+- Los subtérminos compartidos se guardan una vez (p. ej. `Tuna` en miles de hechos).
+- Cada objeto internado recibe un **id entero** estable (`bank.id_of(x)`).
+- `Func`, `Pred` y `Literal` ya traen hash, `ground` y variables cacheados; con
+  objetos internados la igualdad se resuelve por identidad (`is`).
+
+Las tablas guardan **referencias débiles**: el banco no mantiene vivo nada por
+sí mismo. Cuando el motor suelta una cláusula (p. ej. al retirarla por
+subsunción) sus términos desaparecen del banco si nadie más los usa, así la
+memoria no crece sin límite en saturaciones largas.
+
+La clave de internado de una estructura usa los `id()` de sus argumentos ya
+internados: mientras el objeto viva, sus argumentos también viven y esos ids no
+pueden reutilizarse.
+
+El banco no conoce las clases de `motor/first_order_resolution.py`: reconstruye
+predicados y literales con su propia clase, lo que evita importaciones circulares.
+"""
+
+from __future__ import annotations
+import weakref
+from typing import Any, FrozenSet, Iterable
+
+from motor.unification import Var, Const, Func, Term
+
+
+class TermBank:
+    """Tabla de internado: clave estructural -> representante único (referencia débil)."""
+
+    def __init__(self) -> None:
+        self._table: "weakref.WeakValueDictionary[tuple, Any]" = weakref.WeakValueDictionary()
+        self._ids: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+        self._objects: "weakref.WeakValueDictionary[int, Any]" = weakref.WeakValueDictionary()
+        self._next_id = 0
+
+    def _lookup(self, key: tuple, x: Any) -> Any:
+        hit = self._table.get(key)
+        if hit is not None:
+            return hit
+        self._table[key] = x
+        self._ids[x] = self._next_id
+        self._objects[self._next_id] = x
+        self._next_id += 1
+        return x
+
+    # -------------------------------------------------------------------------
+    # Internado
+    # -------------------------------------------------------------------------
+
+    def term(self, t: Term) -> Term:
+        """Representante único de `t` (los argumentos se internan primero)."""
+        if isinstance(t, Var):
+            return self._lookup(('v', t.name), t)
+        if isinstance(t, Const):
+            return self._lookup(('c', t.name), t)
+        args = tuple(self.term(a) for a in t.args)
+        key = ('f', t.name, tuple(map(id, args)))
+        hit = self._table.get(key)
+        if hit is not None:
+            return hit
+        if any(a is not b for a, b in zip(args, t.args)):
+            t = Func(t.name, args)
+        return self._lookup(key, t)
+
+    def pred(self, p: Any) -> Any:
+        args = tuple(self.term(a) for a in p.args)
+        key = ('p', p.name, tuple(map(id, args)))
+        hit = self._table.get(key)
+        if hit is not None:
+            return hit
+        if any(a is not b for a, b in zip(args, p.args)):
+            p = p.__class__(p.name, args)
+        return self._lookup(key, p)
+
+    def literal(self, l: Any) -> Any:
+        pred = self.pred(l.pred)
+        key = ('l', id(pred), l.neg)
+        hit = self._table.get(key)
+        if hit is not None:
+            return hit
+        if pred is not l.pred:
+            l = l.__class__(pred, l.neg)
+        return self._lookup(key, l)
+
+    def clause(self, c: Iterable[Any]) -> FrozenSet[Any]:
+        """Cláusula cuyos literales son todos representantes internados."""
+        return frozenset(self.literal(l) for l in c)
+
+    # -------------------------------------------------------------------------
+    # Identificadores enteros
+    # -------------------------------------------------------------------------
+
+    def id_of(self, x: Any) -> int:
+        """Id entero del objeto (se interna si aún no lo estaba)."""
+        i = self._ids.get(x)
+        if i is not None and self._objects.get(i) is x:
+            return i
+        if isinstance(x, (Var, Const, Func)):
+            x = self.term(x)
+        elif hasattr(x, "pred"):
+            x = self.literal(x)
+        else:
+            x = self.pred(x)
+        return self._ids[x]
+
+    def get(self, i: int) -> Any:
+        """Objeto internado con id `i` (KeyError si ya fue liberado)."""
+        return self._objects[i]
+
+    def __contains__(self, x: Any) -> bool:
+        i = self._ids.get(x)
+        return i is not None and self._objects.get(i) is x
+
+    def __len__(self) -> int:
+        """Número de objetos internados que siguen vivos."""
+        return len(self._objects)
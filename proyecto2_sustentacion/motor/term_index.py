@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+motor/term_index.py
+===================
+**Indexación de términos** con un *árbol de discriminación* sobre los términos
+`Var`/`Const`/`Func` de `motor/unification.py`.
+
+Cada secuencia de argumentos se aplana en recorrido preorden de símbolos:
+- `Var`   -> comodín `*` (todas las variables son iguales para el índice),
+- `Const` -> ('c', nombre),
+- `Func`  -> ('f', nombre, aridad).
+
+El árbol comparte prefijos y permite recuperar **candidatos** (superconjunto)
+a ser:
+- `unifiable`:       unificables con la consulta,
+- `generalizations`: más generales que la consulta (la consulta es instancia),
+- `instances`:       instancias de la consulta.
+
+Como las variables se tratan como comodines, los candidatos deben confirmarse
+con `unify` (o *matching*); lo que el índice descarta nunca podría unificar.
+
+`TermLiteralIndex` combina este árbol con la clave (predicado, aridad,
+polaridad) de `LiteralIndex`, de modo que la resolución FOL solo intenta
+`unify` sobre literales complementarios realmente compatibles.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from motor.unification import Var, Const, Term
+from motor.indexing import LiteralIndex, Key, fol_key, fol_complement_key
+
+# -----------------------------------------------------------------------------
+# Aplanado de términos
+# -----------------------------------------------------------------------------
+
+VAR = ('*',)
+Symbol = Tuple[Any, ...]
+
+def _arity(sym: Symbol) -> int:
+    return sym[2] if sym[0] == 'f' else 0
+
+def flatten_terms(terms: Sequence[Term]) -> List[Symbol]:
+    """Recorrido preorden de una secuencia de términos como lista de símbolos."""
+    out: List[Symbol] = []
+    stack = list(reversed(terms))
+    while stack:
+        t = stack.pop()
+        if isinstance(t, Var):
+            out.append(VAR)
+        elif isinstance(t, Const):
+            out.append(('c', t.name))
+        else:
+            out.append(('f', t.name, len(t.args)))
+            stack.extend(reversed(t.args))
+    return out
+
+def _subterm_ends(syms: List[Symbol]) -> List[int]:
+    """`ends[i]` = posición siguiente al subtérmino que empieza en `i`."""
+    n = len(syms)
+    ends = [0] * n
+    for i in range(n - 1, -1, -1):
+        k = i + 1
+        for _ in range(_arity(syms[i])):
+            k = ends[k]
+        ends[i] = k
+    return ends
+
+# -----------------------------------------------------------------------------
+# Árbol de discriminación
+# -----------------------------------------------------------------------------
+
+_UNIFIABLE, _GENERALIZATIONS, _INSTANCES = 0, 1, 2
+
+class _Node:
+    __slots__ = ("children", "entries")
+    def __init__(self) -> None:
+        self.children: Dict[Symbol, "_Node"] = {}
+        self.entries: Dict[Any, None] = {}  # dict ordenado usado como conjunto
+
+def _skip(node: _Node, n: int) -> Iterator[_Node]:
+    """Nodos alcanzados tras saltar `n` términos completos en el árbol."""
+    if n == 0:
+        yield node
+        return
+    for sym, child in node.children.items():
+        yield from _skip(child, n - 1 + _arity(sym))
+
+class DiscriminationTree:
+    """Árbol de discriminación: secuencia de términos -> valores asociados."""
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def insert(self, terms: Sequence[Term], value: Any) -> None:
+        node = self._root
+        for sym in flatten_terms(terms):
+            node = node.children.setdefault(sym, _Node())
+        if value not in node.entries:
+            node.entries[value] = None
+            self._size += 1
+
+    def remove(self, terms: Sequence[Term], value: Any) -> bool:
+        path: List[Tuple[_Node, Symbol]] = []
+        node = self._root
+        for sym in flatten_terms(terms):
+            child = node.children.get(sym)
+            if child is None:
+                return False
+            path.append((node, sym))
+            node = child
+        if value not in node.entries:
+            return False
+        del node.entries[value]
+        self._size -= 1
+        # Podar ramas vacías
+        for parent, sym in reversed(path):
+            child = parent.children[sym]
+            if child.entries or child.children:
+                break
+            del parent.children[sym]
+        return True
+
+    def _retrieve(self, terms: Sequence[Term], mode: int) -> Iterator[Any]:
+        syms = flatten_terms(terms)
+        ends = _subterm_ends(syms)
+        n = len(syms)
+        stack: List[Tuple[_Node, int]] = [(self._root, 0)]
+        while stack:
+            node, pos = stack.pop()
+            if pos == n:
+                yield from list(node.entries)
+                continue
+            sym = syms[pos]
+            if sym == VAR:
+                if mode == _GENERALIZATIONS:
+                    # Una variable de la consulta solo es instancia de otra variable
+                    child = node.children.get(VAR)
+                    if child is not None:
+                        stack.append((child, pos + 1))
+                else:
+                    # La variable de la consulta absorbe cualquier término del árbol
+                    for nxt in _skip(node, 1):
+                        stack.append((nxt, pos + 1))
+                continue
+            if mode != _INSTANCES:
+                # Una variable del árbol absorbe el subtérmino de la consulta
+                child = node.children.get(VAR)
+                if child is not None:
+                    stack.append((child, ends[pos]))
+            child = node.children.get(sym)
+            if child is not None:
+                stack.append((child, pos + 1))
+
+    def unifiable(self, terms: Sequence[Term]) -> Iterator[Any]:
+        """Candidatos unificables con `terms`."""
+        return self._retrieve(terms, _UNIFIABLE)
+
+    def generalizations(self, terms: Sequence[Term]) -> Iterator[Any]:
+        """Candidatos de los que `terms` es instancia."""
+        return self._retrieve(terms, _GENERALIZATIONS)
+
+    def instances(self, terms: Sequence[Term]) -> Iterator[Any]:
+        """Candidatos que son instancia de `terms`."""
+        return self._retrieve(terms, _INSTANCES)
+
+    def __len__(self) -> int:
+        return self._size
+
+# -----------------------------------------------------------------------------
+# Índice de literales FOL respaldado por árboles de discriminación
+# -----------------------------------------------------------------------------
+
+class TermLiteralIndex(LiteralIndex):
+    """
+    `LiteralIndex` para literales FOL donde cada clave (predicado, aridad,
+    polaridad) guarda un `DiscriminationTree` de los argumentos.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(fol_key, fol_complement_key)
+        self._trees: Dict[Key, DiscriminationTree] = {}
+
+    def add(self, cid: int, clause) -> None:
+        for l in clause:
+            self._trees.setdefault(fol_key(l), DiscriminationTree()).insert(l.pred.args, (cid, l))
+
+    def remove(self, cid: int, clause) -> None:
+        for l in clause:
+            tree = self._trees.get(fol_key(l))
+            if tree is not None:
+                tree.remove(l.pred.args, (cid, l))
+
+    def _query(self, key: Key, args: Sequence[Term], mode: int) -> Iterator[Tuple[int, Any]]:
+        tree = self._trees.get(key)
+        if tree is None:
+            return iter(())
+        return tree._retrieve(args, mode)
+
+    def complementary(self, l) -> Iterator[Tuple[int, Any]]:
+        """Literales complementarios de `l` cuyos argumentos pueden unificar."""
+        return self._query(fol_complement_key(l), l.pred.args, _UNIFIABLE)
+
+    def generalizations(self, l) -> Iterator[Tuple[int, Any]]:
+        """Literales de igual signo más generales que `l` (candidatos a subsumir)."""
+        return self._query(fol_key(l), l.pred.args, _GENERALIZATIONS)
+
+    def instances(self, l) -> Iterator[Tuple[int, Any]]:
+        """Literales de igual signo que son instancia de `l` (candidatos subsumidos)."""
+        return self._query(fol_key(l), l.pred.args, _INSTANCES)
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self._trees.values())
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+motor/trace.py
+==============
+**Traza en flujo** y **reconstrucción perezosa** de la refutación FOL.
+
+Con `keep_steps=True` el motor guarda un `FolStep` (θ y resolvente completos)
+por cada inferencia, aunque casi ninguna termine en la prueba; en corridas
+largas la traza sola agota la memoria. Este módulo separa ambas cosas:
+
+- **Sumideros**: `FolProver`/`resolve_first_order` aceptan `sink`, cualquier
+  función que reciba cada `FolStep`. `JsonlSink` escribe una línea JSON por
+  paso y `StepStream` entrega los pasos como iterador mientras el bucle avanza.
+- **Prueba como DAG**: el motor solo conserva `proof_map` (resolvente -> padres,
+  referencias a cláusulas ya internadas). `proof_dag` lo numera como DAG de ids
+  y `refutation_steps` re-deriva **bajo demanda** los pasos que llevan a `□`:
+  vuelve a unificar cada par de padres hasta dar con los literales (o el
+  factor) que producen el resolvente. Sirve directamente a `show_fol_steps`.
+"""
+
+from __future__ import annotations
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from motor.unification import Unifier, Subst
+from motor.subsumption import subsumes
+from motor.first_order_resolution import (
+    Clause, FolProver, FolStep, Literal, apply_subst_clause, factors,
+    rename_vars_clause, rename_vars_lit, renaming_apart,
+)
+
+ProofMap = Dict[Clause, Tuple[Clause, Clause]]
+StepSink = Callable[[FolStep], None]
+
+_EMPTY: Clause = frozenset()
+
+# -----------------------------------------------------------------------------
+# Sumideros de pasos
+# -----------------------------------------------------------------------------
+
+def step_to_dict(step: FolStep) -> dict:
+    """Forma JSON de un paso (términos y literales como texto)."""
+    return {
+        "iteration": step.iteration,
+        "left": step.left_id,
+        "right": step.right_id,
+        "left_lit": str(step.left_lit),
+        "right_lit": str(step.right_lit),
+        "theta": {v.name: str(t) for v, t in step.theta.items()},
+        "resolvent": sorted(map(str, step.resolvent)),
+    }
+
+
+class JsonlSink:
+    """Escribe cada paso como una línea JSON en `target` (ruta o archivo de texto abierto)."""
+
+    def __init__(self, target) -> None:
+        self._owned = isinstance(target, (str, os.PathLike))
+        self.file = open(target, "w", encoding="utf-8") if self._owned else target
+        self.count = 0
+
+    def __call__(self, step: FolStep) -> None:
+        self.file.write(json.dumps(step_to_dict(step), ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._owned:
+            self.file.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class StepStream:
+    """
+    Iterador de pasos: avanza el bucle de cláusula dada de a `chunk` cláusulas
+    y entrega los pasos producidos sin acumular la traza. Al agotarse,
+    `entails` trae el resultado y `prover` el estado (con `proof` para
+    `refutation_steps`). `kwargs` se pasan a `FolProver`.
+    """
+
+    def __init__(self, clauses_init: Iterable[Clause], chunk: int = 1, **kwargs) -> None:
+        self._buffer: List[FolStep] = []
+        self.prover = FolProver(keep_steps=False, sink=self._buffer.append, **kwargs)
+        for c in clauses_init:
+            self.prover.add_clause(c)
+        self.chunk = chunk
+        self.entails: Optional[bool] = None
+
+    def __iter__(self) -> Iterator[FolStep]:
+        while True:
+            r = self.prover.run(self.chunk)
+            batch = self._buffer[:]
+            self._buffer.clear()
+            yield from batch
+            if r is not None:
+                self.entails = r
+                return
+
+# -----------------------------------------------------------------------------
+# Prueba mínima bajo demanda
+# -----------------------------------------------------------------------------
+
+def refutation_proof(proof: ProofMap) -> ProofMap:
+    """Subconjunto de `proof` alcanzable desde `□` siguiendo los padres."""
+    out: ProofMap = {}
+    stack: List[Clause] = [_EMPTY]
+    while stack:
+        c = stack.pop()
+        parents = proof.get(c)
+        if parents is None or c in out:
+            continue
+        out[c] = parents
+        stack.extend(parents)
+    return out
+
+
+def _topological(proof: ProofMap, goal: Clause) -> List[Clause]:
+    """Cláusulas de la derivación de `goal`, cada una después de sus padres."""
+    order: List[Clause] = []
+    visited = set()
+    stack: List[Tuple[Clause, bool]] = [(goal, False)]
+    while stack:
+        c, done = stack.pop()
+        if done:
+            order.append(c)
+            continue
+        if c in visited:
+            continue
+        visited.add(c)
+        stack.append((c, True))
+        for p in reversed(proof.get(c, ())):
+            if p not in visited:
+                stack.append((p, False))
+    return order
+
+
+def _numbered(proof: ProofMap, ids: Optional[Dict[Clause, int]], goal: Clause):
+    order = _topological(proof, goal)
+    ids = ids or {}
+    num: Dict[Clause, int] = {}
+    nxt = max(ids.values(), default=-1) + 1
+    for c in order:
+        if c in ids:
+            num[c] = ids[c]
+        else:
+            num[c] = nxt
+            nxt += 1
+    return order, num
+
+
+def proof_dag(proof: ProofMap, ids: Optional[Dict[Clause, int]] = None,
+              goal: Clause = _EMPTY) -> Tuple[Dict[int, Tuple[int, ...]], Dict[Clause, int]]:
+    """
+    Derivación de `goal` (por defecto `□`) como DAG de ids: id -> ids de los padres.
+    `ids` fija los ids conocidos (p. ej. `FolProver.clause_ids()`); las cláusulas
+    sin id (intermedias de hiper/UR) se numeran a continuación en orden topológico.
+    Retorna (dag, ids usados). Vacío si `goal` no se derivó.
+    """
+    if goal not in proof:
+        return {}, {}
+    order, num = _numbered(proof, ids, goal)
+    return {num[c]: tuple(num[p] for p in proof[c]) for c in order if c in proof}, num
+
+
+def _variant(a: Clause, b: Clause) -> bool:
+    return len(a) == len(b) and subsumes(a, b) and subsumes(b, a)
+
+
+def _rederive(a: Clause, b: Clause, target: Clause, sa: str, sb: str
+              ) -> Optional[Tuple[Literal, Literal, Subst, Clause]]:
+    """Literales, θ y resolvente (o factor si `a == b`) que producen `target` desde `a` y `b`."""
+    if a == b:
+        for la, lb, theta, F in factors(a):
+            if _variant(F, target):
+                return la, lb, theta, F
+        return None
+    ren_a, ren_b = renaming_apart(a, sa), renaming_apart(b, sb)
+    for la in sorted(a, key=str):
+        for lb in sorted(b, key=str):
+            if la.neg == lb.neg or la.pred.name != lb.pred.name or len(la.pred.args) != len(lb.pred.args):
+                continue
+            la_std, lb_std = rename_vars_lit(la, ren_a), rename_vars_lit(lb, ren_b)
+            u = Unifier()
+            if not all(u.unify(x, y) for x, y in zip(la_std.pred.args, lb_std.pred.args)):
+                continue
+            theta = u.subst()
+            R = apply_subst_clause(rename_vars_clause(a - {la}, ren_a) | rename_vars_clause(b - {lb}, ren_b), theta)
+            if _variant(R, target):
+                return la_std, lb_std, theta, R
+    return None
+
+
+def refutation_steps(proof: ProofMap, ids: Optional[Dict[Clause, int]] = None,
+                     goal: Clause = _EMPTY) -> List[FolStep]:
+    """
+    Pasos de la refutación mínima (solo los que llevan a `goal`), en orden
+    topológico, re-derivados desde `proof`. `iteration` es la profundidad del
+    resolvente en el DAG (las entradas tienen profundidad 0).
+    """
+    if goal not in proof:
+        return []
+    order, num = _numbered(proof, ids, goal)
+    depth: Dict[Clause, int] = {}
+    steps: List[FolStep] = []
+    for c in order:
+        parents = proof.get(c)
+        if parents is None:
+            depth[c] = 0
+            continue
+        a, b = parents
+        depth[c] = 1 + max(depth.get(a, 0), depth.get(b, 0))
+        found = _rederive(a, b, c, f'a{num[a]}', f'b{num[b]}')
+        if found is None:
+            raise ValueError(f"no se pudo re-derivar {sorted(map(str, c))} desde sus padres")
+        la, lb, theta, R = found
+        steps.append(FolStep(depth[c], num[a], num[b], la, lb, dict(theta), R))
+    return steps
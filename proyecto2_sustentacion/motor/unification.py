@@ -9,38 +9,72 @@ Responsabilidades principales:
 - Aplicar sustituciones (variables -> términos) a términos.
 - Verificar occurs-check.
 - Implementar `unify(t1, t2)` que retorna la MGU (most general unifier) o None.
+- Ofrecer `Unifier`/`unify_uf`: unificación casi lineal con enlaces union-find,
+  compresión de caminos, *trail* para deshacer y occurs-check diferible.
 
 Este archivo es autocontenible y sin dependencias externas.
 """
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Tuple, Dict, Optional, Union
+from typing import Tuple, Dict, FrozenSet, List, Optional, Sequence, Set, Union
 
 # -----------------------------------------------------------------------------
 # Definición de términos
 # -----------------------------------------------------------------------------
 
+_NO_VARS: FrozenSet["Var"] = frozenset()
+
 @dataclass(frozen=True)
 class Var:
-    """Variable lógica, identificada por su nombre."""
+    """Variable lógica, identificada por su nombre; su conjunto de variables se crea una vez."""
     name: str
+    ground = False
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "variables", frozenset((self,)))
+    def __reduce__(self):
+        return (Var, (self.name,))
     def __str__(self) -> str: return self.name
 
 @dataclass(frozen=True)
 class Const:
     """Constante lógica, identificada por su nombre."""
     name: str
+    ground = True
+    variables = _NO_VARS
     def __str__(self) -> str: return self.name
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Func:
     """
     Función lógica con símbolo y aridad definidos por la tupla de argumentos.
     Ejemplos: f(), padre(Juan), g(x, h(y))
+
+    El hash y la bandera `ground` se calculan una sola vez al construir (a partir
+    de los valores ya cacheados de los argumentos) y el conjunto de variables se
+    cachea en el primer acceso. La igualdad compara primero identidad y hash,
+    de modo que con términos internados (`motor/term_bank.py`) es casi gratuita.
     """
     name: str
     args: Tuple["Term", ...]
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.name, self.args)))
+        object.__setattr__(self, "ground", all(a.ground for a in self.args))
+    def __hash__(self) -> int: return self._hash
+    def __eq__(self, other: object) -> bool:
+        if self is other: return True
+        if other.__class__ is not Func: return NotImplemented
+        return self._hash == other._hash and self.name == other.name and self.args == other.args
+    def __reduce__(self):
+        # El hash depende del proceso: se recalcula al deserializar
+        return (Func, (self.name, self.args))
+    @property
+    def variables(self) -> FrozenSet[Var]:
+        vs = self.__dict__.get("_vars")
+        if vs is None:
+            vs = frozenset().union(*(a.variables for a in self.args)) if not self.ground else _NO_VARS
+            object.__setattr__(self, "_vars", vs)
+        return vs
     def __str__(self) -> str:
         if not self.args: return self.name
         return f'{self.name}({", ".join(map(str, self.args))})'
@@ -62,8 +96,8 @@ def apply_subst_term(t: Term, s: Subst) -> Term:
     """
     if isinstance(t, Var):
         return apply_subst_term(s[t], s) if t in s else t
-    if isinstance(t, Const):
-        return t
+    if t.ground:
+        return t  # Const o Func sin variables: nada que sustituir
     # Func
     return Func(t.name, tuple(apply_subst_term(a, s) for a in t.args))
 
@@ -78,6 +112,12 @@ def occurs_check(v: Var, t: Term, s: Subst) -> bool:
     # Func
     return any(occurs_check(v, a, s) for a in t.args)
 
+def term_depth(t: Term) -> int:
+    """Anidamiento de símbolos de función: 0 para variables y constantes, f(a) = 1."""
+    if t.__class__ is not Func:
+        return 0
+    return 1 + max((term_depth(a) for a in t.args), default=0)
+
 # -----------------------------------------------------------------------------
 # Unificación de Robinson
 # -----------------------------------------------------------------------------
@@ -119,3 +159,324 @@ def unify(t1: Term, t2: Term, subst: Optional[Subst] = None) -> Optional[Subst]:
         return subst
 
     return None
+
+# -----------------------------------------------------------------------------
+# Unificación casi lineal: union-find + trail
+# -----------------------------------------------------------------------------
+
+class Unifier:
+    """
+    Motor de unificación con **sustitución triangular** guardada como enlaces
+    union-find (variable -> término) con compresión de caminos.
+
+    - Nunca copia la sustitución: los enlaces se registran en un *trail* y
+      `undo(mark)` los revierte (también las compresiones de camino).
+    - No aplica la sustitución en cada nivel: `find` sigue los enlaces y las
+      estructuras se comparan por identidad/hash antes de descender.
+    - `occurs`: 'deferred' (por defecto) revisa ciclos una sola vez al final de
+      cada `unify`; 'eager' lo hace en cada enlace (como Robinson); 'none' lo omite
+      (solo si se sabe que no pueden surgir ciclos, p. ej. contra hechos *ground*).
+
+    `subst()` entrega la MGU resuelta (idempotente) en el formato `Subst`.
+    """
+
+    def __init__(self, occurs: str = 'deferred'):
+        if occurs not in ('deferred', 'eager', 'none'):
+            raise ValueError(f"Modo de occurs-check desconocido: {occurs!r}")
+        self.occurs = occurs
+        self.bindings: Dict[Var, Term] = {}
+        self.trail: List[Tuple[Var, Optional[Term]]] = []
+
+    # -- trail -----------------------------------------------------------------
+
+    def mark(self) -> int:
+        return len(self.trail)
+
+    def undo(self, mark: int) -> None:
+        """Revierte todos los enlaces hechos desde `mark`."""
+        b = self.bindings
+        trail = self.trail
+        while len(trail) > mark:
+            v, old = trail.pop()
+            if old is None:
+                del b[v]
+            else:
+                b[v] = old
+
+    def _bind(self, v: Var, t: Term) -> None:
+        self.trail.append((v, self.bindings.get(v)))
+        self.bindings[v] = t
+
+    # -- union-find ------------------------------------------------------------
+
+    def find(self, t: Term) -> Term:
+        """Representante de `t`: sigue los enlaces de variables comprimiendo el camino."""
+        b = self.bindings
+        if t.__class__ is not Var or t not in b:
+            return t
+        path: List[Var] = []
+        while t.__class__ is Var and t in b:
+            path.append(t)
+            t = b[t]
+        for v in path[:-1]:
+            if b[v] is not t:
+                self._bind(v, t)
+        return t
+
+    def _occurs(self, v: Var, t: Term) -> bool:
+        """¿`v` aparece en `t` bajo los enlaces actuales?"""
+        stack = [t]
+        visited: Set[int] = set()
+        while stack:
+            t = self.find(stack.pop())
+            if t.__class__ is Var:
+                if t == v:
+                    return True
+                continue
+            if t.ground or id(t) in visited:
+                continue
+            visited.add(id(t))
+            stack.extend(t.variables)
+        return False
+
+    def _has_cycle(self, mark: int) -> bool:
+        """Detección de ciclos (occurs-check diferido) desde las variables enlazadas tras `mark`."""
+        b = self.bindings
+        WHITE, GREY, BLACK = 0, 1, 2
+        color: Dict[Var, int] = {}
+        for start, _ in self.trail[mark:]:
+            if color.get(start, WHITE) != WHITE:
+                continue
+            color[start] = GREY
+            stack = [(start, iter(b[start].variables if start in b else ()))]
+            while stack:
+                v, it = stack[-1]
+                nxt = next(it, None)
+                if nxt is None:
+                    color[v] = BLACK
+                    stack.pop()
+                    continue
+                c = color.get(nxt, WHITE)
+                if c == GREY:
+                    return True
+                if c == WHITE and nxt in b:
+                    color[nxt] = GREY
+                    stack.append((nxt, iter(b[nxt].variables)))
+        return False
+
+    # -- unificación -----------------------------------------------------------
+
+    def unify(self, t1: Term, t2: Term) -> bool:
+        """Extiende los enlaces para unificar `t1` y `t2`; si falla, no deja rastro."""
+        mark = len(self.trail)
+        stack = [(t1, t2)]
+        eager = self.occurs == 'eager'
+        # Pares de estructuras ya descompuestos en esta llamada: con occurs-check
+        # diferido pueden existir enlaces cíclicos (x -> g(x)) y, sin este
+        # registro, volver a descomponer el mismo par no terminaría.
+        decomposed: Set[Tuple[int, int]] = set()
+        while stack:
+            a, b = stack.pop()
+            a = self.find(a)
+            b = self.find(b)
+            if a is b or a == b:
+                continue
+            if a.__class__ is Var:
+                if eager and self._occurs(a, b):
+                    self.undo(mark); return False
+                self._bind(a, b)
+            elif b.__class__ is Var:
+                if eager and self._occurs(b, a):
+                    self.undo(mark); return False
+                self._bind(b, a)
+            elif (a.__class__ is Func and b.__class__ is Func and a.name == b.name
+                  and len(a.args) == len(b.args) and not (a.ground and b.ground)):
+                pair = (id(a), id(b))
+                if pair in decomposed:
+                    continue
+                decomposed.add(pair)
+                # Empareja argumentos de izquierda a derecha (mismo orden que Robinson)
+                stack.extend(reversed(list(zip(a.args, b.args))))
+            else:
+                self.undo(mark); return False
+        if self.occurs == 'deferred' and self._has_cycle(mark):
+            self.undo(mark); return False
+        return True
+
+    # -- lectura de resultados -------------------------------------------------
+
+    def resolve(self, t: Term, _memo: Optional[Dict[int, Term]] = None) -> Term:
+        """Aplica por completo los enlaces a `t` (subtérminos compartidos se resuelven una vez)."""
+        if t.ground:
+            return t
+        if t.__class__ is Var:
+            r = self.find(t)
+            return r if r.__class__ is Var else self.resolve(r, _memo)
+        memo = {} if _memo is None else _memo
+        hit = memo.get(id(t))
+        if hit is None:
+            args = tuple(self.resolve(a, memo) for a in t.args)
+            hit = t if all(x is y for x, y in zip(args, t.args)) else Func(t.name, args)
+            memo[id(t)] = hit
+        return hit
+
+    def subst(self) -> Subst:
+        """MGU resuelta (idempotente) para las variables enlazadas."""
+        memo: Dict[int, Term] = {}
+        out: Subst = {}
+        for v in self.bindings:
+            r = self.resolve(v, memo)
+            if r != v:
+                out[v] = r
+        return out
+
+
+# -----------------------------------------------------------------------------
+# Estandarización-aparte por desplazamientos
+# -----------------------------------------------------------------------------
+
+VarRef = Tuple[Var, int]
+Bound = Tuple[Term, int]
+
+class OffsetUnifier:
+    """
+    Unificación con **estandarización-aparte implícita**: cada término viaja
+    con un desplazamiento entero (p. ej. 0 para una cláusula y 1 para la otra)
+    y la variable `x` con desplazamiento 0 es distinta de `x` con 1. Así no se
+    crean variables renombradas ni copias de las cláusulas para intentar un
+    par; solo `resolve` construye términos, y únicamente cuando se pide.
+
+    Mismo esquema que `Unifier` (enlaces union-find, *trail*, occurs-check
+    diferido) y la misma dirección de enlace, de modo que, al renombrar con
+    `names[k]`, `resolve`/`subst` dan exactamente lo que daría `Unifier` sobre
+    las cláusulas estandarizadas con esos renombrados.
+    """
+
+    def __init__(self) -> None:
+        self.bindings: Dict[VarRef, Bound] = {}
+        self.trail: List[Tuple[VarRef, Optional[Bound]]] = []
+
+    def mark(self) -> int:
+        return len(self.trail)
+
+    def undo(self, mark: int) -> None:
+        """Revierte todos los enlaces hechos desde `mark`."""
+        b = self.bindings
+        trail = self.trail
+        while len(trail) > mark:
+            v, old = trail.pop()
+            if old is None:
+                del b[v]
+            else:
+                b[v] = old
+
+    def _bind(self, v: VarRef, t: Bound) -> None:
+        self.trail.append((v, self.bindings.get(v)))
+        self.bindings[v] = t
+
+    def find(self, t: Term, o: int) -> Bound:
+        """Representante de (`t`, `o`) comprimiendo el camino."""
+        b = self.bindings
+        if t.__class__ is not Var or (t, o) not in b:
+            return t, o
+        path: List[VarRef] = []
+        r: Bound = (t, o)
+        while r[0].__class__ is Var and r in b:
+            path.append(r)
+            r = b[r]
+        for v in path[:-1]:
+            if b[v] != r:
+                self._bind(v, r)
+        return r
+
+    def _has_cycle(self, mark: int) -> bool:
+        b = self.bindings
+        WHITE, GREY, BLACK = 0, 1, 2
+        color: Dict[VarRef, int] = {}
+        def succ(v: VarRef):
+            t, o = b[v]
+            return ((x, o) for x in t.variables)
+        for start, _ in self.trail[mark:]:
+            if color.get(start, WHITE) != WHITE:
+                continue
+            color[start] = GREY
+            stack = [(start, succ(start) if start in b else iter(()))]
+            while stack:
+                v, it = stack[-1]
+                nxt = next(it, None)
+                if nxt is None:
+                    color[v] = BLACK
+                    stack.pop()
+                    continue
+                c = color.get(nxt, WHITE)
+                if c == GREY:
+                    return True
+                if c == WHITE and nxt in b:
+                    color[nxt] = GREY
+                    stack.append((nxt, succ(nxt)))
+        return False
+
+    def unify(self, t1: Term, o1: int, t2: Term, o2: int) -> bool:
+        """Extiende los enlaces para unificar `t1`@`o1` y `t2`@`o2`; si falla, no deja rastro."""
+        if t1.ground and t2.ground:
+            return t1 is t2 or t1 == t2
+        mark = len(self.trail)
+        stack = [(t1, o1, t2, o2)]
+        decomposed: Set[Tuple[int, int, int, int]] = set()
+        while stack:
+            a, oa, c, oc = stack.pop()
+            a, oa = self.find(a, oa)
+            c, oc = self.find(c, oc)
+            if (a is c or a == c) and (oa == oc or a.ground):
+                continue
+            if a.__class__ is Var:
+                self._bind((a, oa), (c, oc))
+            elif c.__class__ is Var:
+                self._bind((c, oc), (a, oa))
+            elif (a.__class__ is Func and c.__class__ is Func and a.name == c.name
+                  and len(a.args) == len(c.args) and not (a.ground and c.ground)):
+                key = (id(a), oa, id(c), oc)
+                if key in decomposed:
+                    continue
+                decomposed.add(key)
+                stack.extend((x, oa, y, oc) for x, y in reversed(list(zip(a.args, c.args))))
+            else:
+                self.undo(mark); return False
+        if self._has_cycle(mark):
+            self.undo(mark); return False
+        return True
+
+    def resolve(self, t: Term, o: int, names: Sequence[Dict[Var, Var]],
+                _memo: Optional[Dict[Tuple[int, int], Term]] = None) -> Term:
+        """
+        Aplica los enlaces a `t`@`o`; cada variable libre `x`@`k` se escribe
+        como `names[k][x]` (los renombrados de estandarización-aparte).
+        """
+        if t.ground:
+            return t
+        if t.__class__ is Var:
+            r, k = self.find(t, o)
+            return names[k][r] if r.__class__ is Var else self.resolve(r, k, names, _memo)
+        memo = {} if _memo is None else _memo
+        key = (id(t), o)
+        hit = memo.get(key)
+        if hit is None:
+            hit = memo[key] = Func(t.name, tuple(self.resolve(a, o, names, memo) for a in t.args))
+        return hit
+
+    def subst(self, names: Sequence[Dict[Var, Var]]) -> Subst:
+        """MGU resuelta sobre las variables renombradas con `names`."""
+        memo: Dict[Tuple[int, int], Term] = {}
+        out: Subst = {}
+        for (v, k) in self.bindings:
+            r = self.resolve(v, k, names, memo)
+            w = names[k][v]
+            if r != w:
+                out[w] = r
+        return out
+
+
+def unify_uf(t1: Term, t2: Term, occurs: str = 'deferred') -> Optional[Subst]:
+    """Misma interfaz que `unify` pero con el motor union-find (`Unifier`)."""
+    u = Unifier(occurs)
+    return u.subst() if u.unify(t1, t2) else None